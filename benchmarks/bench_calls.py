@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Custo de uma chamada de função no MiniPar
+
+Executa programas que chamam, dentro de um laço for, uma função padrão,
+uma função do programa com dois argumentos, uma função com parâmetros
+padrão omitidos e informados na chamada e uma função recursiva (Fibonacci).
+Desconta o tempo do laço vazio e informa o menor tempo médio por chamada
+entre as repetições.
+
+Uso:
+    python benchmarks/bench_calls.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.executor import Executor  # noqa: E402
+from minipar.lexer import Lexer  # noqa: E402
+from minipar.parser import Parser  # noqa: E402
+from minipar.semantic import SemanticAnalyzer  # noqa: E402
+
+FUNCTIONS = """
+func soma(a: number, b: number) -> number {
+  return a + b
+}
+func escala(x: number, fator: number = 2 * 3, base: number = 1 + 1) -> number {
+  return x * fator + base
+}
+func fib(n: number) -> number {
+  if (n < 2) {
+    return n
+  }
+  return fib(n - 1) + fib(n - 2)
+}
+x: number = 0
+"""
+
+# Corpo do laço de cada cenário; {calls} é o número de chamadas
+SCENARIOS = {
+    "laço vazio": "for i in 0..{calls} {{\n}}",
+    "padrão": "for i in 0..{calls} {{\n  x = len(\"abc\")\n}}",
+    "2 argumentos": "for i in 0..{calls} {{\n  x = soma(i, 1)\n}}",
+    "padrão omitido": "for i in 0..{calls} {{\n  x = escala(i)\n}}",
+    "padrão informado": "for i in 0..{calls} {{\n  x = escala(i, 3, 4)\n}}",
+}
+
+
+def fib_calls(n: int) -> int:
+    """Quantidade de chamadas realizadas por fib(n)"""
+    return 1 if n < 2 else 1 + fib_calls(n - 1) + fib_calls(n - 2)
+
+
+def measure(code: str, repeat: int) -> float:
+    """Retorna o menor tempo (s) de execução do programa entre as repetições"""
+    tree = Parser(Lexer(FUNCTIONS + code)).start()
+    SemanticAnalyzer().visit(tree)
+    best = float("inf")
+    for _ in range(repeat):
+        executor = Executor()
+        start = time.perf_counter()
+        executor.run(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--fib", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    loop = measure(SCENARIOS["laço vazio"].format(calls=args.calls), args.repeat)
+    print(f"{'cenário':<18} {'µs/chamada':>10}")
+    for name, body in SCENARIOS.items():
+        if name == "laço vazio":
+            continue
+        elapsed = measure(body.format(calls=args.calls), args.repeat) - loop
+        print(f"{name:<18} {elapsed / args.calls * 1e6:>10.2f}")
+    elapsed = measure(f"x = fib({args.fib})", args.repeat)
+    print(f"{'fib recursiva':<18} {elapsed / fib_calls(args.fib) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Memória alocada por requisição nos canais do MiniPar
+
+Inicia um servidor de canal no próprio processo, cuja função tratadora
+retorna a mensagem recebida, e mede com tracemalloc, para cada tamanho de
+mensagem, o pico de memória alocada durante uma requisição (cliente e
+servidor) dividido pelo tamanho da mensagem, isto é, quantas cópias da
+mensagem existem ao mesmo tempo. Também informa os blocos de memória
+alocados e ainda não liberados por requisição em um lote de mensagens
+pequenas, que indicam objetos retidos.
+
+Uso:
+    python benchmarks/bench_channel_alloc.py --server events
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.channel import (  # noqa: E402
+    ClientChannel,
+    EventLoopServer,
+    ThreadPoolServer,
+)
+
+SERVERS = {"threads": ThreadPoolServer, "events": EventLoopServer}
+SIZES = [1024, 64 * 1024, 1024 * 1024, 8 * 1024 * 1024]
+
+
+def start_server(server_class):
+    """Inicia o servidor em uma porta livre, retornando-o com a porta"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    server = server_class(listener, lambda data: data)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, listener.getsockname()[1]
+
+
+def copies(client: ClientChannel, size: int) -> float:
+    """Pico de memória de uma requisição, em múltiplos do tamanho da mensagem"""
+    message = "x" * size
+    client.request(message)
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    client.request(message)
+    _, peak = tracemalloc.get_traced_memory()
+    return (peak - current) / size
+
+
+def main():
+    """Função principal do teste de alocação"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=SERVERS, default="threads")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    server, port = start_server(SERVERS[args.server])
+    client, _ = ClientChannel.connect("localhost", port)
+    tracemalloc.start()
+
+    print(f"{'tamanho':>10}  {'cópias':>7}")
+    for size in SIZES:
+        print(f"{size:>10}  {copies(client, size):>7.2f}")
+
+    messages = ["1 + 2 * 3"] * args.requests
+    client.request_many(messages)
+    before = tracemalloc.take_snapshot()
+    client.request_many(messages)
+    after = tracemalloc.take_snapshot()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    print(f"blocos retidos por requisição: {retained / args.requests:.3f}")
+
+    tracemalloc.stop()
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
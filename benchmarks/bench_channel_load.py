@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do canal servidor do MiniPar
+
+Inicia o servidor da calculadora (examples/server_calc.minipar) em uma porta
+local livre, em um socket de domínio Unix ou em memória, e conecta vários
+clientes simultâneos, cada um enviando uma sequência de expressões. Ao
+final, informa a vazão (requisições/s) e a latência das requisições (p50
+e p99).
+
+Uso:
+    python benchmarks/bench_channel_load.py --clients 32 --requests 200
+    python benchmarks/bench_channel_load.py --transport inproc
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.channel import ClientChannel  # noqa: E402
+from minipar.executor import Executor  # noqa: E402
+from minipar.lexer import Lexer  # noqa: E402
+from minipar.parser import Parser  # noqa: E402
+from minipar.semantic import SemanticAnalyzer  # noqa: E402
+
+SERVER_PROGRAM = os.path.join(ROOT_DIR, "examples", "server_calc.minipar")
+
+
+def free_port() -> int:
+    """Retorna uma porta TCP local livre"""
+    with socket.socket() as probe:
+        probe.bind(("localhost", 0))
+        return probe.getsockname()[1]
+
+
+def server_address(transport: str) -> tuple[str, int]:
+    """Retorna o endereço do servidor para o transporte informado"""
+    if transport == "unix":
+        return f"unix:{tempfile.mktemp(suffix='.sock')}", 0
+    if transport == "inproc":
+        return "inproc:calc", 0
+    return "localhost", free_port()
+
+
+def start_server(address: tuple[str, int], workers: int) -> Executor:
+    """Inicia o servidor da calculadora em uma thread, retornando o executor"""
+    host, port = address
+    with open(SERVER_PROGRAM) as f:
+        code = f.read().replace('"localhost", 8585', f'"{host}", {port}')
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    executor = Executor(workers=workers)
+    threading.Thread(target=executor.run, args=(tree,), daemon=True).start()
+
+    # Aguarda o servidor aceitar conexões
+    while True:
+        try:
+            ClientChannel.connect(host, port)[0].close()
+            return executor
+        except (ConnectionRefusedError, FileNotFoundError):
+            time.sleep(0.01)
+
+
+def client(address: tuple[str, int], requests: int, latencies: list[float]):
+    """Envia requisições sequenciais, registrando a latência de cada uma"""
+    conn, _ = ClientChannel.connect(*address)
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            conn.request(f"{i} + 2 * 3")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        conn.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Retorna o percentil informado de uma lista de valores"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    """Função principal do teste de carga"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument(
+        "--transport", choices=["tcp", "unix", "inproc"], default="tcp"
+    )
+    args = parser.parse_args()
+
+    address = server_address(args.transport)
+    latencies: list[float] = []
+
+    # As mensagens impressas pelo servidor são descartadas durante a medição
+    with contextlib.redirect_stdout(io.StringIO()):
+        executor = start_server(address, args.workers)
+        threads = [
+            threading.Thread(target=client, args=(address, args.requests, latencies))
+            for _ in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    for server in executor.server_table.values():
+        server.shutdown()
+
+    print(f"transporte:      {args.transport}")
+    print(f"clientes:        {args.clients}")
+    print(f"requisições:     {len(latencies)}")
+    print(f"vazão:           {len(latencies) / elapsed:.1f} req/s")
+    print(f"latência p50:    {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"latência p99:    {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Vazão dos canais por tamanho de mensagem
+
+Inicia um servidor de canal local cuja função tratadora responde com o
+tamanho da mensagem recebida e envia mensagens de tamanhos entre 1 KB e
+8 MB, informando a vazão (MB/s) obtida para cada tamanho.
+
+Uso:
+    python benchmarks/bench_framing.py --total 64
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.channel import ClientChannel, ThreadPoolServer  # noqa: E402
+
+SIZES = [1024, 16 * 1024, 256 * 1024, 1024 * 1024, 8 * 1024 * 1024]
+
+
+def start_server() -> tuple[ThreadPoolServer, int]:
+    """Inicia o servidor em uma porta livre, retornando-o com a porta"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    server = ThreadPoolServer(listener, lambda data: str(len(data)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, listener.getsockname()[1]
+
+
+def main():
+    """Função principal do teste de vazão"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--total", type=int, default=64, help="MB enviados por tamanho"
+    )
+    args = parser.parse_args()
+
+    server, port = start_server()
+    client, _ = ClientChannel.connect("localhost", port)
+
+    print(f"{'tamanho':>10}  {'mensagens':>9}  {'MB/s':>8}")
+    for size in SIZES:
+        message = "x" * size
+        count = max(1, args.total * 1024 * 1024 // size)
+        start = time.perf_counter()
+        for _ in range(count):
+            assert client.request(message) == str(size)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10}  {count:>9}  {count * size / elapsed / 2**20:>8.1f}")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
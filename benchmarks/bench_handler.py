@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Custo por requisição da função de um canal servidor do MiniPar
+
+Carrega as funções do servidor da calculadora (examples/server_calc.minipar)
+sem abrir o canal e chama a função `calc` da mesma forma que o servidor a
+cada mensagem recebida: construindo uma chamada na AST (como antes da
+vinculação) e pela chamada direta retornada por `Executor.bind`. Para
+isolar o custo do despacho, mede também uma função que apenas retorna a
+mensagem, e, para comparar com a leitura caractere a caractere, a mesma
+calculadora escrita com `str_split` e `parse_number`. Informa o menor tempo
+médio por requisição entre as repetições.
+
+Uso:
+    python benchmarks/bench_handler.py --requests 20000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar import ast  # noqa: E402
+from minipar.executor import Executor  # noqa: E402
+from minipar.lexer import Lexer  # noqa: E402
+from minipar.parser import Parser  # noqa: E402
+from minipar.semantic import SemanticAnalyzer  # noqa: E402
+from minipar.token import Token  # noqa: E402
+
+SERVER_PROGRAM = os.path.join(ROOT_DIR, "examples", "server_calc.minipar")
+
+# Funções acrescentadas ao programa do servidor: eco e a calculadora
+# reescrita com as funções padrão de strings, que separam os termos da
+# mensagem em uma única chamada
+ECHO = """
+func eco(message: string) -> string {
+  return message
+}
+
+func calc_split(message: string) -> string {
+  termos: list[string] = str_split(message, "")
+  result: number = parse_number(termos[0])
+  index: number = 1
+  while (index < len(termos)) {
+    operator: string = termos[index]
+    valor: number = parse_number(termos[index + 1])
+    if (operator == "+") { result = result + valor }
+    if (operator == "-") { result = result - valor }
+    if (operator == "*") { result = result * valor }
+    if (operator == "/") { result = result / valor }
+    index = index + 2
+  }
+  return to_string(result)
+}
+"""
+
+
+def load_functions() -> Executor:
+    """Executa as declarações do servidor, exceto o canal"""
+    with open(SERVER_PROGRAM) as f:
+        tree = Parser(Lexer(f.read() + ECHO)).start()
+    SemanticAnalyzer().visit(tree)
+    executor = Executor()
+    for stmt in tree.stmts:
+        if not isinstance(stmt, ast.SChannel):
+            executor.execute(stmt)
+    return executor
+
+
+def ast_call(executor: Executor, name: str, data: str) -> str:
+    """Chamada construída na AST a cada mensagem"""
+    call = ast.Call(
+        type="STRING",
+        token=Token("ID", name),
+        args=[ast.Constant(type="STRING", token=Token("STRING", data))],
+        id=None,
+        oper=None,
+    )
+    return str(executor.exec_Call(call))
+
+
+def measure(handler, requests: int, repeat: int) -> float:
+    """Retorna o menor tempo médio (µs) por chamada entre as repetições"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(requests):
+            handler("1 + 2")
+        best = min(best, time.perf_counter() - start)
+    return best / requests * 1e6
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    executor = load_functions()
+
+    print(f"{'função':<10} {'ast.Call':>10} {'bind':>10}  (µs/requisição)")
+    for name in ("eco", "calc", "calc_split"):
+        bound = executor.bind(executor.function_table[name])
+
+        def built(data, name=name):
+            return ast_call(executor, name, data)
+
+        # A função calc imprime cada mensagem; a saída é descartada
+        with contextlib.redirect_stdout(io.StringIO()):
+            by_ast = measure(built, args.requests, args.repeat)
+            by_bind = measure(bound, args.requests, args.repeat)
+        print(f"{name:<10} {by_ast:>10.2f} {by_bind:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
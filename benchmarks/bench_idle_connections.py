@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Memória por conexão ociosa nos canais servidores do MiniPar
+
+Inicia o servidor da calculadora em um processo separado, em cada modo de
+servidor (threads e laço de eventos), abre várias conexões que permanecem
+ociosas e mede o aumento da memória residente (RSS) e do número de threads
+do processo servidor. A medição só é feita depois que todos os clientes
+receberam a descrição do canal, ou seja, com todas as conexões atendidas.
+Requer Linux (/proc).
+
+Uso:
+    python benchmarks/bench_idle_connections.py --connections 1000
+"""
+
+import argparse
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.channel import ClientChannel  # noqa: E402
+
+SERVER_PROGRAM = os.path.join(ROOT_DIR, "examples", "server_calc.minipar")
+
+
+def free_port() -> int:
+    """Retorna uma porta TCP local livre"""
+    with socket.socket() as probe:
+        probe.bind(("localhost", 0))
+        return probe.getsockname()[1]
+
+
+def process_status(pid: int) -> tuple[int, int]:
+    """Retorna a memória residente (KiB) e o número de threads do processo"""
+    status = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            status[key] = value.split()[0] if value.split() else ""
+    return int(status["VmRSS"]), int(status["Threads"])
+
+
+def connect(port: int) -> ClientChannel:
+    """
+    Abre uma conexão com o servidor, aguardando que ele esteja pronto e
+    que a descrição do canal seja recebida
+    """
+    while True:
+        try:
+            client, _ = ClientChannel.connect("localhost", port)
+            return client
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+
+
+def measure(mode: str, connections: int, workers: int) -> tuple[float, int]:
+    """Retorna a memória por conexão (KiB) e as threads criadas no servidor"""
+    port = free_port()
+    with open(SERVER_PROGRAM) as f:
+        code = f.read().replace("8585", str(port))
+    with tempfile.NamedTemporaryFile("w", suffix=".minipar", delete=False) as f:
+        f.write(code)
+
+    command = [sys.executable, "-m", "minipar", "-server", mode]
+    server = subprocess.Popen(
+        command + ["-workers", str(workers), f.name],
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    clients = []
+    try:
+        clients.append(connect(port))
+        time.sleep(0.5)
+        rss_before, threads_before = process_status(server.pid)
+        for _ in range(connections - 1):
+            clients.append(connect(port))
+        time.sleep(1.0)
+        rss_after, threads_after = process_status(server.pid)
+    finally:
+        for client in clients:
+            client.close()
+        server.kill()
+        server.wait()
+        os.unlink(f.name)
+
+    per_connection = (rss_after - rss_before) / max(connections - 1, 1)
+    return per_connection, threads_after - threads_before
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # Cada conexão usa um descritor no cliente e outro no servidor
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, args.connections * 2 + 64)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    print(f"{'modo':<8} {'conexões':>9} {'KiB/conexão':>12} {'threads criadas':>16}")
+    for mode in ("threads", "events"):
+        per_connection, threads = measure(mode, args.connections, args.workers)
+        print(f"{mode:<8} {args.connections:>9} {per_connection:>12.2f} {threads:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Custo da execução dos exemplos de neurônio com e sem expansão de funções
+
+Executa examples/neuron.minipar (perceptron com a função degrau) e
+examples/xor_neuron.minipar (rede XOR com a função sigmoide) várias vezes,
+sem otimização e com as chamadas expandidas por `minipar.optimizer`, com a
+saída descartada, e informa o menor tempo médio por execução entre as
+repetições. Como os exemplos chamam cada função poucas vezes, também são
+medidos laços de treinamento que chamam as mesmas funções a cada época.
+
+Uso:
+    python benchmarks/bench_inline.py --runs 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.executor import Executor  # noqa: E402
+from minipar.lexer import Lexer  # noqa: E402
+from minipar.optimizer import optimize  # noqa: E402
+from minipar.parser import Parser  # noqa: E402
+from minipar.semantic import SemanticAnalyzer  # noqa: E402
+
+EXAMPLES = ("neuron.minipar", "xor_neuron.minipar")
+
+# Laços de treinamento com as funções de ativação dos exemplos
+TRAINING = {
+    "degrau (treino)": """
+func funcao_degrau(valor_soma: number) -> number {
+  if (valor_soma >= 0) {
+    return 1
+  } else {
+    return 0
+  }
+}
+peso: number = 0.5
+vies: number = 0.5
+for epoca in 0..2000 {
+  soma: number = 1 * peso + vies
+  saida: number = funcao_degrau(soma)
+  erro: number = (epoca % 2) - saida
+  peso = peso + 0.01 * erro
+  vies = vies + 0.01 * erro
+}
+""",
+    "sigmoide (treino)": """
+func funcao_sigmoid(x: number) -> number {
+  return 1 / (1 + exp(-x))
+}
+w: number = 0.1
+h1: number = 0
+h2: number = 0
+for epoca in 0..2000 {
+  h1 = funcao_sigmoid(w * epoca - 3)
+  h2 = funcao_sigmoid(h1 * w + 1)
+  w = w + 0.0001 * (1 - h2)
+}
+""",
+}
+
+
+def measure(code: str, inline: bool, runs: int, repeat: int) -> float:
+    """Retorna o menor tempo médio (ms) por execução entre as repetições"""
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    if inline:
+        optimize(tree)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(runs):
+                Executor().run(tree)
+        best = min(best, time.perf_counter() - start)
+    return best / runs * 1e3
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'exemplo':<20} {'sem':>10} {'expandido':>10}  (ms/execução)")
+    programs = {}
+    for name in EXAMPLES:
+        with open(os.path.join(ROOT_DIR, "examples", name)) as f:
+            programs[name] = f.read()
+    programs.update(TRAINING)
+    for name, code in programs.items():
+        plain = measure(code, False, args.runs, args.repeat)
+        inlined = measure(code, True, args.runs, args.repeat)
+        print(f"{name:<20} {plain:>10.2f} {inlined:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Custo de uma busca por chave: mapa do MiniPar e cadeia de if
+
+Gera dois programas MiniPar que buscam o preço de um produto pelo nome em
+um catálogo de N produtos: um com uma função formada por uma cadeia de
+comandos if, como em examples/recommendation_system.minipar, e outro com um
+mapa (map[string, number]). Cada programa realiza a mesma sequência de
+buscas, percorrendo todas as chaves, e o benchmark informa o menor tempo
+médio por busca entre as repetições.
+
+Uso:
+    python benchmarks/bench_map.py --sizes 10 100 --lookups 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.executor import Executor  # noqa: E402
+from minipar.lexer import Lexer  # noqa: E402
+from minipar.parser import Parser  # noqa: E402
+from minipar.semantic import SemanticAnalyzer  # noqa: E402
+
+# Laço de buscas comum aos dois programas: percorre as chaves em rodízio
+LOOKUPS = """
+nomes: list[string] = [{names}]
+total: number = 0
+i: number = 0
+while (i < {lookups}) {{
+  total = total + preco(nomes[i % {size}])
+  i = i + 1
+}}
+"""
+
+
+def if_chain_program(size: int, lookups: int) -> str:
+    """Catálogo em uma função com uma cadeia de if"""
+    branches = "\n".join(
+        f'  if (nome == "produto{n}") {{ return {n} }}' for n in range(size)
+    )
+    return (
+        f"func preco(nome: string) -> number {{\n{branches}\n  return 0\n}}\n"
+        + lookups_loop(size, lookups)
+    )
+
+
+def map_program(size: int, lookups: int) -> str:
+    """Catálogo em um mapa"""
+    entries = ", ".join(f'"produto{n}": {n}' for n in range(size))
+    return (
+        f"catalogo: map[string, number] = {{{entries}}}\n"
+        "func preco(nome: string) -> number {\n"
+        "  return catalogo[nome]\n"
+        "}\n"
+        + lookups_loop(size, lookups)
+    )
+
+
+def lookups_loop(size: int, lookups: int) -> str:
+    """Laço com as buscas"""
+    names = ", ".join(f'"produto{n}"' for n in range(size))
+    return LOOKUPS.format(names=names, lookups=lookups, size=size)
+
+
+def measure(code: str, lookups: int, repeat: int) -> float:
+    """Retorna o menor tempo médio (µs) por busca entre as repetições"""
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    best = float("inf")
+    for _ in range(repeat):
+        executor = Executor()
+        start = time.perf_counter()
+        executor.run(tree)
+        best = min(best, time.perf_counter() - start)
+    return best / lookups * 1e6
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'produtos':>8} {'if':>10} {'map':>10}  (µs/busca)")
+    for size in args.sizes:
+        chain = measure(if_chain_program(size, args.lookups), args.lookups, args.repeat)
+        mapping = measure(map_program(size, args.lookups), args.lookups, args.repeat)
+        print(f"{size:>8} {chain:>10.2f} {mapping:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
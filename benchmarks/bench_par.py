@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark de execução paralela do MiniPar
+
+Executa um programa com carga de CPU em blocos par em cada modo de execução
+(threads e processos) e com cada interpretador Python informado, permitindo
+comparar builds com GIL e sem GIL (free-threaded, ex.: python3.13t).
+
+Uso:
+    python benchmarks/bench_par.py --python python3.13 python3.13t
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+# Consulta se o GIL está habilitado no interpretador avaliado
+GIL_PROBE = "import sys; print(getattr(sys, '_is_gil_enabled', lambda: True)())"
+
+
+def gil_status(python: str) -> str:
+    """Retorna a descrição do GIL no interpretador informado"""
+    result = subprocess.run(
+        [python, "-c", GIL_PROBE], capture_output=True, text=True, check=True
+    )
+    return "com GIL" if result.stdout.strip() == "True" else "sem GIL"
+
+
+def measure(python: str, mode: str, program: str, repeat: int) -> float:
+    """Retorna o menor tempo, em segundos, entre as execuções do programa"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [python, "-m", "minipar", "-par", mode, program],
+            cwd=ROOT_DIR,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--python", nargs="+", default=[sys.executable])
+    parser.add_argument("--program", default=os.path.join(BENCH_DIR, "par_cpu.minipar"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'interpretador':<30} {'GIL':<8} {'modo':<8} {'tempo (s)':>10}")
+    for python in args.python:
+        status = gil_status(python)
+        for mode in ("thread", "process"):
+            elapsed = measure(python, mode, args.program, args.repeat)
+            print(f"{python:<30} {status:<8} {mode:<8} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Requisições em série e em pipeline nos canais do MiniPar
+
+Inicia um servidor de canal local e envia o mesmo número de requisições de
+três formas: em série (send, uma ida e volta por requisição), em lote
+(send_many) e assíncronas (send_async seguido de receive). Informa a vazão
+(requisições/s) de cada forma.
+
+Uso:
+    python benchmarks/bench_pipeline.py --requests 10000 --server events
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.channel import (  # noqa: E402
+    ClientChannel,
+    EventLoopServer,
+    ThreadPoolServer,
+)
+
+SERVERS = {"threads": ThreadPoolServer, "events": EventLoopServer}
+
+
+def start_server(server_class):
+    """Inicia o servidor em uma porta livre, retornando-o com a porta"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    server = server_class(listener, str.upper)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, listener.getsockname()[1]
+
+
+def serial(client: ClientChannel, messages: list[str]):
+    """Uma ida e volta por requisição, como send"""
+    for message in messages:
+        client.request(message)
+
+
+def batch(client: ClientChannel, messages: list[str]):
+    """Todas as requisições em um lote, como send_many"""
+    client.request_many(messages)
+
+
+def asynchronous(client: ClientChannel, messages: list[str]):
+    """Envia todas as requisições e só depois lê as respostas, como send_async"""
+    tickets = [client.submit(message) for message in messages]
+    for ticket in tickets:
+        client.reply(ticket)
+
+
+def main():
+    """Função principal do teste de pipeline"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--server", choices=SERVERS, default="threads")
+    args = parser.parse_args()
+
+    server, port = start_server(SERVERS[args.server])
+    client, _ = ClientChannel.connect("localhost", port)
+    messages = [f"{i} + 2 * 3" for i in range(args.requests)]
+
+    for name, strategy in [
+        ("send", serial),
+        ("send_many", batch),
+        ("send_async", asynchronous),
+    ]:
+        start = time.perf_counter()
+        strategy(client, messages)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {args.requests / elapsed:>10.0f} req/s")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
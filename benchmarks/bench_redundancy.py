@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Custo da execução de laços com expressões invariantes e repetidas
+
+Executa examples/neuron.minipar, examples/xor_neuron.minipar e laços com
+expressões invariantes e subexpressões comuns apenas com a expansão de
+funções e com a eliminação de redundâncias de `minipar.optimizer`, com a
+saída descartada, e informa o menor tempo médio por execução entre as
+repetições.
+
+Uso:
+    python benchmarks/bench_redundancy.py --runs 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from minipar.executor import Executor  # noqa: E402
+from minipar.lexer import Lexer  # noqa: E402
+from minipar.optimizer import Inliner, RedundancyEliminator  # noqa: E402
+from minipar.parser import Parser  # noqa: E402
+from minipar.semantic import SemanticAnalyzer  # noqa: E402
+
+EXAMPLES = ("neuron.minipar", "xor_neuron.minipar")
+
+PROGRAMS = {
+    "invariantes": """
+taxa: number = 0.1
+peso: number = 0.5
+entrada: number = 2
+soma: number = 0
+for epoca in 0..2000 {
+  soma = soma + peso * (entrada * taxa + 1) - (taxa * taxa + entrada)
+}
+""",
+    "subexpressões": """
+x: number = 1
+y: number = 2
+a: number = 0
+b: number = 0
+i: number = 0
+while (i < 2000) {
+  a = (x * y + x) * 2 + i
+  b = (x * y + x) * 3 - i
+  x = x + 1
+  i = i + 1
+}
+""",
+}
+
+
+def measure(code: str, eliminate: bool, runs: int, repeat: int) -> float:
+    """Retorna o menor tempo médio (ms) por execução entre as repetições"""
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    Inliner().visit(tree)
+    if eliminate:
+        RedundancyEliminator().visit(tree)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(runs):
+                Executor().run(tree)
+        best = min(best, time.perf_counter() - start)
+    return best / runs * 1e3
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'programa':<20} {'expandido':>10} {'otimizado':>10}  (ms/execução)")
+    programs = {}
+    for name in EXAMPLES:
+        with open(os.path.join(ROOT_DIR, "examples", name)) as f:
+            programs[name] = f.read()
+    programs.update(PROGRAMS)
+    for name, code in programs.items():
+        inlined = measure(code, False, args.runs, args.repeat)
+        optimized = measure(code, True, args.runs, args.repeat)
+        print(f"{name:<20} {inlined:>10.2f} {optimized:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,10 @@ por meio de três modos:
 
 import argparse
 import pprint
+import sys
 
-from minipar.executor import Executor
+from minipar import channel, metrics, optimizer
+from minipar.executor import Executor, default_par_mode
 from minipar.lexer import Lexer
 from minipar.parser import Parser
 from minipar.semantic import SemanticAnalyzer
@@ -38,6 +40,144 @@ def main():
         help="Gera e exibe a Árvore Sintática Abstrata (AST)"
     )
 
+    # Modo de execução dos ramos de blocos paralelos
+    parser.add_argument(
+        "-par",
+        choices=["auto", "thread", "process"],
+        default="auto",
+        help=(
+            "Executa os ramos dos blocos par em threads ou em processos "
+            "(auto: threads, com um aviso quando o GIL impede que executem "
+            "em paralelo)"
+        )
+    )
+
+    # Quantidade de mensagens tratadas simultaneamente por canal servidor
+    parser.add_argument(
+        "-workers",
+        type=int,
+        default=8,
+        help=(
+            "Número de threads que executam a função de cada s_channel "
+            "(no laço de eventos, 0 executa a função no próprio laço)"
+        )
+    )
+
+    # Implementação dos canais servidores
+    parser.add_argument(
+        "-server",
+        choices=["threads", "events"],
+        default="threads",
+        help=(
+            "Atende cada conexão em uma thread ou multiplexa todas as "
+            "conexões em um laço de eventos"
+        )
+    )
+
+    # Delimitação das mensagens trocadas pelos canais
+    parser.add_argument(
+        "-framing",
+        choices=["length", "line"],
+        default="length",
+        help=(
+            "Delimita as mensagens dos canais por prefixo de tamanho ou por "
+            "quebra de linha (compatível com clientes de texto)"
+        )
+    )
+
+    # Limites de mensagens em tratamento pelos canais servidores
+    parser.add_argument(
+        "-max-inflight",
+        type=int,
+        default=channel.MAX_INFLIGHT,
+        help="Mensagens em tratamento por s_channel, somando todas as conexões"
+    )
+    parser.add_argument(
+        "-max-pending",
+        type=int,
+        default=channel.MAX_PENDING,
+        help=(
+            "Mensagens em tratamento por conexão; as seguintes só são lidas "
+            "após as respostas"
+        )
+    )
+    parser.add_argument(
+        "-overload",
+        choices=channel.OVERLOAD_POLICIES,
+        default="pause",
+        help=(
+            "Ao atingir -max-inflight, deixa de ler as conexões (pause) ou "
+            f"responde \"{channel.BUSY_REPLY}\" às mensagens excedentes (busy)"
+        )
+    )
+
+    # Limites de execução do programa e de cada mensagem dos canais servidores
+    parser.add_argument(
+        "-max-steps",
+        type=int,
+        metavar="PASSOS",
+        help="Iterações de laço e chamadas de função permitidas ao programa"
+    )
+    parser.add_argument(
+        "-timeout",
+        type=float,
+        metavar="SEGUNDOS",
+        help="Tempo máximo de execução do programa"
+    )
+    parser.add_argument(
+        "-request-max-steps",
+        type=int,
+        metavar="PASSOS",
+        help="Passos permitidos à função de um s_channel por mensagem"
+    )
+    parser.add_argument(
+        "-request-timeout",
+        type=float,
+        metavar="SEGUNDOS",
+        help="Tempo máximo da função de um s_channel por mensagem"
+    )
+
+    # Exibição das mensagens recebidas pelos canais servidores
+    parser.add_argument(
+        "-quiet",
+        action="store_true",
+        help="Não exibe cada mensagem recebida pelos canais servidores"
+    )
+
+    # Otimização da AST antes da execução
+    parser.add_argument(
+        "-O",
+        dest="optimize",
+        action="store_true",
+        help=(
+            "Otimiza o programa antes da execução (expansão de funções, "
+            "movimentação de invariantes e subexpressões comuns)"
+        )
+    )
+    parser.add_argument(
+        "-opt-report",
+        action="store_true",
+        help="Exibe as transformações realizadas por -O"
+    )
+
+    # Acertos dos caches em linha do executor
+    parser.add_argument(
+        "-cache-stats",
+        action="store_true",
+        help="Exibe os acertos dos caches do executor ao final da execução"
+    )
+
+    # Endpoint local com as métricas dos canais
+    parser.add_argument(
+        "-metrics-port",
+        type=int,
+        metavar="PORTA",
+        help=(
+            "Expõe as métricas dos canais em texto simples via HTTP em "
+            "127.0.0.1:PORTA"
+        )
+    )
+
     # Caminho do arquivo contendo o programa-fonte
     parser.add_argument(
         "name",
@@ -47,6 +187,17 @@ def main():
 
     # Processamento dos argumentos
     args = parser.parse_args()
+    minimum_workers = 0 if args.server == "events" else 1
+    if args.workers < minimum_workers:
+        parser.error(
+            f"-workers deve ser maior ou igual a {minimum_workers} "
+            f"com -server {args.server}"
+        )
+    if args.max_inflight < 1 or args.max_pending < 1:
+        parser.error("-max-inflight e -max-pending devem ser maiores que 0")
+    limits = (args.max_steps, args.timeout, args.request_max_steps, args.request_timeout)
+    if any(limit is not None and limit <= 0 for limit in limits):
+        parser.error("os limites de passos e de tempo devem ser maiores que 0")
 
     # Leitura do conteúdo do arquivo-fonte
     with open(args.name, "r") as f:
@@ -75,8 +226,46 @@ def main():
         ast = parser.start()
         semantic.visit(ast)
 
-        executor = Executor()
-        executor.run(ast)
+        if args.optimize:
+            report = optimizer.optimize(ast)
+            if args.opt_report:
+                for line in report:
+                    print(f"otimização: {line}", file=sys.stderr)
+
+        # Processos separados são utilizados apenas quando solicitados
+        par_mode = default_par_mode() if args.par == "auto" else args.par
+
+        executor = Executor(
+            par_mode=par_mode,
+            workers=args.workers,
+            server_mode=args.server,
+            framing=args.framing,
+            warn_par=args.par == "auto",
+            log_messages=not args.quiet,
+            max_inflight=args.max_inflight,
+            max_pending=args.max_pending,
+            overload=args.overload,
+            max_steps=args.max_steps,
+            timeout=args.timeout,
+            request_max_steps=args.request_max_steps,
+            request_timeout=args.request_timeout,
+        )
+        endpoint = None
+        if args.metrics_port is not None:
+            endpoint = metrics.serve(args.metrics_port, channel.render_metrics)
+        try:
+            executor.run(ast)
+        finally:
+            if endpoint:
+                endpoint.shutdown()
+                endpoint.server_close()
+            if args.cache_stats:
+                for name, cache in executor.cache_stats().items():
+                    print(
+                        f"cache de {name}: {cache.hits} acertos, "
+                        f"{cache.misses} falhas ({cache.hit_rate():.1%})",
+                        file=sys.stderr,
+                    )
 
 
 # Execução do programa, caso seja executado diretamente
@@ -159,6 +159,30 @@ class Call(Expression):
     oper: Optional[str]
 
 
+@dataclass
+class ListLiteral(Expression):
+    """
+    Representa uma lista literal, como [1, 2, 3].
+
+    Attributes:
+        elements (Arguments): Expressões dos elementos da lista.
+    """
+    elements: Arguments
+
+
+@dataclass
+class MapLiteral(Expression):
+    """
+    Representa um mapa literal, como {"a": 1, "b": 2}.
+
+    Attributes:
+        keys (Arguments): Expressões das chaves.
+        values (Arguments): Expressões dos valores, na ordem das chaves.
+    """
+    keys: Arguments
+    values: Arguments
+
+
 @dataclass
 class Cast(Expression):
     """
@@ -271,6 +295,25 @@ class While(Statement):
     body: Body
 
 
+@dataclass
+class For(Statement):
+    """
+    Representa um laço de contagem (for i in a..b step s).
+
+    Attributes:
+        var (str): Nome da variável do laço.
+        start (Expression): Valor inicial, incluído na contagem.
+        stop (Expression): Valor final, excluído da contagem.
+        step (Optional[Expression]): Incremento, 1 se omitido.
+        body (Body): Corpo do laço.
+    """
+    var: str
+    start: Expression
+    stop: Expression
+    step: Optional[Expression]
+    body: Body
+
+
 @dataclass
 class Par(Statement):
     """
@@ -278,8 +321,10 @@ class Par(Statement):
 
     Attributes:
         body (Body): Corpo do bloco paralelo.
+        shared (bool): Indica se os ramos compartilham as variáveis, sem cópia.
     """
     body: Body
+    shared: bool = False
 
 
 @dataclass
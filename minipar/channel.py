@@ -0,0 +1,1412 @@
+"""
+Módulo de Canais de Comunicação
+
+Este módulo implementa os servidores utilizados pelos canais do tipo
+servidor (s_channel), responsáveis por aceitar conexões de clientes e
+encaminhar cada mensagem recebida à função tratadora do canal, e a
+conexão dos canais do tipo cliente (c_channel).
+
+As mensagens trafegam delimitadas (framing) por um prefixo com o seu
+tamanho ("length") ou, por compatibilidade com clientes de texto, por
+quebras de linha ("line").
+"""
+
+import contextlib
+import errno
+import os
+import queue
+import selectors
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from itertools import groupby, islice
+from operator import itemgetter
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Optional, Union
+
+from minipar import error as err
+from minipar import metrics as mt
+
+# Função que recebe a mensagem de um cliente e retorna a resposta
+Handler = Callable[[str], str]
+
+# Quantidade de bytes lidos por chamada a recv no laço de eventos, que
+# compartilha um único bloco entre todas as conexões
+RECV_SIZE = 65536
+
+# Tamanho do bloco de leitura próprio de cada conexão bloqueante
+READ_CHUNK = 16384
+
+# Quantidade máxima de buffers por chamada a sendmsg
+IOV_MAX = 512
+
+# Tamanho (bytes) até o qual os buffers de uma escrita são concatenados
+COPY_LIMIT = 65536
+
+# Prefixo com o tamanho da mensagem: inteiro sem sinal de 4 bytes (big-endian)
+HEADER = struct.Struct("!I")
+
+# Tamanho máximo aceito para uma mensagem
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+# Modos de delimitação de mensagens suportados
+FRAMINGS = ("length", "line")
+
+# Prefixos de endereço dos transportes por socket de domínio Unix e em memória
+UNIX_PREFIX = "unix:"
+INPROC_PREFIX = "inproc:"
+
+# Quantidade de mensagens de um lote enviadas antes de ler as respostas
+PIPELINE_WINDOW = 256
+
+# Tempo (s) sem aceitar conexões após uma falha como falta de descritores
+ACCEPT_BACKOFF = 0.5
+
+# Conexões ociosas mantidas por endereço no conjunto de conexões cliente
+POOL_MAX_IDLE = 8
+
+# Tempo (s) após o qual uma conexão ociosa é encerrada
+POOL_IDLE_TIMEOUT = 60.0
+
+# Mensagens admitidas e ainda não respondidas por servidor
+MAX_INFLIGHT = 1024
+
+# Mensagens lidas de uma conexão e ainda não respondidas
+MAX_PENDING = PIPELINE_WINDOW
+
+# Comportamento de um servidor sobrecarregado: deixar de ler as conexões
+# ("pause") ou recusar as mensagens excedentes com BUSY_REPLY ("busy")
+OVERLOAD_POLICIES = ("pause", "busy")
+
+# Resposta às mensagens recusadas por sobrecarga
+BUSY_REPLY = "servidor ocupado"
+
+
+def respond(handler: Handler, data: str) -> str:
+    """
+    Executa a função tratadora, convertendo erros em uma resposta ao
+    cliente para que as demais conexões continuem sendo atendidas.
+    """
+    try:
+        return handler(data)
+    except Exception as error:
+        return str(error)
+
+
+def frame(data: bytes, framing: str = "length") -> bytes:
+    """
+    Delimita uma mensagem para envio conforme o modo de delimitação.
+    """
+    if framing == "line":
+        return data + b"\n"
+    return HEADER.pack(len(data)) + data
+
+
+def frame_parts(text: str, framing: str = "length") -> tuple[bytes, bytes]:
+    """
+    Codifica uma mensagem e retorna, sem concatená-los, o seu conteúdo e o
+    delimitador, na ordem em que devem ser enviados.
+    """
+    data = text.encode("utf-8")
+    if framing == "line":
+        return data, b"\n"
+    return HEADER.pack(len(data)), data
+
+
+def send_views(sock: socket.socket, views: deque):
+    """
+    Envia buffers em sequência com escrita vetorizada (sendmsg), sem
+    copiá-los para um único buffer, removendo de `views` o que foi enviado.
+    Em sockets não bloqueantes, BlockingIOError indica que restam dados.
+    """
+    while views:
+        if not views[0]:
+            views.popleft()
+            continue
+        if hasattr(sock, "sendmsg"):
+            sent = sock.sendmsg(list(islice(views, IOV_MAX)))
+        else:
+            sent = sock.send(views[0])
+        while sent:
+            size = len(views[0])
+            if sent < size:
+                views[0] = memoryview(views[0])[sent:]
+                break
+            sent -= size
+            views.popleft()
+
+
+def send_parts(sock: socket.socket, parts: list[bytes]):
+    """
+    Envia todos os buffers por um socket bloqueante. Buffers pequenos são
+    concatenados, pois copiá-los custa menos que a escrita vetorizada.
+    """
+    if sum(map(len, parts)) <= COPY_LIMIT:
+        sock.sendall(b"".join(parts))
+    else:
+        send_views(sock, deque(parts))
+
+
+def recv_exactly(sock: socket.socket, view: memoryview) -> bool:
+    """
+    Preenche todo o buffer com dados do socket, lendo diretamente nele.
+
+    Returns:
+        bool: False se a conexão foi encerrada antes de qualquer byte lido.
+
+    Raises:
+        ConnectionError: Se a conexão for encerrada no meio do buffer.
+    """
+    received = 0
+    while received < len(view):
+        count = sock.recv_into(view[received:])
+        if not count:
+            if received == 0:
+                return False
+            raise ConnectionError("conexão encerrada no meio de uma mensagem")
+        received += count
+    return True
+
+
+class MessageReader:
+    """
+    Extrai mensagens completas dos dados recebidos de uma conexão.
+
+    Os dados são lidos com `recv_into` em um bloco reutilizado e acumulados
+    em `buffer`; as mensagens são decodificadas diretamente do buffer, sem
+    cópias intermediárias, e o espaço das mensagens já consumidas só é
+    liberado na próxima leitura.
+
+    Attributes:
+        framing (str): Modo de delimitação das mensagens.
+        buffer (bytearray): Dados recebidos que ainda não formam uma mensagem.
+        start (int): Posição em `buffer` do primeiro byte ainda não consumido.
+        chunk (Optional[memoryview]): Bloco em que os dados são recebidos.
+        received (int): Total de bytes recebidos da conexão.
+    """
+
+    def __init__(self, framing: str = "length", chunk: Optional[memoryview] = None):
+        self.framing = framing
+        self.buffer = bytearray()
+        self.start = 0
+        self.chunk = chunk
+        self.received = 0
+
+    def fill(self, sock: socket.socket) -> int:
+        """
+        Recebe os dados disponíveis no socket, acrescentando-os ao buffer.
+
+        Returns:
+            int: Quantidade de bytes recebidos (0 se a conexão foi encerrada).
+        """
+        if self.chunk is None:
+            self.chunk = memoryview(bytearray(READ_CHUNK))
+        count = sock.recv_into(self.chunk)
+        self.received += count
+        if self.start:
+            del self.buffer[: self.start]
+            self.start = 0
+        self.buffer += self.chunk[:count]
+        return count
+
+    def read(self, sock: socket.socket) -> Optional[str]:
+        """
+        Lê a próxima mensagem de um socket bloqueante. Mensagens pequenas
+        são lidas em blocos, de modo que mensagens enviadas em sequência
+        (pipeline) ficam disponíveis em `next_message` sem novas leituras;
+        o restante de uma mensagem grande é lido com o tamanho exato em um
+        buffer alocado uma única vez.
+
+        Returns:
+            Optional[str]: A mensagem, ou None se a conexão foi encerrada.
+        """
+        while True:
+            message = self.next_message()
+            if message is not None:
+                return message
+            pending = len(self.buffer) - self.start
+            if self.framing == "length" and pending >= HEADER.size:
+                size = self.size()
+                received = pending - HEADER.size
+                if size - received > READ_CHUNK:
+                    body = bytearray(size)
+                    body[:received] = self.buffer[self.start + HEADER.size :]
+                    self.buffer.clear()
+                    self.start = 0
+                    if not recv_exactly(sock, memoryview(body)[received:]):
+                        raise ConnectionError(
+                            "conexão encerrada no meio de uma mensagem"
+                        )
+                    self.received += size - received
+                    return body.decode("utf-8")
+            if not self.fill(sock):
+                if len(self.buffer) > self.start:
+                    raise ConnectionError("conexão encerrada no meio de uma mensagem")
+                return None
+
+    def messages(self, limit: Optional[int] = None) -> list[str]:
+        """
+        Retorna as mensagens completas presentes no buffer, no máximo
+        `limit`; as demais permanecem no buffer.
+        """
+        messages: list[str] = []
+        while limit is None or len(messages) < limit:
+            message = self.next_message()
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+
+    def next_message(self) -> Optional[str]:
+        """
+        Consome e retorna a primeira mensagem completa do buffer, se houver.
+        """
+        if self.framing == "line":
+            end = self.buffer.find(b"\n", self.start)
+            if end < 0:
+                return None
+            return self.take(self.start, end, end + 1)
+
+        if len(self.buffer) - self.start < HEADER.size:
+            return None
+        begin = self.start + HEADER.size
+        end = begin + self.size()
+        if len(self.buffer) < end:
+            return None
+        return self.take(begin, end, end)
+
+    def take(self, begin: int, end: int, following: int) -> str:
+        """
+        Decodifica os bytes [begin, end) do buffer e avança até `following`.
+        Mensagens grandes são decodificadas diretamente do buffer.
+        """
+        if end - begin <= READ_CHUNK:
+            message = self.buffer[begin:end].decode("utf-8")
+        else:
+            with memoryview(self.buffer) as view:
+                message = str(view[begin:end], "utf-8")
+        self.start = following
+        if self.start == len(self.buffer):
+            self.buffer.clear()
+            self.start = 0
+        return message
+
+    def size(self) -> int:
+        """
+        Obtém o tamanho da próxima mensagem a partir do seu prefixo.
+        """
+        (size,) = HEADER.unpack_from(self.buffer, self.start)
+        if size > MAX_MESSAGE_SIZE:
+            raise ConnectionError(f"mensagem de {size} bytes excede o limite")
+        return size
+
+
+class InprocListener:
+    """
+    Socket de escuta do transporte em memória ("inproc:nome"), que não
+    ocupa portas nem arquivos. Cada conexão é um par de sockets conectados
+    (socketpair) criado no próprio processo; o lado do servidor é entregue
+    por `accept`, como em um socket de escuta comum, inclusive ao laço de
+    eventos, que observa o socket de notificação retornado por `fileno`.
+
+    Attributes:
+        name (str): Nome do canal no registro de canais em memória.
+        pending (queue.SimpleQueue): Conexões aguardando `accept`.
+        notify_reader (socket.socket): Recebe um byte por conexão pendente.
+        notify_writer (socket.socket): Sinaliza as conexões pendentes.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pending: queue.SimpleQueue = queue.SimpleQueue()
+        self.notify_reader, self.notify_writer = socket.socketpair()
+
+    def connect(self) -> socket.socket:
+        """
+        Cria uma conexão com o canal, retornando o lado do cliente.
+        """
+        server_end, client_end = socket.socketpair()
+        self.pending.put(server_end)
+        try:
+            self.notify_writer.send(b"\0")
+        except OSError:
+            server_end.close()
+            client_end.close()
+            raise ConnectionRefusedError(f"canal inproc:{self.name} foi encerrado")
+        return client_end
+
+    def accept(self) -> tuple[socket.socket, str]:
+        """
+        Retorna a próxima conexão pendente.
+
+        Raises:
+            BlockingIOError: Se não houver conexões e o modo não for bloqueante.
+            OSError: Se o canal foi encerrado.
+        """
+        if not self.notify_reader.recv(1):
+            raise OSError(f"canal inproc:{self.name} foi encerrado")
+        return self.pending.get_nowait(), self.name
+
+    def fileno(self) -> int:
+        return self.notify_reader.fileno()
+
+    def setblocking(self, flag: bool):
+        self.notify_reader.setblocking(flag)
+
+    def getsockname(self) -> str:
+        return f"{INPROC_PREFIX}{self.name}"
+
+    def shutdown(self, how: int):
+        """
+        Interrompe a espera em `accept`.
+        """
+        self.notify_writer.shutdown(socket.SHUT_WR)
+
+    def close(self):
+        """
+        Remove o canal do registro e encerra as conexões não aceitas.
+        """
+        with _inproc_lock:
+            if _inproc_listeners.get(self.name) is self:
+                del _inproc_listeners[self.name]
+        self.notify_writer.close()
+        self.notify_reader.close()
+        while True:
+            try:
+                self.pending.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# Canais em memória abertos no processo, indexados pelo nome
+_inproc_listeners: dict[str, InprocListener] = {}
+_inproc_lock = threading.Lock()
+
+
+def listen(host: str, port: int):
+    """
+    Cria o socket de escuta de um canal servidor conforme o transporte
+    indicado no endereço: "unix:/caminho" (socket de domínio Unix),
+    "inproc:nome" (em memória, no próprio processo) ou TCP. A porta só é
+    utilizada no transporte TCP.
+    """
+    if host.startswith(UNIX_PREFIX):
+        path = host[len(UNIX_PREFIX) :]
+        # Remove o arquivo de um servidor anterior que não foi encerrado
+        with contextlib.suppress(FileNotFoundError):
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+    elif host.startswith(INPROC_PREFIX):
+        name = host[len(INPROC_PREFIX) :]
+        with _inproc_lock:
+            if name in _inproc_listeners:
+                raise OSError(errno.EADDRINUSE, f"canal {host} já está em uso")
+            listener = _inproc_listeners[name] = InprocListener(name)
+        return listener
+    else:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((host, port))
+    listener.listen(128)
+    return listener
+
+
+def open_connection(host: str, port: int) -> socket.socket:
+    """
+    Conecta-se a um canal servidor pelo transporte indicado no endereço
+    (ver `listen`).
+    """
+    if host.startswith(UNIX_PREFIX):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(host[len(UNIX_PREFIX) :])
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    if host.startswith(INPROC_PREFIX):
+        with _inproc_lock:
+            listener = _inproc_listeners.get(host[len(INPROC_PREFIX) :])
+        if listener is None:
+            raise ConnectionRefusedError(f"canal {host} não existe")
+        return listener.connect()
+    return socket.create_connection((host, port))
+
+
+class ClientChannel:
+    """
+    Conexão de um canal cliente com um canal servidor.
+
+    As requisições podem ser enviadas sem aguardar as respostas anteriores
+    (pipeline). Cada requisição recebe um número sequencial (ticket) e, como
+    o servidor responde na ordem de chegada, a n-ésima resposta recebida
+    pertence ao ticket n.
+
+    Se a conexão falhar em uma requisição feita por `request` sem outras
+    requisições pendentes, o canal se reconecta e a reenvia uma vez.
+
+    Attributes:
+        sock (socket.socket): Socket conectado ao servidor.
+        address (tuple[str, int]): Endereço do servidor.
+        description (str): Descrição enviada pelo servidor ao conectar.
+        pool (Optional[ConnectionPool]): Conjunto ao qual a conexão pertence.
+        framing (str): Modo de delimitação das mensagens.
+        reader (MessageReader): Leitor das mensagens recebidas.
+        lock (threading.Lock): Serializa o uso da conexão por threads diferentes.
+        sent (int): Quantidade de requisições enviadas.
+        received (int): Quantidade de respostas recebidas.
+        replies (dict[int, str]): Respostas recebidas ainda não consumidas.
+    """
+
+    def __init__(self, sock: socket.socket, framing: str = "length"):
+        self.sock = sock
+        self.address: tuple[str, int] = ("", 0)
+        self.description = ""
+        self.pool: Optional["ConnectionPool"] = None
+        self.framing = framing
+        self.reader = MessageReader(framing)
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.received = 0
+        self.replies: dict[int, str] = {}
+
+    @classmethod
+    def connect(cls, host: str, port: int, framing: str = "length"):
+        """
+        Conecta-se a um canal servidor, retornando o canal e sua descrição.
+        """
+        channel = cls(open_connection(host, port), framing)
+        channel.address = (host, port)
+        channel.description = channel.receive()
+        return channel, channel.description
+
+    def reconnect(self):
+        """
+        Substitui o socket por uma nova conexão com o mesmo servidor,
+        descartando as respostas pendentes.
+        """
+        self.sock.close()
+        self.sock = open_connection(*self.address)
+        self.reader = MessageReader(self.framing)
+        self.sent = self.received = 0
+        self.replies.clear()
+        self.description = self.receive()
+        if self.pool:
+            self.pool.record("reconnects")
+
+    def idle(self) -> bool:
+        """
+        Verifica se não há requisições aguardando resposta.
+        """
+        return self.sent == self.received and not self.replies
+
+    def alive(self) -> bool:
+        """
+        Verifica, sem bloquear, se a conexão ociosa continua aberta. Uma
+        conexão encerrada pelo servidor, ou com dados não solicitados, não
+        pode ser reutilizada.
+        """
+        try:
+            self.sock.setblocking(False)
+            try:
+                data = self.sock.recv(1, socket.MSG_PEEK)
+            finally:
+                self.sock.setblocking(True)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        # Fim da conexão (b"") ou dados que não correspondem a requisições
+        return False
+
+    def receive(self) -> str:
+        """
+        Aguarda a próxima mensagem do servidor.
+        """
+        message = self.reader.read(self.sock)
+        if message is None:
+            raise ConnectionError("conexão encerrada pelo servidor")
+        return message
+
+    def request(self, data: str) -> str:
+        """
+        Envia uma mensagem ao servidor e aguarda a resposta.
+        """
+        with self.lock:
+            idle = self.idle()
+            try:
+                return self.collect(self.write(data)[0])
+            except OSError:
+                if not idle:
+                    raise
+            self.reconnect()
+            return self.collect(self.write(data)[0])
+
+    def request_many(self, messages: list[str]) -> list[str]:
+        """
+        Envia várias mensagens em pipeline, retornando as respostas na
+        mesma ordem. As mensagens são enviadas em janelas, lendo as
+        respostas de uma janela após enviar a seguinte, para que nenhum
+        dos lados fique bloqueado com os buffers do socket cheios.
+        """
+        with self.lock:
+            tickets: list[int] = []
+            for start in range(0, len(messages), PIPELINE_WINDOW):
+                window = messages[start : start + PIPELINE_WINDOW]
+                tickets.extend(self.write(*window))
+                if start > 0:
+                    self.fetch(tickets[start - 1])
+            return [self.collect(ticket) for ticket in tickets]
+
+    def submit(self, data: str) -> int:
+        """
+        Envia uma mensagem sem aguardar a resposta.
+
+        Returns:
+            int: Ticket utilizado para obter a resposta com `reply`.
+        """
+        with self.lock:
+            return self.write(data)[0]
+
+    def reply(self, ticket: int) -> str:
+        """
+        Aguarda a resposta de uma mensagem enviada por `submit`.
+        """
+        with self.lock:
+            return self.collect(ticket)
+
+    def write(self, *messages: str) -> range:
+        """
+        Envia um lote de mensagens com uma única escrita no socket. Deve ser
+        chamado com a trava da conexão adquirida.
+
+        Returns:
+            range: Tickets atribuídos às mensagens.
+
+        Raises:
+            RunTimeError: Se uma mensagem contém quebra de linha no modo "line".
+        """
+        if self.framing == "line" and any("\n" in data for data in messages):
+            raise err.RunTimeError(
+                "mensagens com quebra de linha exigem a delimitação por tamanho"
+            )
+        parts: list[bytes] = []
+        for data in messages:
+            parts.extend(frame_parts(data, self.framing))
+        send_parts(self.sock, parts)
+        first = self.sent
+        self.sent += len(messages)
+        return range(first, self.sent)
+
+    def fetch(self, ticket: int):
+        """
+        Lê e guarda as respostas até a do ticket informado, sem consumi-las.
+        Deve ser chamado com a trava da conexão adquirida.
+        """
+        if not 0 <= ticket < self.sent:
+            raise err.RunTimeError(f"ticket {ticket} não foi enviado")
+        while self.received <= ticket:
+            self.replies[self.received] = self.receive()
+            self.received += 1
+
+    def collect(self, ticket: int) -> str:
+        """
+        Consome a resposta do ticket informado, lendo as respostas
+        anteriores que ainda não foram recebidas. Deve ser chamado com a
+        trava da conexão adquirida.
+        """
+        self.fetch(ticket)
+        if ticket not in self.replies:
+            raise err.RunTimeError(f"resposta do ticket {ticket} já foi lida")
+        return self.replies.pop(ticket)
+
+    def close(self):
+        """
+        Encerra a conexão com o servidor.
+        """
+        self.sock.close()
+
+
+class ConnectionPool:
+    """
+    Conjunto de conexões cliente reutilizáveis, compartilhado por todos os
+    canais cliente do processo e indexado pelo endereço do servidor e pela
+    delimitação das mensagens.
+
+    Conexões devolvidas permanecem abertas (keep-alive) e são entregues ao
+    próximo canal que se conectar ao mesmo servidor, desde que continuem
+    abertas. São mantidas no máximo `max_idle` conexões ociosas por
+    endereço, cada uma por até `idle_timeout` segundos.
+
+    Attributes:
+        max_idle (int): Conexões ociosas mantidas por endereço.
+        idle_timeout (float): Tempo máximo (s) de uma conexão ociosa.
+        idle (dict): Conexões ociosas e o instante em que foram devolvidas.
+        counters (dict[str, int]): Reutilizações (hits), novas conexões
+            (misses), conexões descartadas (evictions) e reconexões.
+        lock (threading.Lock): Protege as conexões ociosas e os contadores.
+    """
+
+    def __init__(
+        self, max_idle: int = POOL_MAX_IDLE, idle_timeout: float = POOL_IDLE_TIMEOUT
+    ):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.idle: dict[tuple, deque[tuple[ClientChannel, float]]] = {}
+        self.counters = dict.fromkeys(("hits", "misses", "evictions", "reconnects"), 0)
+        self.lock = threading.Lock()
+
+    def acquire(self, host: str, port: int, framing: str = "length") -> ClientChannel:
+        """
+        Retorna uma conexão ociosa com o servidor, verificando se continua
+        aberta, ou uma nova conexão caso não haja nenhuma disponível.
+        """
+        key = (host, port, framing)
+        while True:
+            with self.lock:
+                self.evict_expired()
+                connections = self.idle.get(key)
+                if not connections:
+                    self.counters["misses"] += 1
+                    break
+                channel, _ = connections.pop()
+            if channel.alive():
+                self.record("hits")
+                return channel
+            channel.close()
+            self.record("evictions")
+
+        channel, _ = ClientChannel.connect(host, port, framing)
+        channel.pool = self
+        return channel
+
+    def release(self, channel: ClientChannel):
+        """
+        Devolve uma conexão ao conjunto, encerrando-a se houver respostas
+        pendentes ou se o limite de conexões ociosas for atingido.
+        """
+        host, port = channel.address
+        key = (host, port, channel.framing)
+        with self.lock:
+            connections = self.idle.setdefault(key, deque())
+            if channel.idle() and len(connections) < self.max_idle:
+                connections.append((channel, time.monotonic()))
+                return
+            self.counters["evictions"] += 1
+        channel.close()
+
+    def evict_expired(self):
+        """
+        Encerra as conexões ociosas há mais de `idle_timeout` segundos.
+        Deve ser chamado com a trava do conjunto adquirida.
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        for connections in self.idle.values():
+            while connections and connections[0][1] < deadline:
+                channel, _ = connections.popleft()
+                channel.close()
+                self.counters["evictions"] += 1
+
+    def record(self, counter: str):
+        """
+        Incrementa um dos contadores do conjunto.
+        """
+        with self.lock:
+            self.counters[counter] += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Retorna os contadores e a quantidade de conexões ociosas.
+        """
+        with self.lock:
+            idle = sum(len(connections) for connections in self.idle.values())
+            return {**self.counters, "idle": idle}
+
+    def clear(self):
+        """
+        Encerra todas as conexões ociosas.
+        """
+        with self.lock:
+            for connections in self.idle.values():
+                for channel, _ in connections:
+                    channel.close()
+            self.idle.clear()
+
+
+# Conjunto de conexões cliente compartilhado pelos executores do processo
+POOL = ConnectionPool()
+
+
+def render_metrics() -> str:
+    """
+    Formata as métricas dos canais servidores e os contadores do conjunto
+    de conexões cliente do processo.
+    """
+    return mt.REGISTRY.render(POOL.stats())
+
+
+Listener = Union[socket.socket, InprocListener]
+
+
+def respond_batch(
+    handler: Handler,
+    batch: list[tuple[str, int]],
+    framing: str,
+    metrics: mt.ServerMetrics,
+) -> list[bytes]:
+    """
+    Trata, em ordem, um lote de mensagens e os instantes (ns) em que foram
+    lidas, registrando o tempo de espera, o tempo da função tratadora e a
+    latência de cada uma. Retorna as partes das respostas delimitadas.
+    """
+    metrics.add("queue_depth", -len(batch))
+    parts: list[bytes] = []
+    latencies, waits, handling = [], [], []
+    for data, started in batch:
+        begin = time.perf_counter_ns()
+        parts.extend(frame_parts(respond(handler, data), framing))
+        end = time.perf_counter_ns()
+        waits.append((begin - started) // 1000)
+        handling.append((end - begin) // 1000)
+        latencies.append((end - started) // 1000)
+    metrics.completed(latencies, waits, handling, sum(map(len, parts)))
+    return parts
+
+
+def reject(count: int, framing: str, metrics: mt.ServerMetrics) -> list[bytes]:
+    """
+    Recusa mensagens por sobrecarga, retornando as partes das respostas
+    BUSY_REPLY delimitadas.
+    """
+    parts = list(frame_parts(BUSY_REPLY, framing)) * count
+    with metrics.lock:
+        metrics.gauges["queue_depth"] -= count
+        metrics.counters["busy"] += count
+        metrics.counters["bytes_out"] += sum(map(len, parts))
+    return parts
+
+
+class Admission:
+    """
+    Limite de mensagens admitidas para tratamento e ainda não respondidas
+    em um servidor. A contagem é o medidor "inflight" das métricas do
+    servidor e é protegida pela mesma trava.
+
+    Attributes:
+        limit (int): Quantidade máxima de mensagens admitidas.
+        gauges (dict[str, int]): Medidores das métricas do servidor.
+        condition (threading.Condition): Aguarda a liberação de vagas.
+        closed (bool): Indica se o servidor foi encerrado.
+    """
+
+    def __init__(self, limit: int, metrics: mt.ServerMetrics):
+        self.limit = limit
+        self.gauges = metrics.gauges
+        self.condition = threading.Condition(metrics.lock)
+        self.closed = False
+
+    def acquire(self, count: int, wait: bool = False) -> int:
+        """
+        Admite até `count` mensagens, retornando quantas foram admitidas.
+        Com `wait`, aguarda até que ao menos uma vaga esteja disponível.
+
+        Raises:
+            RuntimeError: Se o servidor for encerrado durante a espera.
+        """
+        with self.condition:
+            if wait and self.gauges["inflight"] >= self.limit:
+                self.gauges["paused"] += 1
+                while self.gauges["inflight"] >= self.limit and not self.closed:
+                    self.condition.wait()
+                self.gauges["paused"] -= 1
+                if self.closed:
+                    raise RuntimeError("servidor encerrado")
+            granted = max(0, min(count, self.limit - self.gauges["inflight"]))
+            self.gauges["inflight"] += granted
+            return granted
+
+    def release(self, count: int):
+        """
+        Libera as vagas de mensagens respondidas.
+        """
+        if count:
+            with self.condition:
+                self.gauges["inflight"] -= count
+                self.condition.notify(count)
+
+    def full(self) -> bool:
+        """
+        Verifica se não há vagas disponíveis.
+        """
+        return self.gauges["inflight"] >= self.limit
+
+    def close(self):
+        """
+        Interrompe as esperas por vagas.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class ThreadPoolServer:
+    """
+    Servidor que aceita conexões continuamente, lendo cada uma delas em
+    uma thread própria, e executa a função tratadora em um conjunto limitado
+    de threads. O limite se aplica às mensagens em tratamento, não às
+    conexões: clientes ociosos não impedem que novos clientes sejam aceitos.
+
+    Cada conexão tem no máximo `max_pending` mensagens em tratamento; as
+    seguintes só são lidas após as respostas, e o cliente é contido pelos
+    buffers do socket. Quando o servidor atinge `max_inflight` mensagens em
+    tratamento, as threads de leitura aguardam uma vaga ("pause") ou
+    respondem BUSY_REPLY às mensagens lidas ("busy"), conforme `overload`.
+    Assim, a fila do conjunto de threads nunca excede `max_inflight` lotes.
+
+    Attributes:
+        listener (Listener): Socket que aguarda novas conexões.
+        handler (Handler): Função que produz a resposta de cada mensagem.
+        description (Optional[str]): Mensagem enviada a cada cliente conectado.
+        workers (int): Quantidade máxima de mensagens tratadas simultaneamente.
+        framing (str): Modo de delimitação das mensagens.
+        metrics (ServerMetrics): Métricas do servidor.
+        max_inflight (int): Mensagens em tratamento no servidor.
+        max_pending (int): Mensagens em tratamento por conexão.
+        overload (str): Comportamento ao atingir `max_inflight`.
+    """
+
+    def __init__(
+        self,
+        listener: Listener,
+        handler: Handler,
+        description: Optional[str] = None,
+        workers: int = 8,
+        framing: str = "length",
+        metrics: Optional[mt.ServerMetrics] = None,
+        max_inflight: int = MAX_INFLIGHT,
+        max_pending: int = MAX_PENDING,
+        overload: str = "pause",
+    ):
+        self.listener = listener
+        self.handler = handler
+        self.description = description
+        self.workers = workers
+        self.framing = framing
+        self.metrics = metrics or mt.ServerMetrics()
+        self.max_pending = max_pending
+        self.overload = overload
+        self.admission = Admission(max_inflight, self.metrics)
+        self.running = False
+        self.connections: set[socket.socket] = set()
+        self.lock = threading.Lock()
+        self.pool: Optional[ThreadPoolExecutor] = None
+
+    def serve_forever(self):
+        """
+        Aceita conexões até que o servidor seja encerrado, iniciando uma
+        thread de leitura para cada conexão.
+        """
+        self.running = True
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="s_channel"
+        )
+        try:
+            while self.running:
+                try:
+                    conn, _ = self.listener.accept()
+                except OSError:
+                    # O socket de escuta foi fechado por shutdown
+                    break
+                with self.lock:
+                    self.connections.add(conn)
+                self.metrics.connected()
+                threading.Thread(
+                    target=self.serve_connection,
+                    args=(conn,),
+                    name="s_channel-conn",
+                    daemon=True,
+                ).start()
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def serve_connection(self, conn: socket.socket):
+        """
+        Atende uma conexão, respondendo cada mensagem recebida até que o
+        cliente se desconecte. A descrição do canal é sempre a primeira
+        mensagem enviada, mesmo que vazia. Mensagens recebidas em sequência
+        (pipeline) são tratadas em ordem e respondidas com uma única escrita.
+        """
+        reader = MessageReader(self.framing)
+        metrics = self.metrics
+        try:
+            banner = list(frame_parts(self.description or "", self.framing))
+            send_parts(conn, banner)
+            metrics.add("bytes_out", sum(map(len, banner)))
+            while self.running:
+                received = reader.received
+                data = reader.read(conn)
+                if data is None:
+                    break
+                started = time.perf_counter_ns()
+                admitted = self.admission.acquire(
+                    self.max_pending, wait=self.overload == "pause"
+                )
+                messages = [data, *reader.messages((admitted or self.max_pending) - 1)]
+                metrics.received(reader.received - received, len(messages))
+                if admitted:
+                    self.admission.release(admitted - len(messages))
+                    batch = [(message, started) for message in messages]
+                    try:
+                        replies = self.pool.submit(
+                            respond_batch, self.handler, batch, self.framing, metrics
+                        ).result()
+                    finally:
+                        self.admission.release(len(messages))
+                else:
+                    replies = reject(len(messages), self.framing, metrics)
+                send_parts(conn, replies)
+        except (OSError, RuntimeError, CancelledError):
+            # RuntimeError e CancelledError: o conjunto foi encerrado
+            pass
+        finally:
+            with self.lock:
+                self.connections.discard(conn)
+            metrics.disconnected()
+            conn.close()
+
+    def shutdown(self):
+        """
+        Encerra o servidor, interrompendo a espera por conexões e fechando
+        as conexões ativas.
+        """
+        self.running = False
+        self.admission.close()
+        try:
+            self.listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.listener.close()
+        with self.lock:
+            connections = list(self.connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# Implementações disponíveis de servidor para os canais
+Server = Union[ThreadPoolServer, "EventLoopServer"]
+
+
+class Connection:
+    """
+    Estado de uma conexão atendida pelo laço de eventos.
+
+    Attributes:
+        sock (socket.socket): Socket não bloqueante da conexão.
+        reader (MessageReader): Leitor das mensagens recebidas.
+        output (deque): Buffers das respostas aguardando envio ao cliente.
+        pending (deque[tuple[str, int, bool]]): Mensagens recebidas ainda
+            não tratadas, o instante (ns) em que foram lidas e se foram
+            admitidas (as demais são respondidas com BUSY_REPLY).
+        busy (bool): Indica se uma mensagem da conexão está sendo tratada.
+        events (int): Eventos observados no socket pelo laço.
+    """
+
+    __slots__ = ("sock", "reader", "output", "pending", "busy", "events")
+
+    def __init__(self, sock: socket.socket, framing: str, chunk: memoryview):
+        self.sock = sock
+        self.reader = MessageReader(framing, chunk)
+        self.output: deque = deque()
+        self.pending: deque[tuple[str, int, bool]] = deque()
+        self.busy = False
+        self.events = 0
+
+
+class EventLoopServer:
+    """
+    Servidor que multiplexa todas as conexões em uma única thread com um
+    laço de eventos (selectors). Conexões ociosas não ocupam threads; apenas
+    mensagens completas são entregues à função tratadora, que executa na
+    própria thread do laço ou, quando `workers` é maior que zero, em um
+    conjunto de threads. As mensagens de uma mesma conexão são tratadas e
+    respondidas na ordem em que chegaram.
+
+    Uma conexão com `max_pending` mensagens não tratadas deixa de ser lida
+    até que sejam respondidas. Quando o servidor atinge `max_inflight`
+    mensagens admitidas, as conexões deixam de ser lidas ("pause") ou as
+    mensagens excedentes são respondidas com BUSY_REPLY ("busy"), conforme
+    `overload`. Mensagens ainda não extraídas permanecem no buffer do
+    leitor e nos buffers do socket.
+
+    Attributes:
+        listener (Listener): Socket que aguarda novas conexões.
+        handler (Handler): Função que produz a resposta de cada mensagem.
+        description (Optional[str]): Mensagem enviada a cada cliente conectado.
+        workers (int): Threads para a função tratadora (0 executa no laço).
+        framing (str): Modo de delimitação das mensagens.
+        metrics (ServerMetrics): Métricas do servidor.
+        max_inflight (int): Mensagens admitidas e não respondidas no servidor.
+        max_pending (int): Mensagens lidas e não respondidas por conexão.
+        overload (str): Comportamento ao atingir `max_inflight`.
+    """
+
+    def __init__(
+        self,
+        listener: Listener,
+        handler: Handler,
+        description: Optional[str] = None,
+        workers: int = 0,
+        framing: str = "length",
+        metrics: Optional[mt.ServerMetrics] = None,
+        max_inflight: int = MAX_INFLIGHT,
+        max_pending: int = MAX_PENDING,
+        overload: str = "pause",
+    ):
+        self.listener = listener
+        self.handler = handler
+        self.description = description
+        self.workers = workers
+        self.framing = framing
+        self.metrics = metrics or mt.ServerMetrics()
+        self.max_pending = max_pending
+        self.overload = overload
+        self.admission = Admission(max_inflight, self.metrics)
+        self.running = False
+        self.selector = selectors.DefaultSelector()
+        self.connections: dict[socket.socket, Connection] = {}
+        self.paused: set[Connection] = set()
+        self.completed: queue.SimpleQueue = queue.SimpleQueue()
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        # Bloco de leitura compartilhado pelas conexões atendidas no laço
+        self.chunk = memoryview(bytearray(RECV_SIZE))
+        self.accept_paused_until: Optional[float] = None
+
+    def serve_forever(self):
+        """
+        Executa o laço de eventos até que o servidor seja encerrado.
+        """
+        self.running = True
+        self.listener.setblocking(False)
+        self.wakeup_reader.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ)
+        if self.workers > 0:
+            self.pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="s_channel"
+            )
+
+        try:
+            while self.running:
+                for key, events in self.selector.select(self.accept_timeout()):
+                    if key.fileobj is self.listener:
+                        self.accept()
+                    elif key.fileobj is self.wakeup_reader:
+                        self.drain_wakeup()
+                    else:
+                        conn = key.data
+                        if events & selectors.EVENT_READ:
+                            self.read(conn)
+                        writable = events & selectors.EVENT_WRITE
+                        if writable and conn.sock in self.connections:
+                            self.write(conn)
+                self.deliver_completed()
+        finally:
+            if self.pool:
+                self.pool.shutdown(wait=False, cancel_futures=True)
+            for conn in list(self.connections.values()):
+                self.close(conn)
+            self.selector.close()
+            self.listener.close()
+            self.wakeup_reader.close()
+            self.wakeup_writer.close()
+
+    def accept(self):
+        """
+        Aceita as conexões pendentes, enviando a descrição do canal. Se
+        uma conexão não puder ser aceita (por exemplo, por falta de
+        descritores de arquivo), o socket de escuta deixa de ser observado
+        por `ACCEPT_BACKOFF` segundos, evitando que o laço fique ocupado
+        tentando aceitá-la continuamente.
+        """
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            except ConnectionAbortedError:
+                continue
+            except OSError as error:
+                print(f"s_channel: falha ao aceitar conexão: {error}", file=sys.stderr)
+                self.selector.unregister(self.listener)
+                self.accept_paused_until = time.monotonic() + ACCEPT_BACKOFF
+                return
+            sock.setblocking(False)
+            conn = Connection(sock, self.framing, self.chunk)
+            self.connections[sock] = conn
+            self.metrics.connected()
+            self.send(conn, self.description or "")
+
+    def accept_timeout(self) -> Optional[float]:
+        """
+        Retoma a observação do socket de escuta quando a pausa termina,
+        retornando o tempo máximo de espera do laço.
+        """
+        if self.accept_paused_until is None:
+            return None
+        remaining = self.accept_paused_until - time.monotonic()
+        if remaining > 0:
+            return remaining
+        self.accept_paused_until = None
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        return None
+
+    def read(self, conn: Connection):
+        """
+        Lê os dados disponíveis da conexão e encaminha as mensagens
+        completas para a função tratadora.
+        """
+        try:
+            count = conn.reader.fill(conn.sock)
+            if count:
+                self.metrics.received(count, self.admit(conn))
+        except BlockingIOError:
+            return
+        except OSError:
+            count = 0
+        if not count:
+            self.close(conn)
+            return
+        self.dispatch(conn)
+        self.watch(conn)
+
+    def admit(self, conn: Connection) -> int:
+        """
+        Extrai do leitor as mensagens que cabem na fila da conexão,
+        admitindo-as enquanto houver vagas no servidor. Com `overload`
+        igual a "busy", as mensagens sem vaga são marcadas para recusa.
+
+        Returns:
+            int: Quantidade de mensagens acrescentadas à fila.
+        """
+        room = self.max_pending - len(conn.pending)
+        if room <= 0:
+            return 0
+        admitted = self.admission.acquire(room)
+        messages = conn.reader.messages(admitted) if admitted else []
+        self.admission.release(admitted - len(messages))
+        started = time.perf_counter_ns()
+        conn.pending.extend([(data, started, True) for data in messages])
+        count = len(messages)
+        if self.overload == "busy" and count == admitted < room:
+            rejected = conn.reader.messages(room - admitted)
+            conn.pending.extend([(data, started, False) for data in rejected])
+            count += len(rejected)
+        return count
+
+    def dispatch(self, conn: Connection):
+        """
+        Trata a próxima mensagem pendente da conexão, caso nenhuma outra
+        mensagem dela esteja em tratamento. Sem o conjunto de threads, todas
+        as mensagens pendentes são tratadas e respondidas com uma única escrita.
+        """
+        pending = conn.pending
+        if self.pool is None:
+            if pending:
+                while pending:
+                    self.respond_pending(conn)
+                    # Mensagens que não cabiam na fila continuam no leitor
+                    self.metrics.received(0, self.admit(conn))
+                self.write(conn)
+            return
+
+        while pending and not conn.busy:
+            data, started, admitted = pending.popleft()
+            if not admitted:
+                conn.output.extend(reject(1, self.framing, self.metrics))
+                self.write(conn)
+                continue
+            conn.busy = True
+            batch = [(data, started)]
+            future = self.pool.submit(
+                respond_batch, self.handler, batch, self.framing, self.metrics
+            )
+            future.add_done_callback(
+                lambda done, conn=conn: self.complete(conn, done)
+            )
+
+    def respond_pending(self, conn: Connection):
+        """
+        Trata, na thread do laço, todas as mensagens pendentes da conexão,
+        acrescentando as respostas aos dados a enviar.
+        """
+        entries = list(conn.pending)
+        conn.pending.clear()
+        for admitted, group in groupby(entries, key=itemgetter(2)):
+            batch = [(data, started) for data, started, _ in group]
+            if admitted:
+                conn.output.extend(
+                    respond_batch(self.handler, batch, self.framing, self.metrics)
+                )
+                self.admission.release(len(batch))
+            else:
+                conn.output.extend(reject(len(batch), self.framing, self.metrics))
+
+    def complete(self, conn: Connection, future: Future):
+        """
+        Recebe, em uma thread do conjunto, a resposta de uma mensagem,
+        liberando sua vaga, e acorda o laço de eventos para enviá-la.
+        """
+        self.admission.release(1)
+        if not future.cancelled():
+            self.completed.put((conn, future.result()))
+            self.wakeup()
+
+    def deliver_completed(self):
+        """
+        Envia as respostas produzidas pelo conjunto de threads e volta a
+        ler as conexões pausadas que voltaram a ter vagas.
+        """
+        delivered = False
+        while True:
+            try:
+                conn, parts = self.completed.get_nowait()
+            except queue.Empty:
+                break
+            delivered = True
+            conn.busy = False
+            if conn.sock in self.connections:
+                conn.output.extend(parts)
+                # Mensagens que não cabiam na fila continuam no leitor
+                self.metrics.received(0, self.admit(conn))
+                self.dispatch(conn)
+                self.write(conn)
+        if delivered and self.paused:
+            self.resume()
+
+    def resume(self):
+        """
+        Admite as mensagens já recebidas pelas conexões pausadas e volta a
+        observá-las quando houver vagas.
+        """
+        for conn in list(self.paused):
+            if self.overload == "pause" and self.admission.full():
+                return
+            if conn.sock in self.connections:
+                self.metrics.received(0, self.admit(conn))
+                self.dispatch(conn)
+                self.watch(conn)
+
+    def watch(self, conn: Connection):
+        """
+        Atualiza os eventos observados no socket da conexão: a leitura é
+        suspensa quando a fila da conexão está cheia ou, com `overload`
+        igual a "pause", quando o servidor não tem vagas; a escrita é
+        observada enquanto houver dados a enviar.
+        """
+        paused = len(conn.pending) >= self.max_pending or (
+            self.overload == "pause" and self.admission.full()
+        )
+        if paused != (conn in self.paused):
+            if paused:
+                self.paused.add(conn)
+            else:
+                self.paused.discard(conn)
+            self.metrics.add("paused", 1 if paused else -1)
+        events = 0 if paused else selectors.EVENT_READ
+        if conn.output:
+            events |= selectors.EVENT_WRITE
+        if events == conn.events:
+            return
+        if not conn.events:
+            self.selector.register(conn.sock, events, conn)
+        elif not events:
+            self.selector.unregister(conn.sock)
+        else:
+            self.selector.modify(conn.sock, events, conn)
+        conn.events = events
+
+    def send(self, conn: Connection, reply: str):
+        """
+        Adiciona uma resposta aos dados a enviar, tentando enviá-la imediatamente.
+        """
+        parts = frame_parts(reply, self.framing)
+        conn.output.extend(parts)
+        self.metrics.add("bytes_out", len(parts[0]) + len(parts[1]))
+        self.write(conn)
+
+    def write(self, conn: Connection):
+        """
+        Envia o máximo possível dos dados pendentes, aguardando o socket
+        ficar disponível para escrita quando restarem dados.
+        """
+        output = conn.output
+        if len(output) > 1 and sum(map(len, output)) <= COPY_LIMIT:
+            # Respostas pequenas são concatenadas em um único buffer
+            joined = b"".join(output)
+            output.clear()
+            output.append(joined)
+        try:
+            send_views(conn.sock, output)
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.close(conn)
+            return
+        self.watch(conn)
+
+    def close(self, conn: Connection):
+        """
+        Encerra uma conexão, removendo-a do laço de eventos e liberando as
+        vagas das mensagens que não serão tratadas.
+        """
+        if self.connections.pop(conn.sock, None) is None:
+            return
+        self.metrics.disconnected()
+        if conn in self.paused:
+            self.paused.discard(conn)
+            self.metrics.add("paused", -1)
+        if conn.pending:
+            admitted = sum(entry[2] for entry in conn.pending)
+            self.admission.release(admitted)
+            self.metrics.add("queue_depth", -len(conn.pending))
+            conn.pending.clear()
+        if conn.events:
+            self.selector.unregister(conn.sock)
+        conn.sock.close()
+
+    def wakeup(self):
+        """
+        Interrompe a espera do laço de eventos.
+        """
+        try:
+            self.wakeup_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def drain_wakeup(self):
+        """
+        Descarta os sinais acumulados de interrupção do laço.
+        """
+        try:
+            while self.wakeup_reader.recv(RECV_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+
+    def shutdown(self):
+        """
+        Encerra o servidor a partir de qualquer thread.
+        """
+        self.running = False
+        self.wakeup()
@@ -1,15 +1,17 @@
-import socket
+import itertools
+import multiprocessing
+import sys
 import threading
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from dataclasses import dataclass, field
 from enum import Enum
-from time import sleep
+from time import monotonic, sleep
 
-from minipar import ast
+from minipar import ast, channel, mathlib, metrics, text, vector
 from minipar import error as err
+from minipar.shared import Atomic, Barrier, Mutex, SharedArray
 from minipar.symtable import VarTable
-from minipar.token import Token
 
 
 class commands(Enum):
@@ -20,20 +22,207 @@ class commands(Enum):
     CONTINUE = "CONTINUE"
     RETURN = "RETURN"
 
+
+# Passos executados entre duas verificações do prazo de uma execução
+CHECK_INTERVAL = 1024
+
+
+class Budget:
+    """
+    Limite de passos e prazo de uma execução: do programa inteiro ou de
+    cada mensagem tratada por um canal servidor. Cada iteração de laço e
+    cada chamada de função do programa consome um passo. Para manter a
+    contagem barata, um passo apenas decrementa um contador, e o total de
+    passos e o relógio são verificados a cada `CHECK_INTERVAL` passos.
+
+    Attributes:
+        max_steps (int | None): Passos permitidos; None não limita.
+        timeout (float | None): Tempo (s) permitido; None não limita.
+        steps (int | None): Passos restantes até a última verificação.
+        deadline (float | None): Instante (`time.monotonic`) limite.
+        interval (int): Passos entre a verificação anterior e a próxima.
+        countdown (int): Passos restantes até a próxima verificação.
+    """
+
+    __slots__ = ("max_steps", "timeout", "steps", "deadline", "interval", "countdown")
+
+    def __init__(self, max_steps: int | None = None, timeout: float | None = None):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.steps = max_steps
+        self.deadline = monotonic() + timeout if timeout is not None else None
+        self.interval = self.countdown = self.next_interval()
+
+    def next_interval(self) -> int:
+        """
+        Retorna a quantidade de passos até a próxima verificação.
+        """
+        if self.steps is None:
+            return CHECK_INTERVAL
+        return max(min(self.steps, CHECK_INTERVAL), 1)
+
+    def spend(self):
+        """
+        Consome um passo, verificando os limites quando necessário.
+        """
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.check()
+
+    def check(self):
+        """
+        Desconta os passos consumidos desde a verificação anterior e encerra
+        a execução se os passos ou o prazo se esgotaram.
+        """
+        if self.steps is not None:
+            self.steps -= self.interval - self.countdown
+            if self.steps < 0:
+                raise err.RunTimeError(
+                    f"limite de {self.max_steps} passos de execução excedido"
+                )
+        if self.deadline is not None and monotonic() > self.deadline:
+            raise err.RunTimeError(f"tempo limite de {self.timeout:g} s excedido")
+        self.interval = self.countdown = self.next_interval()
+
+
+class InlineCache:
+    """
+    Cache em linha de um tipo de nó da AST: guarda, para cada nó, o que foi
+    resolvido em sua última execução, indexado pelo id do nó. Cada entrada
+    começa pelo próprio nó, de modo que um id reutilizado por outro nó não
+    é confundido com ele. Os contadores são aproximados quando várias
+    threads executam o mesmo executor.
+
+    Attributes:
+        entries (dict[int, tuple]): Entradas (nó, ...) indexadas pelo id do nó.
+        hits (int): Execuções que reutilizaram a entrada do nó.
+        misses (int): Execuções que precisaram resolver o nó.
+    """
+
+    __slots__ = ("entries", "hits", "misses")
+
+    def __init__(self):
+        self.entries: dict[int, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        """
+        Retorna a fração das execuções que reutilizaram uma entrada.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def gil_enabled() -> bool:
+    """
+    Verifica se o interpretador Python em execução utiliza o GIL. Builds sem
+    GIL (free-threaded, a partir do Python 3.13t) executam threads em paralelo.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
+# Aviso exibido no modo automático quando os ramos em threads não executam
+# cálculos em paralelo
+GIL_WARNING = (
+    "aviso: o Python em execução possui GIL; os ramos dos blocos par "
+    "executados em threads não realizam cálculos em paralelo "
+    "(utilize -par process)"
+)
+
+
+def default_par_mode() -> str:
+    """
+    Define o modo de execução paralela padrão: threads, que executam em
+    paralelo quando o GIL está desabilitado (ver `gil_enabled`). A execução
+    em processos separados ("process") precisa ser solicitada explicitamente,
+    pois os processos filhos não compartilham a entrada padrão do programa.
+    """
+    return "thread"
+
+
+def par_mode_warning() -> str | None:
+    """
+    Retorna o aviso a exibir quando o modo padrão não executa os ramos em
+    paralelo, ou None quando o Python não possui GIL.
+    """
+    return GIL_WARNING if gil_enabled() else None
+
+
 @dataclass
 class Executor():
     """
     Implementação concreta do executor de nós da AST.
     Gerencia tabelas de variáveis, funções e conexões durante a execução.
+
+    O atributo `par_mode` define como os ramos de um bloco paralelo são
+    executados: em threads ("thread") ou em processos separados ("process").
+
+    A tabela `var_table` corresponde ao escopo global. O escopo corrente é
+    mantido em um quadro de execução próprio de cada thread (`frames`), o que
+    permite que várias threads executem funções do mesmo executor.
+
+    O atributo `workers` é o número de threads que executam a função de
+    cada canal servidor. O atributo `server_mode` define a implementação dos
+    canais servidores: uma thread de leitura por conexão ("threads") ou um
+    laço de eventos que multiplexa todas as conexões ("events"), no qual
+    `workers` igual a 0 executa a função no próprio laço. O atributo
+    `framing` define como as mensagens dos canais são delimitadas e
+    `log_messages` se cada mensagem recebida pelos canais servidores é exibida.
+    Os atributos `max_inflight`, `max_pending` e `overload` limitam as
+    mensagens em tratamento por canal servidor e por conexão e definem o
+    comportamento do servidor sobrecarregado (ver `channel.ThreadPoolServer`).
+
+    Os atributos `max_steps` e `timeout` limitam os passos e o tempo (s) de
+    execução do programa, e `request_max_steps` e `request_timeout` os de
+    cada mensagem tratada pelos canais servidores (ver `Budget`). Ao esgotar
+    um limite, a execução é encerrada com `RunTimeError`; nos canais
+    servidores, a mensagem de erro é a resposta da mensagem.
+
+    Quando `warn_par` é verdadeiro, o primeiro bloco paralelo executado em
+    threads exibe `par_mode_warning`, se houver, na saída de erros.
+
+    Cada executor mantém caches em linha (`InlineCache`) da tabela em que
+    cada identificador foi encontrado, do destino de cada chamada e do valor
+    de cada constante, com contadores de acertos (ver `cache_stats`).
     """
     var_table: VarTable = field(default_factory=VarTable)
     function_table: dict[str, ast.FuncDef] = field(default_factory=dict)
-    connection_table: dict[str, socket.socket] = field(default_factory=dict)
+    connection_table: dict[str, channel.ClientChannel] = field(default_factory=dict)
+    par_mode: str = "thread"
+    workers: int = 8
+    server_mode: str = "threads"
+    framing: str = "length"
+    warn_par: bool = False
+    log_messages: bool = True
+    max_inflight: int = channel.MAX_INFLIGHT
+    max_pending: int = channel.MAX_PENDING
+    overload: str = "pause"
+    max_steps: int | None = None
+    timeout: float | None = None
+    request_max_steps: int | None = None
+    request_timeout: float | None = None
+    server_table: dict[str, channel.Server] = field(default_factory=dict)
 
     def __post_init__(self):
         """
-        Inicializa funções padrão disponíveis durante a execução.
+        Inicializa os quadros de execução, as funções padrão disponíveis
+        durante a execução e os caches em linha dos nós.
         """
+        self.frames = threading.local()
+        # Caches em linha das variáveis (ver `lookup`), das chamadas (ver
+        # `exec_Call`) e das constantes, e o método de execução de cada tipo
+        # de nó. A época muda a cada variável declarada (ver `declare`),
+        # invalidando as tabelas de variáveis já resolvidas.
+        self.variable_cache = InlineCache()
+        self.call_cache = InlineCache()
+        self.constant_cache = InlineCache()
+        self.declarations = itertools.count(1)
+        self.epoch = 0
+        self.handlers: dict[type, object] = {}
+        self.block_scopes: dict[int, tuple[ast.Body, bool]] = {}
+        self.bound_functions: dict[str, object] = {}
         self.default_functions = {
             "print": print,
             "input": input,
@@ -46,38 +235,218 @@ class Executor():
             "len": len,
             "isalpha": self.isalpha,
             "isnum": self.isnum,
+            "shared": SharedArray.create,
+            "shared_slice": self.shared_slice,
+            "mutex": Mutex,
+            "mutex_lock": Mutex.lock,
+            "mutex_unlock": Mutex.unlock,
+            "atomic": Atomic,
+            "atomic_load": Atomic.load,
+            "atomic_fetch_add": Atomic.fetch_add,
+            "atomic_compare_swap": Atomic.compare_swap,
+            "barrier": Barrier,
+            "barrier_wait": Barrier.wait,
+            "channel_stats": channel.render_metrics,
+            "append": list.append,
+            "vector": vector.vector,
+            "matrix": vector.matrix,
+            "vec_dot": vector.dot,
+            "vec_sum": vector.Array.sum,
+            "vec_map": self.vec_map,
+            "map_get": dict.get,
+            "map_set": dict.__setitem__,
+            "map_has": dict.__contains__,
+            "map_keys": list,
+            "strbuf": text.StrBuf,
+            "strbuf_append": text.StrBuf.append,
+            "strbuf_string": str,
+            "str_split": text.split,
+            "str_find": str.find,
+            "str_substr": text.substr,
+            "str_replace": str.replace,
+            "str_strip": str.strip,
+            "str_join": text.join,
+            "parse_number": text.parse_number,
+            **mathlib.FUNCTIONS,
+        }
+        # Métodos dos canais cliente, chamados como canal.send(...)
+        self.channel_methods = {
+            "send": self.send,
+            "send_many": self.send_many,
+            "send_async": self.send_async,
+            "receive": self.receive,
+            "close": self.close,
         }
 
     def run(self, node: ast.Module):
         """
         Executa o nó principal do programa, iterando sobre suas instruções.
         """
-        if node.stmts:
-            for stmt in node.stmts:
-                self.execute(stmt)
+        if self.max_steps is not None or self.timeout is not None:
+            self.frames.budget = Budget(self.max_steps, self.timeout)
+        try:
+            if node.stmts:
+                for stmt in node.stmts:
+                    self.execute(stmt)
+        finally:
+            # Canais não fechados pelo programa também voltam ao conjunto
+            for conn_name in list(self.connection_table):
+                self.close(conn_name)
 
     def execute(self, node: ast.Node):
         """
-        Identifica e executa o método correspondente ao tipo do nó.
+        Identifica e executa o método correspondente ao tipo do nó. O método
+        de cada tipo é procurado apenas na primeira vez.
+        """
+        node_type = type(node)
+        method = self.handlers.get(node_type)
+        if method is None:
+            method = getattr(self, f"exec_{node_type.__name__}", self.ignore)
+            self.handlers[node_type] = method
+        return method(node)
+
+    def ignore(self, _: ast.Node):
+        """
+        Nós sem método de execução próprio não realizam nenhuma operação.
+        """
+        return None
+
+    def lookup(self, node: ast.ID) -> VarTable | None:
+        """
+        Retorna a tabela de variáveis, a partir do escopo corrente, em que o
+        identificador está definido, ou None. A tabela encontrada na última
+        execução do nó é reutilizada enquanto o escopo corrente for o mesmo
+        e nenhuma variável tiver sido declarada desde então (ver `declare`).
         """
-        meth_name: str = f"exec_{type(node).__name__}"
-        method = getattr(self, meth_name, None)
+        scope = self.scope
+        name = node.token.value
+        cache = self.variable_cache
+        entry = cache.entries.get(id(node))
+        if (
+            entry is not None
+            and entry[0] is node
+            and entry[1] is scope
+            and entry[2] == self.epoch
+            and entry[3].table.get(name) is not None
+        ):
+            cache.hits += 1
+            return entry[3]
+        cache.misses += 1
+        # A época é lida antes da busca: uma declaração concorrente invalida
+        # a entrada criada a seguir
+        epoch = self.epoch
+        var_scope = scope.find(name)
+        if var_scope is not None:
+            cache.entries[id(node)] = (node, scope, epoch, var_scope)
+        return var_scope
 
-        if method:
-            return method(node)
+    def declare(self, var_scope: VarTable, name: str, value):
+        """
+        Armazena o valor de uma variável na tabela informada. Quando a
+        variável ainda não existe na tabela (ou está sem valor, ignorada por
+        `VarTable.find`), ela pode passar a ocultar a de um escopo superior,
+        e a época dos caches de variáveis é renovada.
+        """
+        new = var_scope.table.get(name) is None
+        var_scope.table[name] = value
+        if new:
+            self.epoch = next(self.declarations)
+
+    def cache_stats(self) -> dict[str, InlineCache]:
+        """
+        Retorna os caches em linha do executor, com seus contadores.
+        """
+        return {
+            "variáveis": self.variable_cache,
+            "chamadas": self.call_cache,
+            "constantes": self.constant_cache,
+        }
+
+    def step(self):
+        """
+        Consome um passo do limite de execução da thread atual, se houver.
+        """
+        budget = getattr(self.frames, "budget", None)
+        if budget is not None:
+            budget.spend()
+
+    @property
+    def scope(self) -> VarTable:
+        """
+        Retorna o escopo corrente da thread em execução, iniciando pelo escopo
+        global na primeira vez em que a thread executa código.
+        """
+        try:
+            return self.frames.scope
+        except AttributeError:
+            self.frames.scope = self.var_table
+            return self.var_table
+
+    @scope.setter
+    def scope(self, table: VarTable):
+        self.frames.scope = table
 
     def enter_scope(self):
         """
         Cria um novo escopo, vinculando uma nova tabela de variáveis ao escopo atual.
         """
-        self.var_table = VarTable(prev=self.var_table)
+        self.scope = VarTable(prev=self.scope)
 
     def exit_scope(self):
         """
         Retorna ao escopo anterior, descartando a tabela de variáveis atual.
         """
-        if self.var_table.prev:
-            self.var_table = self.var_table.prev
+        scope = self.scope
+        if scope.prev:
+            self.scope = scope.prev
+
+    def run_branch(
+        self,
+        stmt: ast.Node,
+        scope: VarTable | None = None,
+        budget: Budget | None = None,
+    ):
+        """
+        Executa um ramo paralelo na thread atual a partir do escopo informado,
+        consumindo os passos e o prazo do bloco que o iniciou.
+        """
+        if scope is not None:
+            self.scope = scope
+        self.frames.budget = budget
+        self.execute(stmt)
+
+    def __getstate__(self):
+        """
+        Serializa o executor para um ramo em processo separado, mantendo apenas
+        o escopo corrente, as funções declaradas e as opções de execução.
+        """
+        return {
+            "var_table": self.scope,
+            "function_table": self.function_table,
+            **self.options(),
+        }
+
+    def options(self) -> dict:
+        """
+        Retorna as opções de execução herdadas pelos ramos de blocos paralelos.
+        """
+        return {
+            "par_mode": self.par_mode,
+            "workers": self.workers,
+            "server_mode": self.server_mode,
+            "framing": self.framing,
+            "log_messages": self.log_messages,
+            "max_inflight": self.max_inflight,
+            "max_pending": self.max_pending,
+            "overload": self.overload,
+            "max_steps": self.max_steps,
+            "timeout": self.timeout,
+            "request_max_steps": self.request_max_steps,
+            "request_timeout": self.request_timeout,
+        }
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
 
     ###### EXECUÇÃO DE INSTRUÇÕES #####
     
@@ -87,11 +456,20 @@ class Executor():
         """
         value = self.execute(node.right)
         var_name = node.left.token.value
+
+        if isinstance(node.left, ast.Access):
+            container = self.execute(node.left.id)
+            index = self.execute(node.left.expr)
+            if type(container) is not dict:
+                index = self.index(container, index, node.left)
+            container[index] = value
+            return var_name
+
         is_declared = getattr(node.left, "decl", False)
-        var_scope = self.var_table.find(var_name)
+        var_scope = None if is_declared else self.lookup(node.left)
 
-        if is_declared or not var_scope:
-            self.var_table.table[var_name] = value
+        if var_scope is None:
+            self.declare(self.scope, var_name, value)
         else:
             var_scope.table[var_name] = value
 
@@ -130,6 +508,9 @@ class Executor():
         for stmt in block:
             if isinstance(stmt, ast.Assign):
                 self.exec_Assign(stmt)
+            elif isinstance(stmt, ast.Call):
+                # O valor de uma chamada usada como instrução é descartado
+                self.exec_Call(stmt)
             elif isinstance(stmt, ast.Return):
                 return self.execute(stmt)
             else:
@@ -142,17 +523,34 @@ class Executor():
     def exec_If(self, node: ast.If):
         """
         Executa uma instrução condicional, avaliando a condição e executando o bloco correspondente.
+        Um bloco que não declara variáveis é executado no escopo atual, pois
+        seu escopo permaneceria vazio, o que mantém válidos os caches de
+        variáveis de seus nós.
         """
-        condition = self.execute(node.condition)
-        result = None
+        block = node.body if self.execute(node.condition) else node.else_stmt
+        if not block:
+            return None
+        if not self.declares(block):
+            return self.exec_block(block)
         self.enter_scope()
-        if condition:
-            result = self.exec_block(node.body)
-        elif node.else_stmt:
-            result = self.exec_block(node.else_stmt)
+        result = self.exec_block(block)
         self.exit_scope()
         return result
 
+    def declares(self, block: ast.Body) -> bool:
+        """
+        Verifica se um bloco declara variáveis em seu próprio escopo. O
+        resultado é calculado na primeira execução do bloco.
+        """
+        entry = self.block_scopes.get(id(block))
+        if entry is None or entry[0] is not block:
+            declared = any(
+                isinstance(stmt, ast.Assign) and getattr(stmt.left, "decl", False)
+                for stmt in block
+            )
+            entry = self.block_scopes[id(block)] = (block, declared)
+        return entry[1]
+
     def exec_While(self, node: ast.While):
         """
         Executa um laço de repetição enquanto a condição for verdadeira.
@@ -160,6 +558,7 @@ class Executor():
         condition = self.execute(node.condition)
         self.enter_scope()
         while condition:
+            self.step()
             result = self.exec_block(node.body)
             condition = self.execute(node.condition)
             if result == commands.BREAK:
@@ -168,24 +567,90 @@ class Executor():
                 continue
             else:
                 if result:
+                    self.exit_scope()
                     return result
         self.exit_scope()
 
+    def exec_For(self, node: ast.For):
+        """
+        Executa um laço de contagem sobre um `range` do Python, atribuindo
+        cada valor diretamente à variável do laço no escopo do corpo, sem
+        avaliar uma condição e um incremento a cada iteração. Alterações da
+        variável no corpo não afetam a contagem.
+        """
+        start, stop = self.execute(node.start), self.execute(node.stop)
+        step = self.execute(node.step) if node.step else 1
+        bounds = [
+            int(value) if type(value) is float and value.is_integer() else value
+            for value in (start, stop, step)
+        ]
+        if any(type(value) is not int for value in bounds):
+            raise err.RunTimeError(
+                f"limites do laço for precisam ser inteiros: {start}..{stop} step {step}"
+            )
+        if bounds[2] == 0:
+            raise err.RunTimeError("o incremento do laço for não pode ser 0")
+
+        budget = getattr(self.frames, "budget", None)
+        name, body = node.var, node.body
+        self.enter_scope()
+        table = self.scope.table
+        try:
+            for value in range(*bounds):
+                if budget is not None:
+                    budget.spend()
+                table[name] = value
+                result = self.exec_block(body)
+                if result is commands.BREAK:
+                    break
+                if result is not None and result is not commands.CONTINUE:
+                    return result
+        finally:
+            self.exit_scope()
+
     def exec_Par(self, node: ast.Par):
         """
-        Executa um bloco de instruções em paralelo, utilizando threads.
+        Executa um bloco de instruções em paralelo, utilizando threads ou
+        processos conforme o modo de execução paralela configurado.
+
+        Cada ramo recebe uma cópia das variáveis, exceto em blocos `par shared`,
+        cujos ramos sempre executam em threads deste executor, cada uma com seu
+        próprio quadro de execução a partir do escopo atual. Vetores
+        compartilhados e primitivas de sincronização nunca são copiados e
+        continuam visíveis a todos os ramos.
         """
-        threads = []
+        if self.warn_par and self.par_mode == "thread" and not node.shared:
+            self.warn_par = False
+            warning = par_mode_warning()
+            if warning:
+                print(warning, file=sys.stderr)
+
+        # Os ramos compartilham os limites de execução do bloco
+        budget = getattr(self.frames, "budget", None)
+        workers = []
         for stmt in node.body:
-            thread_executor = Executor(
-                deepcopy(self.var_table), deepcopy(self.function_table)
-            )
-            thread = threading.Thread(target=thread_executor.execute, args=(stmt,))
-            threads.append(thread)
-            thread.start()
+            if node.shared:
+                worker = threading.Thread(
+                    target=self.run_branch, args=(stmt, self.scope, budget)
+                )
+            elif self.par_mode == "process":
+                worker = multiprocessing.Process(
+                    target=self.run_branch, args=(stmt, None, budget)
+                )
+            else:
+                branch_executor = Executor(
+                    deepcopy(self.scope),
+                    deepcopy(self.function_table),
+                    **self.options(),
+                )
+                worker = threading.Thread(
+                    target=branch_executor.run_branch, args=(stmt, None, budget)
+                )
+            workers.append(worker)
+            worker.start()
 
-        for thread in threads:
-            thread.join()
+        for worker in workers:
+            worker.join()
 
     def exec_Seq(self, _: ast.Seq):
         """
@@ -195,44 +660,66 @@ class Executor():
 
     def exec_CChannel(self, node: ast.CChannel):
         """
-        Estabelece uma conexão cliente com um canal de comunicação.
+        Estabelece uma conexão cliente com um canal de comunicação,
+        reutilizando uma conexão ociosa do conjunto compartilhado pelo
+        processo (`channel.POOL`) quando houver.
         """
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client.connect((node.localhost, int(node.port)))
-        print(client.recv(2040).decode())
+        client = channel.POOL.acquire(node.localhost, int(node.port), self.framing)
+        print(client.description)
         self.connection_table[node.name] = client
 
     def exec_SChannel(self, node: ast.SChannel):
         """
-        Estabelece um canal de comunicação do tipo servidor.
+        Estabelece um canal de comunicação do tipo servidor, que aceita
+        conexões continuamente conforme o modo de servidor configurado. O
+        endereço pode indicar o transporte "unix:/caminho" ou "inproc:nome"
+        (ver `channel.listen`), nos quais a porta é ignorada.
+        Cada thread do servidor executa a função do canal em seu próprio
+        quadro de execução. As métricas do servidor são registradas com o
+        nome do canal em `metrics.REGISTRY`. Cada mensagem é tratada com
+        seus próprios limites de execução (`request_max_steps` e
+        `request_timeout`), independentes dos limites do programa.
         """
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.bind((node.localhost, int(node.port)))
-        server.listen(10)
-        conn, _ = server.accept()
+        listener = channel.listen(node.localhost, int(node.port))
         description = self.execute(node.description)
-        if description:
-            conn.send(description.encode("utf-8"))
-
-        function = self.function_table[node.func_name]
-        while True:
-            data = conn.recv(2048).decode()
-            print(f"received: {data}")
-            if not data:
-                conn.close()
-                break
 
-            call = ast.Call(
-                type=function.return_type,
-                token=Token("ID", function.name),
-                args=[ast.Constant(type="STRING", token=Token("STRING", data))],
-                id=None,
-                oper=None,
-            )
+        function = self.bind(self.function_table[node.func_name])
+
+        log_messages = self.log_messages
+        frames = self.frames
+        max_steps, timeout = self.request_max_steps, self.request_timeout
+        limited = max_steps is not None or timeout is not None
 
-            ret = self.exec_Call(call)
+        def handler(data: str) -> str:
+            if log_messages:
+                print(f"received: {data}")
+            # No laço de eventos, a função executa na thread do programa
+            previous = getattr(frames, "budget", None)
+            frames.budget = Budget(max_steps, timeout) if limited else None
+            try:
+                reply = function(data)
+            finally:
+                frames.budget = previous
+            return reply if isinstance(reply, str) else str(reply)
 
-            conn.send(str(ret).encode("utf-8"))
+        server_class = (
+            channel.EventLoopServer
+            if self.server_mode == "events"
+            else channel.ThreadPoolServer
+        )
+        server = server_class(
+            listener,
+            handler,
+            description,
+            workers=self.workers,
+            framing=self.framing,
+            metrics=metrics.REGISTRY.register(node.name),
+            max_inflight=self.max_inflight,
+            max_pending=self.max_pending,
+            overload=self.overload,
+        )
+        self.server_table[node.name] = server
+        server.serve_forever()
 
     ###### FUNÇÕES PERSONALIZADAS ######
     def number(self, value):
@@ -256,60 +743,154 @@ class Executor():
         """
         return str(value).isnumeric()
 
+    def shared_slice(self, array: SharedArray, start, stop):
+        """
+        Retorna uma fatia de um vetor compartilhado, sem copiar seus dados.
+        """
+        return array.slice(start, stop)
+
+    def vec_map(self, array: vector.Array, name: str) -> vector.Array:
+        """
+        Aplica a cada elemento de um vetor ou matriz uma das funções de
+        `vector.FUNCTIONS`, em uma única operação vetorizada, ou uma função
+        do programa que recebe e retorna NUMBER, chamada elemento a elemento.
+        """
+        if name in vector.FUNCTIONS:
+            return array.map(name)
+        function = self.bound(name)
+        if function is None:
+            raise err.RunTimeError(f"função {name} não existe para vec_map")
+        return array.apply(function)
+
+    def connection(self, conn_name: str) -> channel.ClientChannel:
+        """
+        Retorna a conexão de um canal cliente aberto por este executor.
+        Ramos paralelos executados em processos não herdam as conexões
+        quando o processo é criado por spawn ou forkserver.
+        """
+        client = self.connection_table.get(conn_name)
+        if client is None:
+            raise err.RunTimeError(
+                f"canal {conn_name} não está disponível neste ramo de execução"
+            )
+        return client
+
     def send(self, conn_name: str, data: str):
         """
         Envia dados para um canal de comunicação cliente.
         """
-        client = self.connection_table[conn_name]
-        client.send(data.encode("utf-8"))
+        return self.connection(conn_name).request(data)
 
-        return client.recv(2048).decode("utf-8")
+    def send_many(self, conn_name: str, data: str):
+        """
+        Envia em pipeline as mensagens contidas em `data`, uma por linha,
+        retornando as respostas na mesma ordem, uma por linha. Uma resposta
+        que contenha quebras de linha é rejeitada, pois não seria possível
+        separá-la das demais.
+        """
+        replies = self.connection(conn_name).request_many(data.split("\n"))
+        if any("\n" in reply for reply in replies):
+            raise err.RunTimeError("send_many recebeu uma resposta com quebra de linha")
+        return "\n".join(replies)
+
+    def send_async(self, conn_name: str, data: str):
+        """
+        Envia dados para um canal cliente sem aguardar a resposta,
+        retornando o ticket utilizado para obtê-la com `receive`.
+        """
+        return self.connection(conn_name).submit(data)
+
+    def receive(self, conn_name: str, ticket):
+        """
+        Aguarda a resposta de uma mensagem enviada por `send_async`.
+        """
+        return self.connection(conn_name).reply(int(ticket))
 
     def close(self, conn_name: str):
         """
-        Fecha a conexão com um canal de comunicação.
+        Fecha um canal de comunicação, devolvendo sua conexão ao conjunto
+        compartilhado para que seja reutilizada.
         """
-        client = self.connection_table[conn_name]
-        client.close()
+        channel.POOL.release(self.connection(conn_name))
+        del self.connection_table[conn_name]
 
     ###### EXECUÇÃO DE EXPRESSÕES #####
 
     def exec_Constant(self, node: ast.Constant):
         """
-        Avalia uma constante, retornando seu valor.
+        Avalia uma constante, retornando seu valor, convertido a partir do
+        texto do token apenas na primeira execução do nó.
         """
+        cache = self.constant_cache
+        entry = cache.entries.get(id(node))
+        if entry is not None and entry[0] is node:
+            cache.hits += 1
+            return entry[1]
+        cache.misses += 1
         match node.type:
             case "STRING":
-                return node.token.value
+                value = node.token.value
             case "NUMBER":
-                return eval(node.token.value)
+                value = eval(node.token.value)
             case "BOOL":
-                return bool(node.token.value)
+                value = bool(node.token.value)
             case _:
-                return node.token.value
+                value = node.token.value
+        cache.entries[id(node)] = (node, value)
+        return value
 
     def exec_ID(self, node: ast.ID):
         """
         Avalia um identificador, retornando o valor associado na tabela de variáveis.
         """
-        var_name = node.token.value
-        var_scope = self.var_table.find(var_name)
-        if var_scope:
-            return var_scope.table[var_name]
-        else:
-            raise err.RunTimeError(f"variável {var_name} não definida")
+        var_scope = self.lookup(node)
+        if var_scope is None:
+            raise err.RunTimeError(f"variável {node.token.value} não definida")
+        return var_scope.table[node.token.value]
 
     def exec_Access(self, node: ast.Access):
         """
         Avalia o acesso a um membro ou índice de uma variável.
         """
+        container = self.execute(node.id)
         index = self.execute(node.expr)
-        var_name = node.id.token.value
-        var_scope = self.var_table.find(var_name)
-        if var_scope:
-            return var_scope.table[var_name][index]
-        else:
-            raise err.RunTimeError(f"variável {var_name} não definida")
+        if type(container) is dict:
+            try:
+                return container[index]
+            except KeyError:
+                raise err.RunTimeError(
+                    f"chave {index} não existe em {node.token.value}"
+                ) from None
+        return container[self.index(container, index, node)]
+
+    def index(self, container, index, node: ast.Access):
+        """
+        Valida o índice de um acesso, aceitando números reais inteiros como
+        os resultantes de divisões.
+        """
+        if type(index) is float and index.is_integer():
+            index = int(index)
+        if type(index) is not int or not 0 <= index < len(container):
+            raise err.RunTimeError(
+                f"índice {index} fora dos limites de {node.token.value} "
+                f"de tamanho {len(container)}"
+            )
+        return index
+
+    def exec_ListLiteral(self, node: ast.ListLiteral):
+        """
+        Avalia uma lista literal, criando uma nova lista a cada avaliação.
+        """
+        return [self.execute(element) for element in node.elements]
+
+    def exec_MapLiteral(self, node: ast.MapLiteral):
+        """
+        Avalia um mapa literal, criando um novo dicionário a cada avaliação.
+        """
+        return {
+            self.execute(key): self.execute(value)
+            for key, value in zip(node.keys, node.values)
+        }
 
     def exec_Logical(self, node: ast.Logical):
         """
@@ -394,40 +975,81 @@ class Executor():
             case _:
                 return
 
-    def exec_Call(self, node: ast.Call):
+    def bind(self, function: ast.FuncDef):
         """
-        Executa uma chamada de função, avaliando os argumentos e retornando o resultado.
+        Vincula uma função do programa a uma chamada direta, que recebe os
+        valores dos argumentos já avaliados e executa o corpo da função. O
+        plano de vinculação (nomes dos parâmetros e valores padrão) é
+        calculado uma única vez, e os valores padrão são avaliados apenas
+        para os parâmetros não informados na chamada. Utilizada pelas
+        chamadas de função (ver `resolve`), por `vec_map` e pelos canais
+        servidores a cada mensagem recebida.
         """
-        func_name = node.oper if node.oper else node.token.value
-
-        if func_name not in {"close", "send"}:
-            if self.default_functions.get(func_name):
-                args = [self.execute(arg) for arg in node.args]
-                return self.default_functions[func_name](*args)
-        else:
-            conn_name = node.token.value
-            if func_name == "send":
-                args = [self.execute(arg) for arg in node.args]
-                return self.default_functions[func_name](conn_name, *args)
-            else:
-                return self.default_functions[func_name](conn_name)
+        names = list(function.params)
+        defaults = [default for _, default in function.params.values()]
+        body = function.body
 
-        function: ast.FuncDef | None = self.function_table.get(str(func_name))
+        def call(*args):
+            self.step()
+            frame = self.scope
+            table = dict(zip(names, args))
+            self.scope = scope = VarTable(table, frame)
+            try:
+                for name, default in zip(names[len(args):], defaults[len(args):]):
+                    if default:
+                        self.declare(scope, name, self.execute(default))
+                return self.exec_block(body)
+            finally:
+                # Restaura o quadro da thread, mesmo que o corpo encerre antes
+                # de sair de todos os escopos internos
+                self.scope = frame
 
-        if not function:
-            return
+        return call
 
-        self.enter_scope()
+    def bound(self, name: str):
+        """
+        Retorna a chamada direta (ver `bind`) da função do programa com o
+        nome informado, vinculada uma única vez por executor, ou None se a
+        função ainda não foi declarada.
+        """
+        call = self.bound_functions.get(name)
+        if call is None:
+            function = self.function_table.get(name)
+            if function is None:
+                return None
+            call = self.bound_functions[name] = self.bind(function)
+        return call
 
-        for param in function.params.items():
-            name, (_, default) = param
-            if default:
-                self.var_table.table[name] = self.execute(default)
-        for param, arg in zip(function.params.items(), node.args):
-            name, _ = param
-            value = self.execute(arg)
-            self.var_table.table[name] = value
+    def resolve(self, node: ast.Call):
+        """
+        Resolve o destino de uma chamada: um método de canal, uma função
+        padrão ou uma função do programa. Retorna None se a função ainda não
+        foi declarada.
+        """
+        if node.oper:
+            method = self.channel_methods[node.oper]
+            conn_name = node.token.value
+            return lambda *args: method(conn_name, *args)
+        function = self.default_functions.get(node.token.value)
+        if function is not None:
+            return function
+        return self.bound(node.token.value)
 
-        ret = self.exec_block(function.body)
-        self.exit_scope()
-        return ret
+    def exec_Call(self, node: ast.Call):
+        """
+        Executa uma chamada de função, avaliando os argumentos e retornando o
+        resultado. O destino de cada chamada é resolvido na primeira execução
+        e mantido em `call_cache`; como uma função declarada nunca é
+        substituída, a entrada não precisa ser invalidada.
+        """
+        cache = self.call_cache
+        entry = cache.entries.get(id(node))
+        if entry is not None and entry[0] is node:
+            cache.hits += 1
+        else:
+            cache.misses += 1
+            target = self.resolve(node)
+            if target is None:
+                return
+            entry = cache.entries[id(node)] = (node, target)
+        return entry[1](*[self.execute(arg) for arg in node.args])
@@ -40,6 +40,15 @@ class Lexer():
             "bool": "TYPE",
             "string": "TYPE",
             "void": "TYPE",
+            "shared": "TYPE",
+            "mutex": "TYPE",
+            "atomic": "TYPE",
+            "barrier": "TYPE",
+            "list": "TYPE",
+            "vector": "TYPE",
+            "matrix": "TYPE",
+            "map": "TYPE",
+            "strbuf": "TYPE",
             "true": "TRUE",
             "false": "FALSE",
         })
@@ -48,6 +57,7 @@ class Lexer():
         self.token_table.update({
             "func": "FUNC",
             "while": "WHILE",
+            "for": "FOR",
             "if": "IF",
             "else": "ELSE",
             "return": "RETURN",
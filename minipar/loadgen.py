@@ -0,0 +1,320 @@
+"""
+Gerador de Carga dos Canais Servidores
+
+Este módulo envia requisições a um canal servidor (s_channel) em execução
+na máquina local e informa, em JSON, a vazão e os percentis de latência
+obtidos. São suportados dois modos:
+1. Malha fechada (closed): cada conexão envia uma nova requisição assim
+   que recebe a resposta da anterior.
+2. Malha aberta (open): as requisições são enviadas a uma taxa fixa,
+   independentemente das respostas, e a latência é medida a partir do
+   instante em que cada requisição deveria ter sido enviada, de modo que
+   atrasos do servidor não reduzem a carga aplicada.
+
+As mensagens são geradas a partir de modelos em que "{n}" é substituído
+pelo número sequencial da requisição. As requisições enviadas durante o
+aquecimento (warmup) não são contabilizadas.
+
+Uso:
+    python -m minipar.loadgen localhost 8585 --connections 16 --duration 10
+    python -m minipar.loadgen localhost 8585 --mode open --rate 2000
+    python -m minipar.loadgen localhost 8585 --program examples/server_calc.minipar
+"""
+
+import argparse
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+from minipar import channel
+from minipar.metrics import Histogram
+
+# Modelo de mensagem padrão: uma expressão para a calculadora dos exemplos
+DEFAULT_PAYLOAD = "{n} + 1"
+
+# Tempo (s) de espera pelas respostas pendentes ao final do modo aberto
+DRAIN_TIMEOUT = 5.0
+
+# Tempo (s) de espera pelo início do servidor iniciado com --program
+STARTUP_TIMEOUT = 10.0
+
+
+class LoadGenerator:
+    """
+    Gera carga sobre um canal servidor a partir de várias conexões, cada
+    uma atendida por threads próprias.
+
+    Attributes:
+        host (str): Endereço do servidor (aceita "unix:" e "inproc:").
+        port (int): Porta do servidor.
+        payloads (list[str]): Modelos das mensagens, usados em rodízio.
+        connections (int): Quantidade de conexões simultâneas.
+        duration (float): Duração (s) da medição, após o aquecimento.
+        warmup (float): Duração (s) do aquecimento.
+        rate (Optional[float]): Requisições por segundo no modo aberto; None
+            utiliza o modo fechado.
+        framing (str): Modo de delimitação das mensagens.
+        latency (Histogram): Latências (µs) das requisições medidas.
+        errors (int): Requisições sem resposta por falha de conexão.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        payloads: Optional[list[str]] = None,
+        connections: int = 1,
+        duration: float = 10.0,
+        warmup: float = 1.0,
+        rate: Optional[float] = None,
+        framing: str = "length",
+    ):
+        self.host = host
+        self.port = port
+        self.payloads = payloads or [DEFAULT_PAYLOAD]
+        self.connections = connections
+        self.duration = duration
+        self.warmup = warmup
+        self.rate = rate
+        self.framing = framing
+        self.latency = Histogram()
+        self.errors = 0
+        self.lock = threading.Lock()
+        self.start = self.measure_from = self.stop_at = 0
+
+    def payload(self, n: int) -> str:
+        """
+        Gera a mensagem da n-ésima requisição.
+        """
+        template = self.payloads[n % len(self.payloads)]
+        return template.replace("{n}", str(n))
+
+    def run(self) -> dict:
+        """
+        Executa a carga em todas as conexões, retornando o relatório.
+        """
+        clients = [
+            channel.ClientChannel.connect(self.host, self.port, self.framing)[0]
+            for _ in range(self.connections)
+        ]
+        target = self.closed_loop if self.rate is None else self.open_loop
+        self.start = time.perf_counter_ns()
+        self.measure_from = self.start + int(self.warmup * 1e9)
+        self.stop_at = self.measure_from + int(self.duration * 1e9)
+        threads = [
+            threading.Thread(target=target, args=(index, client), daemon=True)
+            for index, client in enumerate(clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for client in clients:
+            client.close()
+        return self.report()
+
+    def record(self, sent: int, finished: int):
+        """
+        Registra a latência de uma requisição enviada após o aquecimento.
+        """
+        if self.measure_from <= sent < self.stop_at:
+            self.latency.record([(finished - sent) // 1000])
+
+    def fail(self, count: int = 1):
+        """
+        Contabiliza requisições que não obtiveram resposta.
+        """
+        with self.lock:
+            self.errors += count
+
+    def closed_loop(self, index: int, client: channel.ClientChannel):
+        """
+        Envia requisições por uma conexão, uma de cada vez, até o fim da medição.
+        """
+        n = index
+        while (sent := time.perf_counter_ns()) < self.stop_at:
+            try:
+                client.request(self.payload(n))
+            except OSError:
+                if sent >= self.measure_from:
+                    self.fail()
+                return
+            self.record(sent, time.perf_counter_ns())
+            n += self.connections
+
+    def open_loop(self, index: int, client: channel.ClientChannel):
+        """
+        Envia requisições por uma conexão nos instantes definidos pela taxa,
+        enquanto outra thread lê as respostas na ordem de envio.
+        """
+        scheduled: queue.SimpleQueue = queue.SimpleQueue()
+        receiver = threading.Thread(
+            target=self.receive_loop, args=(client, scheduled), daemon=True
+        )
+        receiver.start()
+        interval = 1e9 / self.rate
+        n = index
+        while (intended := self.start + int(n * interval)) < self.stop_at:
+            delay = intended - time.perf_counter_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            try:
+                client.write(self.payload(n))
+            except OSError:
+                break
+            scheduled.put(intended)
+            n += self.connections
+        client.sock.settimeout(DRAIN_TIMEOUT)
+        scheduled.put(None)
+        receiver.join()
+
+    def receive_loop(self, client: channel.ClientChannel, scheduled: queue.SimpleQueue):
+        """
+        Lê as respostas de uma conexão no modo aberto, medindo cada uma a
+        partir do instante em que a requisição deveria ter sido enviada.
+        """
+        while (intended := scheduled.get()) is not None:
+            try:
+                client.receive()
+            except OSError:
+                failed = intended >= self.measure_from
+                while (intended := scheduled.get()) is not None:
+                    failed += intended >= self.measure_from
+                self.fail(failed)
+                return
+            self.record(intended, time.perf_counter_ns())
+
+    def report(self) -> dict:
+        """
+        Retorna a vazão e os percentis de latência (ms) das requisições medidas.
+        """
+        latency = self.latency.snapshot()
+        count = latency["count"]
+        percentiles = {
+            f"p{percent:g}": value / 1000
+            for percent, value in latency["quantiles"].items()
+        }
+        return {
+            "mode": "closed" if self.rate is None else "open",
+            "connections": self.connections,
+            "rate": self.rate,
+            "duration": self.duration,
+            "warmup": self.warmup,
+            "requests": count,
+            "errors": self.errors,
+            "throughput": count / self.duration,
+            "latency_ms": {
+                "mean": latency["sum"] / count / 1000 if count else 0.0,
+                **percentiles,
+                "max": latency["max"] / 1000,
+            },
+        }
+
+
+def start_program(path: str, host: str, port: int) -> subprocess.Popen:
+    """
+    Executa um programa MiniPar em um processo separado, sem exibir as
+    mensagens recebidas, e aguarda até que o servidor aceite conexões.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "minipar", "-quiet", path],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while True:
+        try:
+            channel.open_connection(host, port).close()
+            return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise
+            time.sleep(0.05)
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="minipar.loadgen",
+        description="Gerador de carga dos canais servidores do MiniPar"
+    )
+    parser.add_argument("host", help="Endereço do canal servidor")
+    parser.add_argument("port", type=int, help="Porta do canal servidor")
+    parser.add_argument(
+        "--mode",
+        choices=["closed", "open"],
+        default="closed",
+        help=(
+            "closed: cada conexão aguarda a resposta antes de enviar a próxima; "
+            "open: envia requisições à taxa de --rate"
+        )
+    )
+    parser.add_argument(
+        "--connections", type=int, default=1, help="Conexões simultâneas"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1000.0,
+        help="Requisições por segundo no modo open, somando todas as conexões"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Duração (s) da medição"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=1.0,
+        help="Duração (s) do aquecimento, não contabilizado"
+    )
+    parser.add_argument(
+        "--payload",
+        action="append",
+        help=(
+            "Modelo de mensagem, em que {n} é substituído pelo número da "
+            f"requisição (pode ser repetido; padrão: {DEFAULT_PAYLOAD!r})"
+        )
+    )
+    parser.add_argument(
+        "--framing", choices=channel.FRAMINGS, default="length",
+        help="Delimitação das mensagens, igual à do servidor"
+    )
+    parser.add_argument(
+        "--program",
+        help="Programa MiniPar com o canal servidor, executado durante a medição"
+    )
+    args = parser.parse_args(argv)
+    if args.connections < 1:
+        parser.error("--connections deve ser maior ou igual a 1")
+    if args.mode == "open" and args.rate <= 0:
+        parser.error("--rate deve ser maior que 0")
+
+    process = None
+    try:
+        if args.program:
+            process = start_program(args.program, args.host, args.port)
+        generator = LoadGenerator(
+            args.host,
+            args.port,
+            args.payload,
+            connections=args.connections,
+            duration=args.duration,
+            warmup=args.warmup,
+            rate=args.rate if args.mode == "open" else None,
+            framing=args.framing,
+        )
+        result = generator.run()
+    except OSError as error:
+        sys.exit(f"minipar.loadgen: {error}")
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
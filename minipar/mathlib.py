@@ -0,0 +1,56 @@
+"""
+Módulo de Funções Matemáticas
+
+Este módulo define as funções matemáticas padrão da linguagem, que
+correspondem diretamente às funções do módulo `math` do Python. Valores
+fora do domínio de uma função (como log de um número negativo) encerram a
+execução com `RunTimeError`.
+"""
+
+import math
+
+from minipar import error as err
+
+
+def power(base, exponent):
+    """
+    Potência, inteira quando a base e o expoente são inteiros e o expoente
+    não é negativo.
+    """
+    if type(base) is int and type(exponent) is int and exponent >= 0:
+        return base**exponent
+    return math.pow(base, exponent)
+
+
+def _checked(name: str, function):
+    """
+    Envolve uma função matemática, convertendo erros de domínio e de
+    estouro em `RunTimeError`.
+    """
+
+    def call(*args):
+        try:
+            return function(*args)
+        except (ValueError, OverflowError):
+            values = ", ".join(map(str, args))
+            raise err.RunTimeError(f"{name}({values}) fora do domínio") from None
+
+    return call
+
+
+# Funções matemáticas padrão, indexadas pelo nome utilizado nos programas
+FUNCTIONS = {
+    name: _checked(name, function)
+    for name, function in {
+        "exp": math.exp,
+        "log": math.log,
+        "sqrt": math.sqrt,
+        "pow": power,
+        "tanh": math.tanh,
+        "sin": math.sin,
+        "cos": math.cos,
+        "floor": math.floor,
+        "ceil": math.ceil,
+        "abs": abs,
+    }.items()
+}
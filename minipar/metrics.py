@@ -0,0 +1,309 @@
+"""
+Módulo de Métricas dos Canais Servidores
+
+Este módulo mantém as métricas de cada canal servidor (s_channel):
+histogramas de latência no estilo HDR (buckets log-lineares de precisão
+relativa fixa), contadores de mensagens e bytes e medidores de conexões
+ativas e de mensagens na fila. As métricas podem ser consultadas pela
+função `channel_stats` dos programas ou por um endpoint de texto simples
+(`serve`), compatível com o formato de exposição do Prometheus.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Bits de precisão dos buckets: valores até 2**PRECISION são exatos e os
+# demais são agrupados com erro relativo máximo de 2**-(PRECISION - 1)
+PRECISION = 5
+SUB_BUCKETS = 1 << (PRECISION - 1)
+
+# Quantidade de buckets necessária para valores de até 64 bits
+BUCKETS = (64 - PRECISION + 2) * SUB_BUCKETS
+
+# Percentis exibidos para cada histograma
+QUANTILES = (50.0, 90.0, 99.0, 99.9)
+
+# Contadores, medidores e histogramas (µs) mantidos para cada canal servidor
+COUNTERS = ("requests", "bytes_in", "bytes_out", "connections", "busy")
+GAUGES = ("active_connections", "queue_depth", "inflight", "paused")
+HISTOGRAMS = ("latency", "queue_wait", "handler")
+
+
+class Histogram:
+    """
+    Histograma de valores inteiros não negativos (microssegundos) com
+    buckets log-lineares: cada potência de dois é dividida em
+    `SUB_BUCKETS` intervalos de mesma largura, de modo que o registro de um
+    valor custa apenas operações com inteiros e a memória é fixa.
+
+    Attributes:
+        counts (list[int]): Quantidade de valores registrados em cada bucket.
+        count (int): Quantidade total de valores registrados.
+        total (int): Soma dos valores registrados.
+        max (int): Maior valor registrado.
+        lock (threading.Lock): Protege os registros feitos por várias threads.
+    """
+
+    def __init__(self, lock: Optional[threading.Lock] = None):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.lock = lock or threading.Lock()
+
+    @staticmethod
+    def index(value: int) -> int:
+        """
+        Retorna o bucket de um valor.
+        """
+        shift = max(value.bit_length() - PRECISION, 0)
+        return shift * SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def highest(index: int) -> int:
+        """
+        Retorna o maior valor agrupado em um bucket.
+        """
+        if index < 2 * SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return ((index - shift * SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, values: list[int]):
+        """
+        Registra um lote de valores no histograma.
+        """
+        with self.lock:
+            self.add(values)
+
+    def add(self, values: list[int]):
+        """
+        Registra um lote de valores. Deve ser chamado com a trava do
+        histograma adquirida.
+        """
+        if not values:
+            return
+        counts = self.counts
+        for value in values:
+            shift = value.bit_length() - PRECISION
+            if shift > 0:
+                counts[shift * SUB_BUCKETS + (value >> shift)] += 1
+            else:
+                counts[value] += 1
+        self.count += len(values)
+        self.total += sum(values)
+        self.max = max(self.max, max(values))
+
+    def percentile(self, percent: float) -> int:
+        """
+        Retorna o valor abaixo do qual está a porcentagem informada dos
+        valores registrados, com a precisão dos buckets.
+        """
+        with self.lock:
+            if not self.count:
+                return 0
+            target = max(1, -(-self.count * percent // 100))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return min(self.highest(index), self.max)
+            return self.max
+
+    def snapshot(self) -> dict:
+        """
+        Retorna a quantidade, a soma, o máximo e os percentis registrados.
+        """
+        quantiles = {percent: self.percentile(percent) for percent in QUANTILES}
+        with self.lock:
+            return {
+                "count": self.count,
+                "sum": self.total,
+                "max": self.max,
+                "quantiles": quantiles,
+            }
+
+
+class ServerMetrics:
+    """
+    Métricas de um canal servidor.
+
+    Attributes:
+        counters (dict[str, int]): Bytes recebidos e enviados, conexões
+            aceitas e mensagens recusadas com a resposta de servidor ocupado
+            (busy). A quantidade de mensagens respondidas (requests) é a
+            quantidade de latências registradas.
+        gauges (dict[str, int]): Conexões ativas, mensagens recebidas que
+            aguardam a função tratadora (queue_depth), mensagens admitidas
+            ainda não respondidas (inflight) e conexões que deixaram de ser
+            lidas por sobrecarga (paused).
+        histograms (dict[str, Histogram]): Tempos (µs) entre a leitura de uma
+            mensagem e a produção de sua resposta (latency), entre a leitura
+            e o início da função tratadora (queue_wait) e da própria função
+            tratadora (handler).
+        lock (threading.Lock): Protege os contadores, os medidores e os
+            histogramas, que compartilham a mesma trava.
+    """
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS[1:], 0)
+        self.gauges = dict.fromkeys(GAUGES, 0)
+        self.lock = threading.Lock()
+        self.histograms = {name: Histogram(self.lock) for name in HISTOGRAMS}
+
+    def add(self, name: str, amount: int = 1):
+        """
+        Incrementa um contador ou medidor.
+        """
+        with self.lock:
+            if name in self.gauges:
+                self.gauges[name] += amount
+            else:
+                self.counters[name] += amount
+
+    def connected(self):
+        """
+        Registra uma conexão aceita.
+        """
+        with self.lock:
+            self.counters["connections"] += 1
+            self.gauges["active_connections"] += 1
+
+    def disconnected(self):
+        """
+        Registra o encerramento de uma conexão.
+        """
+        self.add("active_connections", -1)
+
+    def received(self, size: int, messages: int):
+        """
+        Registra os bytes lidos de uma conexão e as mensagens completas que
+        passam a aguardar a função tratadora.
+        """
+        with self.lock:
+            self.counters["bytes_in"] += size
+            self.gauges["queue_depth"] += messages
+
+    def completed(
+        self,
+        latencies: list[int],
+        waits: list[int],
+        handling: list[int],
+        size: int = 0,
+    ):
+        """
+        Registra os tempos (µs) de um lote de mensagens respondidas pela
+        função tratadora e os bytes das respostas.
+        """
+        histograms = self.histograms
+        with self.lock:
+            self.counters["bytes_out"] += size
+            histograms["latency"].add(latencies)
+            histograms["queue_wait"].add(waits)
+            histograms["handler"].add(handling)
+
+    def snapshot(self) -> dict:
+        """
+        Retorna uma cópia dos contadores, medidores e histogramas.
+        """
+        with self.lock:
+            values = {**self.counters, **self.gauges}
+        histograms = {
+            f"{name}_us": histogram.snapshot()
+            for name, histogram in self.histograms.items()
+        }
+        requests = histograms["latency_us"]["count"]
+        return {"requests": requests, **values, **histograms}
+
+
+class Registry:
+    """
+    Métricas dos canais servidores do processo, indexadas pelo nome do canal.
+
+    Attributes:
+        servers (dict[str, ServerMetrics]): Métricas de cada canal servidor.
+        lock (threading.Lock): Protege o registro dos canais.
+    """
+
+    def __init__(self):
+        self.servers: dict[str, ServerMetrics] = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str) -> ServerMetrics:
+        """
+        Cria as métricas de um canal servidor, substituindo as de um canal
+        anterior com o mesmo nome.
+        """
+        metrics = ServerMetrics()
+        with self.lock:
+            self.servers[name] = metrics
+        return metrics
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Retorna as métricas de todos os canais servidores.
+        """
+        with self.lock:
+            servers = dict(self.servers)
+        return {name: metrics.snapshot() for name, metrics in servers.items()}
+
+    def render(self, pool: Optional[dict[str, int]] = None) -> str:
+        """
+        Formata as métricas em texto simples, uma amostra por linha, no
+        formato de exposição do Prometheus. Os contadores do conjunto de
+        conexões cliente são incluídos quando informados.
+        """
+        lines = []
+        for name, values in sorted(self.snapshot().items()):
+            label = f'server="{name}"'
+            for key in (*COUNTERS, *GAUGES):
+                suffix = "_total" if key in COUNTERS else ""
+                lines.append(f"minipar_channel_{key}{suffix}{{{label}}} {values[key]}")
+            for name in HISTOGRAMS:
+                metric = f"minipar_channel_{name}_us"
+                histogram = values[f"{name}_us"]
+                for percent, value in histogram["quantiles"].items():
+                    quantile = f'quantile="{percent / 100:g}"'
+                    lines.append(f"{metric}{{{label},{quantile}}} {value}")
+                for key in ("max", "sum", "count"):
+                    lines.append(f"{metric}_{key}{{{label}}} {histogram[key]}")
+        for key, value in (pool or {}).items():
+            lines.append(f"minipar_client_pool_{key} {value}")
+        return "".join(f"{line}\n" for line in lines)
+
+
+# Métricas dos canais servidores do processo
+REGISTRY = Registry()
+
+
+def serve(port: int, render=None) -> ThreadingHTTPServer:
+    """
+    Inicia, em uma thread própria, um servidor HTTP local que responde a
+    qualquer requisição GET com as métricas em texto simples.
+
+    Args:
+        port (int): Porta local do endpoint (0 escolhe uma porta livre).
+        render (Callable[[], str]): Função que produz o texto das métricas,
+            por padrão `REGISTRY.render`.
+    """
+    render = render or REGISTRY.render
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="minipar-metrics", daemon=True
+    ).start()
+    return server
@@ -0,0 +1,800 @@
+"""
+Módulo do Otimizador
+
+Este módulo define passagens de otimização aplicadas à AST já verificada
+pelo analisador semântico, antes da execução. As passagens transformam a
+AST no próprio lugar, preservando o comportamento do programa, e
+registram em um relatório o que foi transformado.
+
+A expansão de funções (`Inliner`) substitui chamadas de funções pequenas e
+não recursivas pelo corpo da função, eliminando a criação do escopo, a
+vinculação dos argumentos e a propagação do retorno de cada chamada. A
+eliminação de redundâncias (`RedundancyEliminator`) avalia uma única vez as
+expressões puras invariantes de laços e as repetidas em instruções
+consecutivas.
+"""
+
+from copy import deepcopy
+from dataclasses import fields
+from itertools import count
+
+from minipar import ast
+from minipar.token import Token
+
+# Tamanho máximo (em nós da AST) do corpo de uma função expandida
+INLINE_MAX_SIZE = 40
+
+# Valores iniciais das variáveis de resultado, por tipo de retorno
+RESULT_DEFAULTS = {"NUMBER": "0", "STRING": ""}
+
+# Tamanho mínimo (em nós da AST) de uma expressão movida ou reutilizada
+MIN_EXPRESSION_SIZE = 3
+
+# Funções padrão sem efeitos e que não falham com argumentos escalares, com
+# o tipo do resultado
+PURE_FUNCTIONS = {"abs": "NUMBER", "to_string": "STRING"}
+
+SCALAR_TYPES = ("NUMBER", "STRING", "BOOL")
+
+
+def children(node: ast.Node):
+    """
+    Percorre os nós filhos diretos de um nó: campos que são nós, listas de
+    nós e os valores padrão dos parâmetros de funções.
+    """
+    for item in fields(node):
+        value = getattr(node, item.name)
+        if isinstance(value, ast.Node):
+            yield value
+        elif isinstance(value, list):
+            yield from (child for child in value if isinstance(child, ast.Node))
+        elif isinstance(value, dict):
+            for _, default in value.values():
+                if isinstance(default, ast.Node):
+                    yield default
+
+
+def walk(node: ast.Node):
+    """
+    Percorre um nó e todos os seus descendentes, em pré-ordem.
+    """
+    yield node
+    for child in children(node):
+        yield from walk(child)
+
+
+def walk_block(block: ast.Body):
+    """
+    Percorre todos os nós de um bloco de instruções, em pré-ordem.
+    """
+    for stmt in block:
+        yield from walk(stmt)
+
+
+def blocks(node: ast.Node) -> list[ast.Body]:
+    """
+    Retorna os blocos de instruções contidos diretamente em um nó.
+    """
+    match node:
+        case ast.If():
+            return [node.body] + ([node.else_stmt] if node.else_stmt else [])
+        case ast.While() | ast.For() | ast.FuncDef() | ast.Par():
+            return [node.body]
+    return []
+
+
+def returns(node: ast.Node) -> bool:
+    """
+    Verifica se um nó contém uma instrução de retorno.
+    """
+    return any(isinstance(item, ast.Return) for item in walk(node))
+
+
+def is_call(node: ast.Node) -> bool:
+    """
+    Verifica se um nó é uma chamada de função (e não um método de canal).
+    """
+    return isinstance(node, ast.Call) and not node.oper
+
+
+def variables(node: ast.Node):
+    """
+    Percorre os identificadores de variáveis de um nó, ignorando os nomes
+    das funções e dos canais das chamadas.
+    """
+    callees = {id(item.id) for item in walk(node) if isinstance(item, ast.Call)}
+    for item in walk(node):
+        if isinstance(item, ast.ID) and id(item) not in callees:
+            yield item
+
+
+def function_calls(definitions: list[ast.FuncDef]) -> dict[str, set[str]]:
+    """
+    Retorna os nomes das funções chamadas no corpo de cada função,
+    incluindo as funções passadas pelo nome, como em vec_map(v, "f").
+    """
+    names = {node.name for node in definitions}
+    calls = {}
+    for node in definitions:
+        calls[node.name] = {
+            item.token.value
+            for item in walk_block(node.body)
+            if is_call(item)
+            or isinstance(item, ast.Constant) and item.token.value in names
+        }
+    return calls
+
+
+def reachable(calls: dict[str, set[str]], names) -> set[str]:
+    """
+    Retorna as funções do programa chamadas, direta ou indiretamente, a
+    partir das funções informadas (incluídas no resultado).
+    """
+    result = set()
+    pending = list(names)
+    while pending:
+        callee = pending.pop()
+        if callee in calls and callee not in result:
+            result.add(callee)
+            pending.extend(calls[callee])
+    return result
+
+
+def declaration(name: str, type_: str, value: ast.Expression) -> ast.Assign:
+    """
+    Cria a declaração de uma variável inicializada com uma expressão.
+    """
+    return ast.Assign(ast.ID(type_, Token("ID", name), decl=True), value)
+
+
+class Inliner:
+    """
+    Expande chamadas de funções pequenas e não recursivas.
+
+    São expandidas as chamadas usadas como instrução ou como lado direito
+    inteiro de uma atribuição ou declaração, localizadas depois da
+    declaração da função no programa (antes dela, a função ainda não
+    existe durante a execução). A expansão declara os parâmetros como
+    variáveis com novos nomes, inicializadas com os argumentos na ordem da
+    chamada, seguidas do corpo com as variáveis locais renomeadas. Os nomes
+    novos contêm "@", que não pode ocorrer em identificadores do programa.
+    Como as variáveis livres de uma função são buscadas a partir do escopo
+    de quem a chama, o corpo expandido as encontra nas mesmas tabelas.
+
+    Retornos são permitidos ao final do corpo e em comandos if: as
+    instruções seguintes a um if com retorno são copiadas para os seus
+    ramos, e cada retorno passa a ser a atribuição do resultado.
+
+    Attributes:
+        max_size (int): Tamanho máximo do corpo de uma função expandida.
+        report (list[str]): Relatório das funções expandidas ou mantidas.
+    """
+
+    def __init__(self, max_size: int = INLINE_MAX_SIZE):
+        self.max_size = max_size
+        self.report: list[str] = []
+        # Funções que podem ser expandidas, já declaradas no programa
+        self.functions: dict[str, ast.FuncDef] = {}
+        self.expanded: dict[str, int] = {}
+        self.counter = count(1)
+        # Funções chamadas por cada função e variáveis que cada uma lê sem
+        # declarar como parâmetro
+        self.calls: dict[str, set[str]] = {}
+        self.reads: dict[str, set[str]] = {}
+
+    def visit(self, module: ast.Module) -> list[str]:
+        """
+        Expande as chamadas do programa, retornando o relatório.
+        """
+        stmts = module.stmts or []
+        definitions = [item for item in walk_block(stmts) if isinstance(item, ast.FuncDef)]
+        names = [item.name for item in definitions]
+        self.calls = function_calls(definitions)
+        for node in definitions:
+            self.reads[node.name] = {
+                item.token.value for stmt in node.body for item in variables(stmt)
+            } - set(node.params)
+
+        result = []
+        for stmt in stmts:
+            result.extend(self.stmt(stmt))
+            if isinstance(stmt, ast.FuncDef):
+                reason = self.rejection(stmt, names)
+                if reason:
+                    self.report.append(f"{stmt.name}: mantida ({reason})")
+                else:
+                    self.functions[stmt.name] = stmt
+        stmts[:] = result
+
+        for name in self.functions:
+            self.report.append(
+                f"{name}: {self.expanded.get(name, 0)} chamada(s) expandida(s)"
+            )
+        return self.report
+
+    def rejection(self, node: ast.FuncDef, names: list[str]) -> str | None:
+        """
+        Retorna o motivo pelo qual a função não pode ser expandida, ou None.
+        As variáveis locais precisam ser declaradas uma única vez, no nível
+        superior do corpo, para que possam ser renomeadas em todo o corpo.
+        """
+        if names.count(node.name) > 1:
+            return "declarada mais de uma vez"
+        callees = reachable(self.calls, self.calls[node.name])
+        if node.name in callees:
+            return "recursiva"
+        size = sum(1 for _ in walk_block(node.body))
+        if size > self.max_size:
+            return f"{size} nós, acima do limite de {self.max_size}"
+
+        declared = {}
+        for index, stmt in enumerate(node.body):
+            if isinstance(stmt, ast.Assign) and getattr(stmt.left, "decl", False):
+                name = stmt.left.token.value
+                if name in node.params or name in declared:
+                    return f"variável {name} declarada mais de uma vez"
+                declared[name] = index
+        local_names = set(node.params) | set(declared)
+        # As funções chamadas encontram as variáveis locais da função em seu
+        # escopo, que deixa de existir na expansão
+        for callee in sorted(callees):
+            hidden = self.reads[callee] & local_names
+            if hidden:
+                return f"variável {min(hidden)} visível em {callee}"
+
+        for index, stmt in enumerate(node.body):
+            for item in walk(stmt):
+                if isinstance(item, (ast.FuncDef, ast.Par, ast.Channel)):
+                    return "corpo com função, bloco par ou canal"
+                if isinstance(item, (ast.While, ast.For)) and returns(item):
+                    return "retorno dentro de laço"
+                if isinstance(item, ast.For) and item.var in local_names:
+                    return f"laço for sobre a variável local {item.var}"
+            for item in variables(stmt):
+                name = item.token.value
+                if item.decl and item is not getattr(stmt, "left", None):
+                    return f"variável {name} declarada em bloco interno"
+                if not item.decl and declared.get(name, -1) >= index:
+                    return f"variável {name} utilizada antes da declaração"
+        return None
+
+    def stmt(self, stmt: ast.Node) -> ast.Body:
+        """
+        Expande as chamadas de uma instrução e de seus blocos internos,
+        retornando as instruções que a substituem.
+        """
+        for block in blocks(stmt):
+            if isinstance(stmt, ast.Par):
+                # Cada instrução de um bloco par é um ramo, que não pode ser
+                # substituído por várias instruções
+                for branch in block:
+                    for inner in blocks(branch):
+                        self.block(inner)
+            else:
+                self.block(block)
+        expansion = self.expand(stmt)
+        return [stmt] if expansion is None else expansion
+
+    def block(self, stmts: ast.Body):
+        """
+        Expande as chamadas de um bloco de instruções, no próprio lugar.
+        """
+        stmts[:] = [item for stmt in stmts for item in self.stmt(stmt)]
+
+    def expand(self, stmt: ast.Node) -> ast.Body | None:
+        """
+        Retorna as instruções que substituem uma chamada expandida, ou None
+        se a instrução não contém uma chamada que possa ser expandida.
+        """
+        call = stmt.right if isinstance(stmt, ast.Assign) else stmt
+        if not is_call(call) or call.token.value not in self.functions:
+            return None
+        function = self.functions[call.token.value]
+        params = list(function.params.items())
+        if len(call.args) > len(params):
+            return None
+
+        suffix = f"@{function.name}{next(self.counter)}"
+        local_names = list(function.params) + [
+            stmt.left.token.value
+            for stmt in function.body
+            if isinstance(stmt, ast.Assign) and getattr(stmt.left, "decl", False)
+        ]
+        renames = {name: name + suffix for name in local_names}
+
+        # Uma variável passada como argumento pode substituir o parâmetro
+        # quando o corpo não pode alterá-la antes de lê-lo: o corpo não
+        # atribui ao parâmetro nem à variável e não chama outras funções
+        # do programa
+        fixed = not any(callee in self.calls for callee in self.calls[function.name])
+        assigned = {
+            item.left.token.value
+            for item in walk_block(function.body)
+            if isinstance(item, ast.Assign) and isinstance(item.left, ast.ID)
+        } | {item.var for item in walk_block(function.body) if isinstance(item, ast.For)}
+
+        # Parâmetros: argumentos na ordem da chamada, seguidos dos valores
+        # padrão dos parâmetros omitidos
+        prologue = []
+        for index, (name, (type_, default)) in enumerate(params):
+            if index < len(call.args):
+                value = call.args[index]
+                if (
+                    fixed
+                    and isinstance(value, ast.ID)
+                    and not {name, value.token.value} & assigned
+                ):
+                    renames[name] = value.token.value
+                    continue
+            elif default:
+                value = deepcopy(default)
+                self.rename(value, renames)
+            else:
+                return None
+            prologue.append(declaration(renames[name], type_, value))
+
+        body = deepcopy(function.body)
+        for item in body:
+            self.rename(item, renames)
+
+        tail_only = bool(body) and isinstance(body[-1], ast.Return) and not any(
+            returns(item) for item in body[:-1]
+        )
+        result_name = "resultado" + suffix
+        epilogue = []
+        if not isinstance(stmt, ast.Assign):
+            def result(expr: ast.Expression) -> ast.Body:
+                # O valor é descartado, mas a expressão ainda é avaliada
+                if isinstance(expr, (ast.Constant, ast.ID)):
+                    return []
+                if is_call(expr):
+                    return [expr]
+                return [declaration(result_name, function.return_type, expr)]
+        elif getattr(stmt.left, "decl", False) and not tail_only:
+            # A variável declarada só existe depois da chamada: o resultado
+            # é guardado em uma variável própria, declarada antes do corpo
+            default = RESULT_DEFAULTS.get(function.return_type)
+            if default is None:
+                return None
+            constant = ast.Constant(function.return_type, Token(function.return_type, default))
+            prologue.append(declaration(result_name, function.return_type, constant))
+            epilogue.append(ast.Assign(stmt.left, ast.ID(function.return_type, Token("ID", result_name))))
+
+            def result(expr: ast.Expression) -> ast.Body:
+                return [ast.Assign(ast.ID(function.return_type, Token("ID", result_name)), expr)]
+        else:
+            def result(expr: ast.Expression) -> ast.Body:
+                return [ast.Assign(deepcopy(stmt.left), expr)]
+
+        lowered = self.lower(body, result)
+        if lowered is None:
+            return None
+        body, always = lowered
+        # Uma atribuição precisa de um valor retornado em todos os caminhos
+        if isinstance(stmt, ast.Assign) and not always:
+            return None
+        expansion = prologue + body + epilogue
+        if sum(1 for _ in walk_block(expansion)) > 2 * self.max_size + len(call.args):
+            return None
+        self.expanded[function.name] = self.expanded.get(function.name, 0) + 1
+        return expansion
+
+    def rename(self, node: ast.Node, renames: dict[str, str]):
+        """
+        Renomeia as variáveis locais de um nó expandido.
+        """
+        for item in variables(node):
+            name = item.token.value
+            if name in renames:
+                item.token = Token(item.token.tag, renames[name])
+        for item in walk(node):
+            if isinstance(item, ast.Access) and item.token.value in renames:
+                item.token = Token(item.token.tag, renames[item.token.value])
+
+    def lower(self, stmts: ast.Body, result) -> tuple[ast.Body, bool] | None:
+        """
+        Substitui os retornos de um corpo pelas instruções de `result`.
+        Retorna as novas instruções e se todos os caminhos retornam, ou None
+        se algum retorno não está em uma posição permitida.
+        """
+        lowered = []
+        for index, stmt in enumerate(stmts):
+            if isinstance(stmt, ast.Return):
+                lowered.extend(result(stmt.expr))
+                return lowered, True
+            if isinstance(stmt, ast.If) and returns(stmt):
+                rest = stmts[index + 1:]
+                body = self.lower(stmt.body + deepcopy(rest), result)
+                other = self.lower((stmt.else_stmt or []) + deepcopy(rest), result)
+                if body is None or other is None:
+                    return None
+                lowered.append(ast.If(stmt.condition, body[0], other[0]))
+                return lowered, body[1] and other[1]
+            if returns(stmt):
+                return None
+            lowered.append(stmt)
+        return lowered, False
+
+
+def value_type(node: ast.Expression) -> str:
+    """
+    Retorna o tipo do valor de uma expressão. O analisador sintático anota
+    as chamadas com o tipo FUNC, as operações unárias com BOOL e as
+    aritméticas com o tipo do operando esquerdo; aqui, as funções puras têm
+    o tipo do resultado e as operações o tipo dos seus operandos.
+    """
+    match node:
+        case ast.Call():
+            return PURE_FUNCTIONS.get(node.token.value, node.type)
+        case ast.Arithmetic():
+            return value_type(node.left)
+        case ast.Unary() if node.token.value == "-":
+            return value_type(node.expr)
+    return node.type
+
+
+def safe(node: ast.Node) -> bool:
+    """
+    Verifica se uma expressão é pura e não pode falhar, de modo que pode ser
+    avaliada antes, menos vezes ou mesmo quando não seria avaliada, sem
+    alterar o comportamento do programa: constantes, variáveis escalares,
+    operações aritméticas entre números (divisões apenas por constantes não
+    nulas), comparações entre valores de mesmo tipo escalar, operações
+    lógicas e as funções de `PURE_FUNCTIONS`.
+    """
+    match node:
+        case ast.Constant():
+            return True
+        case ast.ID():
+            return node.type in SCALAR_TYPES
+        case ast.Arithmetic():
+            types = (value_type(node.left), value_type(node.right))
+            operator = node.token.value
+            if operator in ("/", "%"):
+                divisor = node.right
+                if not (isinstance(divisor, ast.Constant) and divisor.type == "NUMBER"):
+                    return False
+                if float(divisor.token.value) == 0:
+                    return False
+            elif operator == "+" and types == ("STRING", "STRING"):
+                return safe(node.left) and safe(node.right)
+            elif operator not in ("-", "*", "+"):
+                return False
+            return (
+                types == ("NUMBER", "NUMBER") and safe(node.left) and safe(node.right)
+            )
+        case ast.Relational():
+            left, right = value_type(node.left), value_type(node.right)
+            return (
+                left == right
+                and left in SCALAR_TYPES
+                and safe(node.left)
+                and safe(node.right)
+            )
+        case ast.Logical():
+            return safe(node.left) and safe(node.right)
+        case ast.Unary():
+            if node.token.value == "-" and value_type(node.expr) != "NUMBER":
+                return False
+            return safe(node.expr)
+        case ast.Call():
+            return (
+                is_call(node)
+                and node.token.value in PURE_FUNCTIONS
+                and len(node.args) == 1
+                and value_type(node.args[0]) in SCALAR_TYPES
+                and safe(node.args[0])
+            )
+    return False
+
+
+def key(node: ast.Expression) -> tuple:
+    """
+    Retorna uma chave que identifica a estrutura de uma expressão pura:
+    expressões com a mesma chave produzem o mesmo valor quando suas
+    variáveis têm os mesmos valores.
+    """
+    match node:
+        case ast.Constant():
+            return ("Constant", node.type, node.token.value)
+        case ast.ID():
+            return ("ID", node.token.value)
+        case ast.Unary():
+            return ("Unary", node.token.value, key(node.expr))
+        case ast.Call():
+            return ("Call", node.token.value, *map(key, node.args))
+    return (type(node).__name__, node.token.value, key(node.left), key(node.right))
+
+
+def rewrite(node: ast.Node, choose):
+    """
+    Substitui, no próprio lugar, as expressões descendentes de um nó para as
+    quais `choose` retorna um novo nó, sem descer nas substituídas.
+    """
+    for item in fields(node):
+        value = getattr(node, item.name)
+        if isinstance(value, ast.Node):
+            new = choose(value)
+            if new is None:
+                rewrite(value, choose)
+            else:
+                setattr(node, item.name, new)
+        elif isinstance(value, list):
+            for index, child in enumerate(value):
+                if isinstance(child, ast.Node):
+                    new = choose(child)
+                    if new is None:
+                        rewrite(child, choose)
+                    else:
+                        value[index] = new
+
+
+def evaluated(stmt: ast.Node) -> list[ast.Expression]:
+    """
+    Retorna as expressões avaliadas uma única vez, no início da execução de
+    uma instrução.
+    """
+    match stmt:
+        case ast.Assign():
+            return [stmt.right]
+        case ast.Call():
+            return list(stmt.args)
+        case ast.If():
+            return [stmt.condition]
+        case ast.For():
+            return [stmt.start, stmt.stop] + ([stmt.step] if stmt.step else [])
+        case ast.Return():
+            return [stmt.expr]
+    return []
+
+
+class RedundancyEliminator:
+    """
+    Elimina avaliações redundantes de expressões puras que não podem falhar
+    (ver `safe`), com base nas variáveis atribuídas por cada instrução.
+
+    A movimentação de invariantes avalia uma única vez, antes de um laço
+    while ou for, as expressões cujas variáveis não são atribuídas no laço,
+    guardando o valor em uma nova variável. A eliminação de subexpressões
+    comuns avalia uma única vez as expressões repetidas em instruções
+    consecutivas de um bloco, enquanto nenhuma de suas variáveis é
+    atribuída. Uma chamada de função do programa atribui as variáveis
+    atribuídas, sem declará-las, por ela e pelas funções que chama.
+
+    Programas com blocos `par shared` ou canais servidores não são
+    otimizados, pois outras threads podem alterar as variáveis durante a
+    execução de um laço. Os ramos de blocos par também são mantidos.
+
+    Attributes:
+        report (list[str]): Relatório das expressões movidas ou reutilizadas.
+    """
+
+    def __init__(self):
+        self.report: list[str] = []
+        # Variáveis atribuídas por cada função do programa, incluindo as
+        # funções que ela chama
+        self.writes: dict[str, set[str]] = {}
+        self.counter = count(1)
+        self.hoisted = 0
+        self.shared = 0
+
+    def visit(self, module: ast.Module) -> list[str]:
+        """
+        Otimiza o programa, retornando o relatório.
+        """
+        stmts = module.stmts or []
+        nodes = list(walk_block(stmts))
+        if any(
+            isinstance(item, ast.SChannel) or isinstance(item, ast.Par) and item.shared
+            for item in nodes
+        ):
+            self.report.append("programa: mantido (par shared ou canal servidor)")
+            return self.report
+
+        definitions = [item for item in nodes if isinstance(item, ast.FuncDef)]
+        calls = function_calls(definitions)
+        direct: dict[str, set[str]] = {}
+        for node in definitions:
+            direct.setdefault(node.name, set()).update(
+                {
+                    item.left.token.value
+                    for item in walk_block(node.body)
+                    if isinstance(item, ast.Assign)
+                    and isinstance(item.left, ast.ID)
+                    and not item.left.decl
+                }
+                - set(node.params)
+            )
+        for name in calls:
+            self.writes[name] = set().union(
+                *(direct[callee] for callee in reachable(calls, [name]))
+            )
+
+        bodies = [("programa", stmts)]
+        bodies += [(node.name, node.body) for node in definitions]
+        for where, body in bodies:
+            self.hoisted = self.shared = 0
+            self.block(body)
+            if self.hoisted:
+                self.report.append(
+                    f"{where}: {self.hoisted} expressão(ões) invariante(s) "
+                    f"movida(s) para fora de laços"
+                )
+            if self.shared:
+                self.report.append(
+                    f"{where}: {self.shared} subexpressão(ões) comum(ns) "
+                    f"reutilizada(s)"
+                )
+        return self.report
+
+    def assigned(self, node: ast.Node) -> set[str] | None:
+        """
+        Retorna as variáveis que podem ser atribuídas durante a execução de
+        um nó, ou None se qualquer variável pode ser atribuída.
+        """
+        names = set()
+        for item in walk(node):
+            match item:
+                case ast.Assign(left=ast.ID()):
+                    names.add(item.left.token.value)
+                case ast.For():
+                    names.add(item.var)
+                case ast.FuncDef() | ast.Par() | ast.Channel():
+                    return None
+                case ast.Call() if is_call(item):
+                    names |= self.writes.get(item.token.value, set())
+                case ast.Constant() if item.token.value in self.writes:
+                    names |= self.writes[item.token.value]
+        return names
+
+    def temporary(self, expr: ast.Expression) -> tuple[ast.Assign, str]:
+        """
+        Cria a declaração de uma nova variável com o valor de uma expressão.
+        """
+        name = f"expr@{next(self.counter)}"
+        return declaration(name, value_type(expr), expr), name
+
+    def block(self, stmts: ast.Body):
+        """
+        Otimiza um bloco de instruções e seus blocos internos, no próprio
+        lugar. Os laços internos são otimizados antes, de modo que as
+        expressões movidas para fora deles podem sair também dos externos.
+        """
+        for stmt in stmts:
+            if not isinstance(stmt, (ast.Par, ast.FuncDef)):
+                for inner in blocks(stmt):
+                    self.block(inner)
+        result = []
+        for stmt in stmts:
+            if isinstance(stmt, (ast.While, ast.For)):
+                result.extend(self.hoist(stmt))
+            result.append(stmt)
+        stmts[:] = result
+        self.share(stmts)
+
+    def hoist(self, loop: ast.While | ast.For) -> ast.Body:
+        """
+        Substitui as expressões invariantes de um laço por novas variáveis,
+        retornando as declarações a executar antes do laço.
+        """
+        variant = self.assigned(loop)
+        if variant is None:
+            return []
+        found: dict[tuple, str] = {}
+        declarations = []
+
+        def choose(node: ast.Node):
+            if not isinstance(node, ast.Expression) or not movable(node):
+                return None
+            name = found.get(key(node))
+            if name is None:
+                decl, name = self.temporary(node)
+                found[key(node)] = name
+                declarations.append(decl)
+            return ast.ID(value_type(node), Token("ID", name))
+
+        def movable(node: ast.Expression) -> bool:
+            return (
+                safe(node)
+                and sum(1 for _ in walk(node)) >= MIN_EXPRESSION_SIZE
+                and not {item.token.value for item in variables(node)} & variant
+            )
+
+        if isinstance(loop, ast.While):
+            new = choose(loop.condition)
+            if new is None:
+                rewrite(loop.condition, choose)
+            else:
+                loop.condition = new
+        for stmt in loop.body:
+            rewrite(stmt, choose)
+        self.hoisted += len(declarations)
+        return declarations
+
+    def share(self, stmts: ast.Body):
+        """
+        Reutiliza as subexpressões comuns às instruções de um bloco,
+        começando pelas maiores.
+        """
+        while True:
+            group = self.common(stmts)
+            if group is None:
+                return
+            first, nodes = group
+            decl, name = self.temporary(nodes[0])
+            targets = {id(node) for node in nodes}
+
+            def choose(node: ast.Node):
+                if id(node) in targets:
+                    return ast.ID(value_type(node), Token("ID", name))
+                return None
+
+            for stmt in stmts[first:]:
+                rewrite(stmt, choose)
+            stmts.insert(first, decl)
+            self.shared += 1
+
+    def common(self, stmts: ast.Body) -> tuple[int, list[ast.Expression]] | None:
+        """
+        Retorna o índice da primeira instrução e as ocorrências da maior
+        subexpressão repetida em instruções consecutivas, sem atribuições às
+        suas variáveis entre as ocorrências, ou None se não houver.
+        """
+        best = None
+        # Ocorrências disponíveis: chave -> (índice da primeira instrução,
+        # variáveis, ocorrências)
+        available: dict[tuple, tuple[int, set[str], list]] = {}
+
+        def kill(killed: set[str] | None):
+            nonlocal best
+            for name, (first, names, nodes) in list(available.items()):
+                if killed is None or names & killed:
+                    best = self.better(best, first, nodes)
+                    del available[name]
+
+        for index, stmt in enumerate(stmts):
+            exprs = evaluated(stmt)
+            # Chamadas nas expressões da instrução podem atribuir variáveis
+            # antes da avaliação das demais partes: as ocorrências dessas
+            # instruções não são consideradas
+            during = set()
+            for expr in exprs:
+                names = self.assigned(expr)
+                during = None if names is None or during is None else during | names
+            kill(during)
+            if during == set():
+                for expr in exprs:
+                    for node in walk(expr):
+                        if (
+                            isinstance(node, ast.Expression)
+                            and safe(node)
+                            and sum(1 for _ in walk(node)) >= MIN_EXPRESSION_SIZE
+                        ):
+                            names = {item.token.value for item in variables(node)}
+                            entry = available.setdefault(key(node), (index, names, []))
+                            entry[2].append(node)
+            # A definição de uma função não executa o seu corpo
+            kill(set() if isinstance(stmt, ast.FuncDef) else self.assigned(stmt))
+        kill(None)
+        return best
+
+    def better(self, best, first: int, nodes: list):
+        """
+        Escolhe, entre dois grupos de ocorrências, o da maior expressão
+        repetida.
+        """
+        if len(nodes) < 2:
+            return best
+        size = sum(1 for _ in walk(nodes[0]))
+        if best is None or size > sum(1 for _ in walk(best[1][0])):
+            return first, nodes
+        return best
+
+
+def optimize(module: ast.Module, inline_max_size: int = INLINE_MAX_SIZE) -> list[str]:
+    """
+    Aplica as passagens de otimização ao programa, retornando o relatório
+    das transformações realizadas.
+    """
+    report = Inliner(inline_max_size).visit(module)
+    return report + RedundancyEliminator().visit(module)
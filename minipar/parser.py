@@ -12,6 +12,7 @@ from copy import deepcopy
 from minipar import ast
 from minipar import error as err
 from minipar.lexer import Lexer, NextToken
+from minipar.semantic import element_type
 from minipar.symtable import Symbol, SymTable
 from minipar.token import DEFAULT_FUNCTION_NAMES, STATEMENT_TOKENS, Token
 
@@ -116,7 +117,7 @@ class Parser():
         Analisa uma instrução individual.
 
         stmt -> assignment | function_stmt | return_stmt | break | continue
-              | if_stmt | while_stmt | seq_stmt | par_stmt
+              | if_stmt | while_stmt | for_stmt | seq_stmt | par_stmt
               | c_channel_stmt | s_channel_stmt
 
         Returns:
@@ -148,8 +149,8 @@ class Parser():
                         self.lineno,
                         f"esperado -> no lugar de {self.lookahead.value}",
                     )
-                _type: str = self.lookahead.value
-                if not self.match("TYPE"):
+                _type: str | None = self.type()
+                if not _type:
                     raise err.SyntaxError(
                         self.lineno,
                         f"tipo {self.lookahead.value} de retorno inválido",
@@ -211,14 +212,46 @@ class Parser():
                     )
                 body: ast.Body = self.block()
                 return ast.While(condition=cond, body=body)
+            case "FOR":
+                # for_stmt -> for ID in ari .. ari step block
+                # step -> step ari | EMPTY
+                self.match("FOR")
+                var: str = self.lookahead.value
+                if not self.match("ID"):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperado um identificador no lugar de {self.lookahead.value}",
+                    )
+                if not (self.lookahead.value == "in" and self.match("ID")):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperando in no lugar de {self.lookahead.value}",
+                    )
+                start: ast.Expression = self.ari()
+                if not self.match("RANGE"):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperando .. no lugar de {self.lookahead.value}",
+                    )
+                stop: ast.Expression = self.ari()
+                step: ast.Expression | None = None
+                if self.lookahead.value == "step" and self.match("ID"):
+                    step = self.ari()
+                # A variável do laço é declarada no escopo do corpo
+                body: ast.Body = self.block({var: ("NUMBER", None)})
+                return ast.For(var=var, start=start, stop=stop, step=step, body=body)
             case "SEQ":
                 # seq_stmt -> seq block
                 self.match("SEQ")
                 return ast.Seq(body=self.block())
             case "PAR":
-                # par_stmt -> par block
+                # par_stmt -> par shared block
+                #           | par block
                 self.match("PAR")
-                return ast.Par(body=self.block())
+                shared = self.lookahead.value == "shared"
+                if shared:
+                    self.match("TYPE")
+                return ast.Par(body=self.block(), shared=shared)
             case "C_CHANNEL":
                 # c_channel_stmt -> c_channel ID {STRING, NUMBER}
                 self.match("C_CHANNEL")
@@ -365,8 +398,8 @@ class Parser():
             raise err.SyntaxError(
                 self.lineno, f"esperado : no lugar de {self.lookahead.value}"
             )
-        _type: str = self.lookahead.value
-        if not self.match("TYPE"):
+        _type: str | None = self.type()
+        if not _type:
             raise err.SyntaxError(
                 self.lineno,
                 f"esperado um tipo no lugar de {self.lookahead.value}",
@@ -539,8 +572,8 @@ class Parser():
                 # local_op -> : TYPE
                 if self.lookahead.value == ":":
                     self.match(":")
-                    _type = self.lookahead.value
-                    if not self.match("TYPE"):
+                    _type = self.type()
+                    if not _type:
                         raise err.SyntaxError(
                             self.lineno,
                             f"esperando um tipo no lugar de {self.lookahead.value}",
@@ -559,18 +592,23 @@ class Parser():
                     raise err.SyntaxError(
                         self.lineno, f"variável {token.value} não declarada"
                     )
-                _type = s.type
-                expr1 = ast.ID(type=_type.upper(), token=token)
+                _type = s.type.upper()
+                expr1 = ast.ID(type=_type, token=token)
                 operation = ""
                 while True:
                     if self.lookahead.tag == "[":
                         self.match("[")
-                        expr1 = ast.Access(_type.upper(), token, expr1, self.ari())
+                        # O tipo do acesso é o tipo do valor indexado, que
+                        # em acessos encadeados é o tipo dos elementos do
+                        # nível anterior
+                        expr1 = ast.Access(_type, token, expr1, self.ari())
+                        _type = element_type(_type) or _type
                         if not self.match("]"):
                             raise err.SyntaxError(
                                 self.lineno,
                                 f"esperando ] no lugar de {self.lookahead.value}",
                             )
+                        continue
                     if self.lookahead.tag == ".":
                         self.match(".")
                         operation += self.lookahead.value
@@ -607,6 +645,9 @@ class Parser():
         #       | STRING
         #       | TRUE
         #       | FALSE
+        #       | [ arguments ]
+        #       | { entries }
+        #       | TYPE ( arguments )
         expr: ast.Expression
         match self.lookahead.tag:
             case "(":
@@ -625,12 +666,62 @@ class Parser():
             case "STRING":
                 expr = ast.Constant(type="STRING", token=deepcopy(self.lookahead))
                 self.match("STRING")
+            case "[":
+                # Lista literal, cujo tipo é definido pela análise semântica
+                token = deepcopy(self.lookahead)
+                self.match("[")
+                elements: ast.Arguments = []
+                if self.lookahead.tag != "]":
+                    elements = self.args()
+                if not self.match("]"):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperando ] no lugar de {self.lookahead.value}",
+                    )
+                expr = ast.ListLiteral(type="LIST", token=token, elements=elements)
+            case "{":
+                # Mapa literal, cujo tipo é definido pela análise semântica
+                token = deepcopy(self.lookahead)
+                self.match("{")
+                keys: ast.Arguments = []
+                values: ast.Arguments = []
+                while self.lookahead.tag != "}":
+                    if keys and not self.match(","):
+                        raise err.SyntaxError(
+                            self.lineno,
+                            f"esperando , no lugar de {self.lookahead.value}",
+                        )
+                    keys.append(self.disjunction())
+                    if not self.match(":"):
+                        raise err.SyntaxError(
+                            self.lineno,
+                            f"esperando : no lugar de {self.lookahead.value}",
+                        )
+                    values.append(self.disjunction())
+                self.match("}")
+                expr = ast.MapLiteral(type="MAP", token=token, keys=keys, values=values)
             case "TRUE":
                 expr = ast.Constant(type="BOOL", token=deepcopy(self.lookahead))
                 self.match("TRUE")
             case "FALSE":
                 expr = ast.Constant(type="BOOL", token=deepcopy(self.lookahead))
                 self.match("FALSE")
+            case "TYPE":
+                # Construtor de um tipo, tratado como chamada de função padrão
+                token = Token("ID", self.lookahead.value)
+                self.match("TYPE")
+                if not self.match("("):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperando ( no lugar de {self.lookahead.value}",
+                    )
+                args: ast.Arguments = self.args()
+                if not self.match(")"):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperando ) no lugar de {self.lookahead.value}",
+                    )
+                expr = ast.Call(type="FUNC", token=token, id=None, oper=None, args=args)
             case _:
                 raise err.SyntaxError(
                     self.lineno,
@@ -638,6 +729,58 @@ class Parser():
                 )
         return expr
 
+    def type(self) -> str | None:
+        """
+        Analisa um tipo, retornando None se o token atual não for um tipo.
+
+        type -> TYPE
+              | list [ type ]
+              | map [ key_type , type ]
+        key_type -> number | string | bool
+        """
+        _type: str = self.lookahead.value
+        if not self.match("TYPE"):
+            return None
+        if _type in ("list", "map"):
+            if not self.match("["):
+                raise err.SyntaxError(
+                    self.lineno,
+                    f"esperando [ no lugar de {self.lookahead.value}",
+                )
+            params = [self.type_param()]
+            if _type == "map":
+                if params[0] not in ("number", "string", "bool"):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"chaves de um mapa não podem ter o tipo {params[0]}",
+                    )
+                if not self.match(","):
+                    raise err.SyntaxError(
+                        self.lineno,
+                        f"esperando , no lugar de {self.lookahead.value}",
+                    )
+                params.append(self.type_param())
+            if not self.match("]"):
+                raise err.SyntaxError(
+                    self.lineno,
+                    f"esperando ] no lugar de {self.lookahead.value}",
+                )
+            _type = f"{_type}[{','.join(params)}]"
+        return _type
+
+    def type_param(self) -> str:
+        """
+        Analisa o tipo dos elementos, das chaves ou dos valores de um tipo
+        composto.
+        """
+        _type = self.type()
+        if not _type:
+            raise err.SyntaxError(
+                self.lineno,
+                f"esperado um tipo no lugar de {self.lookahead.value}",
+            )
+        return _type
+
     def var(self, id_type: str):
         # Representa um ID de referencia
         token: Token = deepcopy(self.lookahead)
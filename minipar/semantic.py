@@ -11,7 +11,84 @@ from dataclasses import dataclass, field
 
 from minipar import ast
 from minipar import error as err
-from minipar.token import DEFAULT_FUNCTION_NAMES
+from minipar.token import (
+    CHANNEL_METHOD_NAMES,
+    CHANNEL_METHOD_PARAMS,
+    DEFAULT_FUNCTION_NAMES,
+    DEFAULT_FUNCTION_PARAMS,
+)
+
+# Tipo dos elementos obtidos por acesso indexado em cada tipo indexável
+INDEXABLE_TYPES = {
+    "STRING": "STRING",
+    "SHARED": "NUMBER",
+    "VECTOR": "NUMBER",
+    "MATRIX": "VECTOR",
+}
+
+# Tipos indexáveis que permitem atribuição a um elemento, além das listas
+MUTABLE_TYPES = {"SHARED", "VECTOR", "MATRIX"}
+
+# Posto dos operandos das operações aritméticas elemento a elemento
+ARRAY_RANKS = {"NUMBER": 0, "VECTOR": 1, "MATRIX": 2}
+
+# Laços de repetição, nos quais break e continue são permitidos
+LOOPS = (ast.While, ast.For)
+
+# Tipos de uma lista e de um mapa literais vazios, compatíveis com listas e
+# mapas de quaisquer tipos
+EMPTY_LIST = "LIST"
+EMPTY_MAP = "MAP"
+
+
+def map_types(_type: str) -> tuple[str, str]:
+    """
+    Retorna os tipos das chaves e dos valores de um tipo de mapa
+    ("MAP[STRING,LIST[NUMBER]]" -> ("STRING", "LIST[NUMBER]")). As chaves
+    sempre têm um tipo simples.
+    """
+    key, value = _type[len("MAP["):-1].split(",", 1)
+    return key, value
+
+
+def element_type(_type: str) -> str | None:
+    """
+    Retorna o tipo dos elementos obtidos por acesso indexado a um valor do
+    tipo informado ("LIST[NUMBER]" -> "NUMBER", "MAP[STRING,BOOL]" ->
+    "BOOL"), ou None se o tipo não é indexável.
+    """
+    if _type.startswith("LIST["):
+        return _type[len("LIST["):-1]
+    if _type.startswith("MAP["):
+        return map_types(_type)[1]
+    return INDEXABLE_TYPES.get(_type)
+
+
+def common_type(types: list[str]) -> str | None:
+    """
+    Retorna o tipo comum aos elementos de uma lista ou de um mapa literal,
+    no qual listas e mapas vazios assumem o tipo dos demais, ou None se os
+    tipos forem diferentes.
+    """
+    distinct = set(types)
+    if len(distinct) > 1:
+        distinct -= {EMPTY_LIST, EMPTY_MAP}
+    if len(distinct) != 1:
+        return None
+    common = distinct.pop()
+    return common if all(compatible(common, _type) for _type in types) else None
+
+
+def compatible(expected: str, found: str) -> bool:
+    """
+    Verifica se um valor do tipo encontrado pode ser atribuído a uma
+    variável do tipo esperado.
+    """
+    return (
+        found == expected
+        or (found == EMPTY_LIST and expected.startswith("LIST["))
+        or (found == EMPTY_MAP and expected.startswith("MAP["))
+    )
 
 
 @dataclass
@@ -78,11 +155,18 @@ class SemanticAnalyzer:
         left_type = self.visit(node.left)
         right_type = self.visit(node.right)
 
-        if not isinstance(node.left, ast.ID):
+        if isinstance(node.left, ast.Access):
+            if node.left.type not in MUTABLE_TYPES and not node.left.type.startswith(
+                ("LIST[", "MAP[")
+            ):
+                raise err.SemanticError(
+                    f"elementos do tipo {node.left.type} não podem ser alterados"
+                )
+        elif not isinstance(node.left, ast.ID):
             raise err.SemanticError("atribuição precisa ser feita para uma variável")
-        
+
         var = node.left
-        if left_type != right_type:
+        if not compatible(left_type, right_type):
             raise err.SemanticError(
                 f"(Erro de Tipo) variável {var.token.value} espera {left_type}"
             )
@@ -104,7 +188,7 @@ class SemanticAnalyzer:
         )
         expr_type = self.visit(node.expr)
 
-        if expr_type != function.return_type:
+        if not compatible(function.return_type, expr_type):
             raise err.SemanticError(
                 f"retorno em {function.name} tem tipo diferente do definido"
             )
@@ -113,7 +197,7 @@ class SemanticAnalyzer:
         """
         Verifica se a instrução 'break' está dentro de um loop.
         """
-        if not any(isinstance(parent, ast.While) for parent in self.context_stack):
+        if not any(isinstance(parent, LOOPS) for parent in self.context_stack):
             raise err.SemanticError(
                 "break encontrado fora de uma declaração de um loop"
             )
@@ -122,7 +206,7 @@ class SemanticAnalyzer:
         """
         Verifica se a instrução 'continue' está dentro de um loop.
         """
-        if not any(isinstance(parent, ast.While) for parent in self.context_stack):
+        if not any(isinstance(parent, LOOPS) for parent in self.context_stack):
             raise err.SemanticError(
                 "continue encontrado fora de uma declaração de um loop"
             )
@@ -135,7 +219,7 @@ class SemanticAnalyzer:
             node (ast.FuncDef): Nó de definição de função.
         """
         if any(
-            isinstance(parent, (ast.If, ast.While, ast.Par))
+            isinstance(parent, (ast.If, *LOOPS, ast.Par))
             for parent in self.context_stack
         ):
             raise err.SemanticError(
@@ -191,6 +275,26 @@ class SemanticAnalyzer:
         self.visit_block(node.body)
         self.context_stack.pop()
 
+    def visit_For(self, node: ast.For):
+        """
+        Verifica a validade de um laço de contagem.
+
+        Args:
+            node (ast.For): Nó de laço de contagem.
+        """
+        for expr in (node.start, node.stop, node.step):
+            if expr is None:
+                continue
+            expr_type = self.visit(expr)
+            if expr_type != "NUMBER":
+                raise err.SemanticError(
+                    f"limites do laço for precisam ser NUMBER, encontrado {expr_type}"
+                )
+
+        self.context_stack.append(node)
+        self.visit_block(node.body)
+        self.context_stack.pop()
+
     def visit_Par(self, node: ast.Par):
         """
         Verifica a validade de um bloco de execução paralela.
@@ -293,8 +397,79 @@ class SemanticAnalyzer:
         Raises:
             err.SemanticError: Se o acesso não for válido.
         """
-        if node.type != "STRING":
-            raise err.SemanticError("Acesso por index é válido apenas em strings")
+        _type = element_type(node.type)
+        if _type is None:
+            raise err.SemanticError(
+                "Acesso por index é válido apenas em strings, vetores e listas"
+            )
+
+        if isinstance(node.id, ast.Access):
+            self.visit(node.id)
+        index_type = self.visit(node.expr)
+        expected = map_types(node.type)[0] if node.type.startswith("MAP[") else "NUMBER"
+
+        if index_type != expected:
+            raise err.SemanticError(
+                f"índice precisa ser {expected}, encontrado {index_type}"
+            )
+
+        return _type
+
+    def visit_ListLiteral(self, node: ast.ListLiteral):
+        """
+        Verifica uma lista literal, cujos elementos precisam ter o mesmo tipo.
+
+        Args:
+            node (ast.ListLiteral): Nó de lista literal.
+
+        Returns:
+            str: Tipo da lista, LIST[tipo dos elementos], ou LIST se vazia.
+        """
+        types = [self.visit(element) for element in node.elements]
+
+        if not types:
+            return EMPTY_LIST
+
+        _type = common_type(types)
+        if _type is None:
+            raise err.SemanticError(
+                f"(Erro de Tipo) elementos de uma lista precisam ter o mesmo tipo, "
+                f"encontrado {types}"
+            )
+
+        node.type = f"LIST[{_type}]"
+        return node.type
+
+    def visit_MapLiteral(self, node: ast.MapLiteral):
+        """
+        Verifica um mapa literal, cujas chaves e cujos valores precisam ter,
+        respectivamente, o mesmo tipo.
+
+        Args:
+            node (ast.MapLiteral): Nó de mapa literal.
+
+        Returns:
+            str: Tipo do mapa, MAP[chaves,valores], ou MAP se vazio.
+        """
+        key_types = [self.visit(key) for key in node.keys]
+        value_types = [self.visit(value) for value in node.values]
+
+        if not key_types:
+            return EMPTY_MAP
+
+        key_type, value_type = common_type(key_types), common_type(value_types)
+        if key_type is None or value_type is None:
+            raise err.SemanticError(
+                f"(Erro de Tipo) chaves e valores de um mapa precisam ter o mesmo "
+                f"tipo, encontrado {key_types} e {value_types}"
+            )
+
+        if key_type not in ("NUMBER", "STRING", "BOOL"):
+            raise err.SemanticError(
+                f"(Erro de Tipo) chaves de um mapa não podem ter o tipo {key_type}"
+            )
+
+        node.type = f"MAP[{key_type},{value_type}]"
         return node.type
 
     def visit_Logical(self, node: ast.Logical):
@@ -356,6 +531,9 @@ class SemanticAnalyzer:
         left_type = self.visit(node.left)
         right_type = self.visit(node.right)
 
+        if ARRAY_RANKS.get(left_type) or ARRAY_RANKS.get(right_type):
+            return self.check_array_arithmetic(node, left_type, right_type)
+
         if node.token.value == "+":
             if left_type != right_type:
                 raise err.SemanticError(
@@ -406,19 +584,42 @@ class SemanticAnalyzer:
         """
         func_name = node.oper if node.oper else node.token.value
 
-        for arg in node.args:
-            self.visit(arg)
+        arg_types = [self.visit(arg) for arg in node.args]
+
+        # Métodos de canais (canal.send(...)) não são funções do programa
+        if node.oper:
+            if func_name not in CHANNEL_METHOD_NAMES:
+                raise err.SemanticError(f"método {func_name} não existe em canais")
+            expected = CHANNEL_METHOD_PARAMS.get(func_name)
+            if expected is not None and arg_types != expected:
+                raise err.SemanticError(
+                    f"(Erro de Tipo) {func_name} espera argumentos {expected}, "
+                    f"mas encontrado {arg_types}"
+                )
+            return CHANNEL_METHOD_NAMES[func_name]
 
         function: ast.FuncDef | None = self.function_table.get(str(func_name))
 
         if not function:
             if func_name not in self.default_func_names:
                 raise err.SemanticError(f"função {func_name} não declarada")
-            else:
-                return DEFAULT_FUNCTION_NAMES[func_name]
+            # Funções cujos tipos dependem dos argumentos têm verificação própria
+            checker = getattr(self, f"check_{func_name}", None)
+            if checker:
+                return checker(arg_types)
+            expected = DEFAULT_FUNCTION_PARAMS.get(func_name)
+            if expected is not None and (
+                len(arg_types) != len(expected)
+                or not all(map(compatible, expected, arg_types))
+            ):
+                raise err.SemanticError(
+                    f"(Erro de Tipo) {func_name} espera argumentos {expected}, "
+                    f"mas encontrado {arg_types}"
+                )
+            return DEFAULT_FUNCTION_NAMES[func_name]
 
         nondefault_params = sum(
-            [value[1] is not None for value in function.params.values()]
+            [value[1] is None for value in function.params.values()]
         )
         call_args = len(node.args)
 
@@ -428,3 +629,140 @@ class SemanticAnalyzer:
             )
 
         return function.return_type
+
+    def check_append(self, arg_types: list[str]) -> str:
+        """
+        Verifica os argumentos de append(lista, valor): o valor precisa ter o
+        tipo dos elementos da lista.
+
+        Args:
+            arg_types (list[str]): Tipos dos argumentos da chamada.
+        """
+        if (
+            len(arg_types) != 2
+            or not arg_types[0].startswith("LIST[")
+            or not compatible(element_type(arg_types[0]), arg_types[1])
+        ):
+            raise err.SemanticError(
+                f"(Erro de Tipo) append espera uma lista e um valor do tipo de "
+                f"seus elementos, mas encontrado {arg_types}"
+            )
+        return "VOID"
+
+    def check_array_arithmetic(
+        self, node: ast.Arithmetic, left_type: str, right_type: str
+    ) -> str:
+        """
+        Verifica uma operação aritmética elemento a elemento entre vetores,
+        matrizes e números, retornando o tipo do operando de maior posto.
+        """
+        if (
+            node.token.value not in ("+", "-", "*", "/")
+            or left_type not in ARRAY_RANKS
+            or right_type not in ARRAY_RANKS
+        ):
+            raise err.SemanticError(
+                f"(Erro de Tipo) operação {node.token.value} inválida entre "
+                f"{left_type} e {right_type}"
+            )
+        return max(left_type, right_type, key=ARRAY_RANKS.__getitem__)
+
+    def check_vec_dot(self, arg_types: list[str]) -> str:
+        """
+        Verifica os argumentos de vec_dot(a, b): o produto de dois vetores é
+        um número, o de uma matriz e um vetor é um vetor e o de duas
+        matrizes é uma matriz.
+        """
+        ranks = [ARRAY_RANKS.get(_type) for _type in arg_types]
+        if len(ranks) != 2 or not all(ranks):
+            raise err.SemanticError(
+                f"(Erro de Tipo) vec_dot espera vetores ou matrizes, "
+                f"mas encontrado {arg_types}"
+            )
+        return {2: "NUMBER", 3: "VECTOR", 4: "MATRIX"}[sum(ranks)]
+
+    def check_vec_sum(self, arg_types: list[str]) -> str:
+        """
+        Verifica o argumento de vec_sum(a), a soma dos elementos.
+        """
+        if len(arg_types) != 1 or not ARRAY_RANKS.get(arg_types[0]):
+            raise err.SemanticError(
+                f"(Erro de Tipo) vec_sum espera um vetor ou uma matriz, "
+                f"mas encontrado {arg_types}"
+            )
+        return "NUMBER"
+
+    def check_vec_map(self, arg_types: list[str]) -> str:
+        """
+        Verifica os argumentos de vec_map(a, "funcao"), que aplica uma
+        função a cada elemento e retorna um valor do mesmo tipo de `a`.
+        """
+        if (
+            len(arg_types) != 2
+            or not ARRAY_RANKS.get(arg_types[0])
+            or arg_types[1] != "STRING"
+        ):
+            raise err.SemanticError(
+                f"(Erro de Tipo) vec_map espera um vetor ou uma matriz e o nome "
+                f"de uma função, mas encontrado {arg_types}"
+            )
+        return arg_types[0]
+
+    def check_map(self, name: str, arg_types: list[str], params: int) -> tuple[str, str]:
+        """
+        Verifica se o primeiro argumento de uma função de mapas é um mapa e
+        se a chave, quando esperada, tem o tipo das chaves do mapa,
+        retornando os tipos das chaves e dos valores.
+        """
+        if len(arg_types) != params or not arg_types[0].startswith("MAP["):
+            raise err.SemanticError(
+                f"(Erro de Tipo) {name} espera um mapa e {params - 1} argumentos, "
+                f"mas encontrado {arg_types}"
+            )
+        key, value = map_types(arg_types[0])
+        if params > 1 and arg_types[1] != key:
+            raise err.SemanticError(
+                f"(Erro de Tipo) chave de {name} precisa ser {key}, "
+                f"encontrado {arg_types[1]}"
+            )
+        return key, value
+
+    def check_map_get(self, arg_types: list[str]) -> str:
+        """
+        Verifica os argumentos de map_get(mapa, chave, padrão), que retorna
+        o valor da chave ou o valor padrão, se a chave não existir.
+        """
+        _, value = self.check_map("map_get", arg_types, 3)
+        if not compatible(value, arg_types[2]):
+            raise err.SemanticError(
+                f"(Erro de Tipo) valor padrão de map_get precisa ser {value}, "
+                f"encontrado {arg_types[2]}"
+            )
+        return value
+
+    def check_map_set(self, arg_types: list[str]) -> str:
+        """
+        Verifica os argumentos de map_set(mapa, chave, valor).
+        """
+        _, value = self.check_map("map_set", arg_types, 3)
+        if not compatible(value, arg_types[2]):
+            raise err.SemanticError(
+                f"(Erro de Tipo) valor de map_set precisa ser {value}, "
+                f"encontrado {arg_types[2]}"
+            )
+        return "VOID"
+
+    def check_map_has(self, arg_types: list[str]) -> str:
+        """
+        Verifica os argumentos de map_has(mapa, chave).
+        """
+        self.check_map("map_has", arg_types, 2)
+        return "BOOL"
+
+    def check_map_keys(self, arg_types: list[str]) -> str:
+        """
+        Verifica o argumento de map_keys(mapa), que retorna uma lista com as
+        chaves na ordem de inserção.
+        """
+        key, _ = self.check_map("map_keys", arg_types, 1)
+        return f"LIST[{key}]"
@@ -0,0 +1,281 @@
+"""
+Módulo de Objetos Compartilhados
+
+Este módulo define os objetos que são compartilhados por referência entre
+os ramos de um bloco paralelo (par), sem cópia dos dados, tanto quando os
+ramos executam em threads quanto em processos separados.
+"""
+
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+from weakref import WeakValueDictionary
+
+from minipar import error as err
+
+# Formato e tamanho (em bytes) de cada elemento numérico armazenado
+ITEM_FORMAT = "d"
+ITEM_SIZE = 8
+
+# Segmentos de memória já mapeados pelo processo atual, indexados pelo nome
+_segments: "WeakValueDictionary[str, _Segment]" = WeakValueDictionary()
+
+
+def _release(shm: shared_memory.SharedMemory, items: memoryview, creator: int):
+    """
+    Libera o mapeamento de um segmento, removendo-o do sistema apenas no
+    processo que o criou.
+    """
+    items.release()
+    try:
+        shm.close()
+    except BufferError:
+        return
+    if os.getpid() == creator:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _number(value: float):
+    """
+    Converte um valor armazenado como ponto flutuante para inteiro,
+    quando não possui parte fracionária.
+    """
+    return int(value) if value.is_integer() else value
+
+
+class _Segment:
+    """
+    Segmento de memória compartilhada mapeado no processo atual.
+
+    Attributes:
+        shm (SharedMemory): Bloco de memória compartilhada.
+        items (memoryview): Visão numérica de todo o bloco.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, creator: int):
+        self.shm = shm
+        self.items = shm.buf.cast(ITEM_FORMAT)
+        weakref.finalize(self, _release, shm, self.items, creator)
+
+    @classmethod
+    def create(cls, size: int) -> "_Segment":
+        """
+        Cria um novo segmento com espaço para `size` números, zerados.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1) * ITEM_SIZE)
+        segment = cls(shm, os.getpid())
+        _segments[shm.name] = segment
+        return segment
+
+    @classmethod
+    def attach(cls, name: str, creator: int) -> "_Segment":
+        """
+        Mapeia um segmento existente a partir do seu nome, reaproveitando
+        o mapeamento caso o processo atual já o possua.
+        """
+        segment = _segments.get(name)
+        if segment is None:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Python < 3.13: o registro repetido no rastreador de recursos
+                # (compartilhado com o processo criador) não tem efeito
+                shm = shared_memory.SharedMemory(name=name)
+            segment = cls(shm, creator)
+            _segments[name] = segment
+        return segment
+
+
+class SharedArray:
+    """
+    Vetor de números armazenado em memória compartilhada.
+
+    Cópias (deepcopy) e serializações (pickle) do vetor referenciam o mesmo
+    segmento de memória, de modo que os ramos de um bloco paralelo leem e
+    escrevem diretamente nos dados originais. Fatias criadas por `shared_slice`
+    restringem o intervalo visível, permitindo que cada ramo seja dono de
+    uma faixa disjunta do vetor.
+
+    Attributes:
+        segment (_Segment): Segmento de memória que armazena os elementos.
+        start (int): Posição inicial da faixa visível no segmento.
+        stop (int): Posição final (exclusiva) da faixa visível no segmento.
+        creator (int): PID do processo que criou o segmento.
+    """
+
+    def __init__(self, segment: _Segment, start: int, stop: int, creator: int):
+        self.segment = segment
+        self.start = start
+        self.stop = stop
+        self.creator = creator
+
+    @classmethod
+    def create(cls, size) -> "SharedArray":
+        """
+        Cria um vetor compartilhado com `size` elementos iguais a zero.
+        """
+        size = int(size)
+        if size < 0:
+            raise err.RunTimeError(f"tamanho {size} inválido para um vetor")
+        return cls(_Segment.create(size), 0, size, os.getpid())
+
+    @classmethod
+    def attach(cls, name: str, start: int, stop: int, creator: int) -> "SharedArray":
+        """
+        Reconstrói um vetor a partir do nome do seu segmento.
+        """
+        return cls(_Segment.attach(name, creator), start, stop, creator)
+
+    def index(self, index) -> int:
+        """
+        Converte um índice relativo à faixa visível em posição no segmento.
+        """
+        position = int(index)
+        if not 0 <= position < self.stop - self.start:
+            raise err.RunTimeError(
+                f"índice {index} fora dos limites do vetor de tamanho {len(self)}"
+            )
+        return self.start + position
+
+    def slice(self, start, stop) -> "SharedArray":
+        """
+        Retorna uma fatia [start, stop) do vetor que compartilha seus dados.
+        """
+        start, stop = int(start), int(stop)
+        if not 0 <= start <= stop <= len(self):
+            raise err.RunTimeError(
+                f"fatia [{start}, {stop}) inválida para vetor de tamanho {len(self)}"
+            )
+        return SharedArray(
+            self.segment, self.start + start, self.start + stop, self.creator
+        )
+
+    def __getitem__(self, index):
+        return _number(self.segment.items[self.index(index)])
+
+    def __setitem__(self, index, value):
+        self.segment.items[self.index(index)] = value
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self):
+        return map(_number, self.segment.items[self.start : self.stop])
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return f"SharedArray({self.segment.shm.name}, {self.start}, {self.stop})"
+
+    def __deepcopy__(self, _memo) -> "SharedArray":
+        return self
+
+    def __reduce__(self):
+        return (
+            SharedArray.attach,
+            (self.segment.shm.name, self.start, self.stop, self.creator),
+        )
+
+
+class Mutex:
+    """
+    Trava de exclusão mútua compartilhada entre os ramos de um bloco paralelo.
+
+    Attributes:
+        handle (multiprocessing.Lock): Trava utilizada pelas threads ou processos.
+    """
+
+    def __init__(self):
+        self.handle = multiprocessing.Lock()
+
+    def lock(self):
+        """
+        Adquire a trava, bloqueando até que ela esteja disponível.
+        """
+        self.handle.acquire()
+
+    def unlock(self):
+        """
+        Libera a trava.
+        """
+        try:
+            self.handle.release()
+        except ValueError:
+            raise err.RunTimeError("unlock em um mutex que não está travado")
+
+    def __deepcopy__(self, _memo) -> "Mutex":
+        return self
+
+
+class Atomic:
+    """
+    Número com operações atômicas compartilhado entre os ramos de um bloco
+    paralelo.
+
+    Attributes:
+        cell (multiprocessing.Value): Valor em memória compartilhada e sua trava.
+    """
+
+    def __init__(self, value=0):
+        self.cell = multiprocessing.Value(ITEM_FORMAT, float(value))
+
+    def load(self):
+        """
+        Retorna o valor atual.
+        """
+        with self.cell.get_lock():
+            return _number(self.cell.value)
+
+    def fetch_add(self, delta):
+        """
+        Soma `delta` ao valor atual, retornando o valor anterior à soma.
+        """
+        with self.cell.get_lock():
+            previous = self.cell.value
+            self.cell.value = previous + delta
+        return _number(previous)
+
+    def compare_swap(self, expected, new) -> bool:
+        """
+        Substitui o valor por `new` somente se ele for igual a `expected`.
+
+        Returns:
+            bool: True se a substituição foi realizada, False caso contrário.
+        """
+        with self.cell.get_lock():
+            if self.cell.value != expected:
+                return False
+            self.cell.value = new
+        return True
+
+    def __str__(self) -> str:
+        return str(self.load())
+
+    def __deepcopy__(self, _memo) -> "Atomic":
+        return self
+
+
+class Barrier:
+    """
+    Barreira de sincronização para um número fixo de ramos paralelos.
+
+    Attributes:
+        handle (multiprocessing.Barrier): Barreira utilizada pelos ramos.
+    """
+
+    def __init__(self, parties):
+        self.handle = multiprocessing.Barrier(int(parties))
+
+    def wait(self):
+        """
+        Bloqueia até que todos os ramos participantes alcancem a barreira.
+        """
+        self.handle.wait()
+
+    def __deepcopy__(self, _memo) -> "Barrier":
+        return self
@@ -0,0 +1,92 @@
+"""
+Módulo de Funções de Texto
+
+Este módulo define o tipo strbuf, um acumulador de texto com acréscimo em
+tempo constante amortizado, e as funções padrão que operam sobre strings
+inteiras (separação, busca, substituição etc.), executadas diretamente em
+Python em vez de laços interpretados caractere a caractere.
+"""
+
+from minipar import error as err
+
+
+def _position(value) -> int:
+    """
+    Converte uma posição em inteiro, aceitando números reais inteiros como
+    os resultantes de divisões.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if type(value) is not int:
+        raise err.RunTimeError(f"posição {value} precisa ser um número inteiro")
+    return value
+
+
+class StrBuf:
+    """
+    Acumulador de texto. Os trechos acrescentados são mantidos em uma lista
+    e unidos apenas quando o texto é lido, evitando a cópia de todo o texto
+    a cada concatenação.
+
+    Attributes:
+        parts (list[str]): Trechos acrescentados desde a última leitura.
+        length (int): Quantidade total de caracteres.
+    """
+
+    __slots__ = ("parts", "length")
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.length = 0
+
+    def append(self, text: str):
+        """
+        Acrescenta um trecho ao final do texto.
+        """
+        self.parts.append(text)
+        self.length += len(text)
+
+    def __str__(self) -> str:
+        if len(self.parts) > 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+    def __len__(self) -> int:
+        return self.length
+
+
+def split(text: str, separator: str) -> list[str]:
+    """
+    Separa o texto nas ocorrências do separador. Com o separador vazio,
+    separa nos espaços em branco, descartando os trechos vazios.
+    """
+    return text.split(separator) if separator else text.split()
+
+
+def substr(text: str, start, stop) -> str:
+    """
+    Retorna os caracteres do texto nas posições [start, stop).
+    """
+    return text[_position(start):_position(stop)]
+
+
+def join(parts: list[str], separator: str) -> str:
+    """
+    Une os textos de uma lista, intercalados pelo separador.
+    """
+    return separator.join(parts)
+
+
+def parse_number(text: str):
+    """
+    Converte um texto, desconsiderando espaços nas extremidades, em número
+    inteiro ou real.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        raise err.RunTimeError(f"{text!r} não é um número") from None
@@ -11,6 +11,7 @@ from dataclasses import dataclass
 # Padrões de correspondência para os tokens
 TOKEN_PATTERNS = [
     ("NAME", r"[A-Za-z_][A-Za-z0-9_]*"),  # Identificadores e palavras reservadas
+    ("RANGE", r"\.\."),  # Intervalo dos laços for (a..b)
     ("NUMBER", r"\b\d+\.\d+|\.\d+|\d+\b"),  # Números inteiros e decimais
     ("RARROW", r"->"),  # Operador de seta
     ("STRING", r'"([^"]*)"'),  # Literais de string
@@ -34,6 +35,7 @@ STATEMENT_TOKENS = {
     "IF",
     "ELSE",
     "WHILE",
+    "FOR",
     "RETURN",
     "BREAK",
     "CONTINUE",
@@ -56,6 +58,107 @@ DEFAULT_FUNCTION_NAMES = {
     "len": "NUMBER",
     "isalpha": "BOOL",
     "isnum": "BOOL",
+    "shared": "SHARED",
+    "shared_slice": "SHARED",
+    "mutex": "MUTEX",
+    "mutex_lock": "VOID",
+    "mutex_unlock": "VOID",
+    "atomic": "ATOMIC",
+    "atomic_load": "NUMBER",
+    "atomic_fetch_add": "NUMBER",
+    "atomic_compare_swap": "BOOL",
+    "barrier": "BARRIER",
+    "barrier_wait": "VOID",
+    "channel_stats": "STRING",
+    "vector": "VECTOR",
+    "matrix": "MATRIX",
+    "strbuf": "STRBUF",
+    "strbuf_append": "VOID",
+    "strbuf_string": "STRING",
+    "str_split": "LIST[STRING]",
+    "str_find": "NUMBER",
+    "str_substr": "STRING",
+    "str_replace": "STRING",
+    "str_strip": "STRING",
+    "str_join": "STRING",
+    "parse_number": "NUMBER",
+    "exp": "NUMBER",
+    "log": "NUMBER",
+    "sqrt": "NUMBER",
+    "pow": "NUMBER",
+    "tanh": "NUMBER",
+    "sin": "NUMBER",
+    "cos": "NUMBER",
+    "floor": "NUMBER",
+    "ceil": "NUMBER",
+    "abs": "NUMBER",
+    # Funções cujo tipo de retorno depende dos tipos dos argumentos,
+    # definido por SemanticAnalyzer.check_<nome>
+    "append": "VOID",
+    "vec_dot": "NUMBER",
+    "vec_sum": "NUMBER",
+    "vec_map": "VECTOR",
+    "map_get": "ANY",
+    "map_set": "VOID",
+    "map_has": "BOOL",
+    "map_keys": "LIST",
+}
+
+# Tipos dos argumentos esperados pelas funções padrão que operam sobre
+# vetores compartilhados, primitivas de sincronização, vetores, textos e
+# números
+DEFAULT_FUNCTION_PARAMS = {
+    "shared": ["NUMBER"],
+    "shared_slice": ["SHARED", "NUMBER", "NUMBER"],
+    "mutex": [],
+    "mutex_lock": ["MUTEX"],
+    "mutex_unlock": ["MUTEX"],
+    "atomic": ["NUMBER"],
+    "atomic_load": ["ATOMIC"],
+    "atomic_fetch_add": ["ATOMIC", "NUMBER"],
+    "atomic_compare_swap": ["ATOMIC", "NUMBER", "NUMBER"],
+    "barrier": ["NUMBER"],
+    "barrier_wait": ["BARRIER"],
+    "channel_stats": [],
+    "vector": ["LIST[NUMBER]"],
+    "matrix": ["LIST[LIST[NUMBER]]"],
+    "strbuf": [],
+    "strbuf_append": ["STRBUF", "STRING"],
+    "strbuf_string": ["STRBUF"],
+    "str_split": ["STRING", "STRING"],
+    "str_find": ["STRING", "STRING"],
+    "str_substr": ["STRING", "NUMBER", "NUMBER"],
+    "str_replace": ["STRING", "STRING", "STRING"],
+    "str_strip": ["STRING"],
+    "str_join": ["LIST[STRING]", "STRING"],
+    "parse_number": ["STRING"],
+    "exp": ["NUMBER"],
+    "log": ["NUMBER"],
+    "sqrt": ["NUMBER"],
+    "pow": ["NUMBER", "NUMBER"],
+    "tanh": ["NUMBER"],
+    "sin": ["NUMBER"],
+    "cos": ["NUMBER"],
+    "floor": ["NUMBER"],
+    "ceil": ["NUMBER"],
+    "abs": ["NUMBER"],
+}
+
+# Tipos de retorno dos métodos dos canais cliente (canal.send(...)), que não
+# ocupam nomes do escopo global
+CHANNEL_METHOD_NAMES = {
+    "send": "STRING",
+    "send_many": "STRING",
+    "send_async": "NUMBER",
+    "receive": "STRING",
+    "close": "VOID",
+}
+
+# Tipos dos argumentos esperados pelos métodos dos canais cliente
+CHANNEL_METHOD_PARAMS = {
+    "send_many": ["STRING"],
+    "send_async": ["STRING"],
+    "receive": ["NUMBER"],
 }
 
 # Expressão regular combinada para análise léxica
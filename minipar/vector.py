@@ -0,0 +1,322 @@
+"""
+Módulo de Vetores e Matrizes Numéricos
+
+Este módulo define os tipos vector e matrix, cujas operações aritméticas
+(+, -, *, /) são aplicadas elemento a elemento, com difusão de números e de
+vetores sobre as linhas de matrizes, além do produto (`vec_dot`), da soma
+(`vec_sum`) e da aplicação de funções a todos os elementos (`vec_map`).
+
+Quando o NumPy está instalado, os dados são mantidos em arrays do NumPy e
+cada operação é uma única chamada vetorizada; caso contrário, é utilizada
+uma implementação em Python puro com o mesmo comportamento.
+"""
+
+import math
+import operator
+
+from minipar import error as err
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _number(value: float):
+    """
+    Converte um elemento para inteiro, quando não possui parte fracionária.
+    """
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _sigmoid(x: float) -> float:
+    # Forma equivalente a 1 / (1 + e^-x) que não excede o limite do expoente
+    return 0.5 * (1.0 + math.tanh(0.5 * x))
+
+
+# Funções aplicadas por vec_map, por nome, em Python puro (elemento a
+# elemento) e com o NumPy (sobre todo o array)
+FUNCTIONS = {
+    "sigmoid": _sigmoid,
+    "tanh": math.tanh,
+    "relu": lambda x: max(x, 0.0),
+    "exp": math.exp,
+    "log": math.log,
+    "sqrt": math.sqrt,
+    "abs": abs,
+}
+
+if numpy is not None:
+    NUMPY_FUNCTIONS = {
+        "sigmoid": lambda a: 0.5 * (1.0 + numpy.tanh(0.5 * a)),
+        "tanh": numpy.tanh,
+        "relu": lambda a: numpy.maximum(a, 0.0),
+        "exp": numpy.exp,
+        "log": numpy.log,
+        "sqrt": numpy.sqrt,
+        "abs": numpy.abs,
+    }
+
+
+def _broadcast(op, left, lrank: int, right, rrank: int):
+    """
+    Aplica uma operação elemento a elemento a dados em Python puro de
+    postos (0: número, 1: vetor, 2: matriz) possivelmente diferentes,
+    repetindo o operando de menor posto sobre o de maior posto.
+    """
+    if lrank == rrank == 0:
+        return op(left, right)
+    if lrank > rrank:
+        return [_broadcast(op, item, lrank - 1, right, rrank) for item in left]
+    if rrank > lrank:
+        return [_broadcast(op, left, lrank, item, rrank - 1) for item in right]
+    if len(left) != len(right):
+        raise err.RunTimeError(
+            f"dimensões incompatíveis: {len(left)} e {len(right)} elementos"
+        )
+    return [
+        _broadcast(op, a, lrank - 1, b, rrank - 1) for a, b in zip(left, right)
+    ]
+
+
+def _apply(function, data, rank: int):
+    """
+    Aplica uma função a cada elemento de dados em Python puro.
+    """
+    if rank == 0:
+        return function(data)
+    return [_apply(function, item, rank - 1) for item in data]
+
+
+def _dot(left: list[float], right: list[float]) -> float:
+    """
+    Produto escalar de dois vetores em Python puro.
+    """
+    if len(left) != len(right):
+        raise err.RunTimeError(
+            f"dimensões incompatíveis: {len(left)} e {len(right)} elementos"
+        )
+    return math.fsum(map(operator.mul, left, right))
+
+
+def _wrap(data, rank: int):
+    """
+    Converte o resultado de uma operação no valor correspondente ao posto.
+    """
+    if rank == 0:
+        return _number(data)
+    return Vector(data) if rank == 1 else Matrix(data)
+
+
+class Array:
+    """
+    Base dos vetores e matrizes.
+
+    Attributes:
+        data: Elementos, em um array do NumPy ou em listas de números reais.
+        rank (int): Quantidade de dimensões (1: vetor, 2: matriz).
+    """
+
+    __slots__ = ("data",)
+    rank = 0
+
+    def __init__(self, data):
+        self.data = data
+
+    def tolist(self) -> list:
+        """
+        Retorna os elementos em listas do Python, sem compartilhar os dados.
+        """
+        if numpy is not None:
+            return self.data.tolist()
+        if self.rank == 1:
+            return list(self.data)
+        return [list(row) for row in self.data]
+
+    @staticmethod
+    def create(values: list, rank: int) -> "Array":
+        """
+        Cria um vetor (posto 1) ou uma matriz (posto 2) a partir de listas.
+        """
+        if rank == 2:
+            columns = len(values[0]) if values else 0
+            if any(len(row) != columns for row in values):
+                raise err.RunTimeError("as linhas de uma matriz precisam ter o mesmo tamanho")
+            if numpy is not None:
+                data = numpy.array(values, dtype=float).reshape(len(values), columns)
+            else:
+                data = [[float(value) for value in row] for row in values]
+            return Matrix(data)
+        if numpy is not None:
+            return Vector(numpy.array(values, dtype=float))
+        return Vector([float(value) for value in values])
+
+    def operate(self, other, op, reflected: bool = False):
+        """
+        Aplica uma operação aritmética elemento a elemento com outro vetor,
+        matriz ou número.
+        """
+        if isinstance(other, Array):
+            other_data, other_rank = other.data, other.rank
+        elif isinstance(other, (int, float)) and not isinstance(other, bool):
+            other_data, other_rank = other, 0
+        else:
+            return NotImplemented
+        left, lrank, right, rrank = self.data, self.rank, other_data, other_rank
+        if reflected:
+            left, lrank, right, rrank = right, rrank, left, lrank
+        if numpy is None:
+            try:
+                result = _broadcast(op, left, lrank, right, rrank)
+            except ZeroDivisionError:
+                raise err.RunTimeError("divisão por zero") from None
+            return _wrap(result, max(lrank, rrank))
+        try:
+            with numpy.errstate(divide="raise", invalid="raise"):
+                result = op(left, right)
+        except FloatingPointError:
+            raise err.RunTimeError("divisão por zero") from None
+        except ValueError as error:
+            raise err.RunTimeError(f"dimensões incompatíveis: {error}") from None
+        return _wrap(result, result.ndim)
+
+    def __add__(self, other):
+        return self.operate(other, operator.add)
+
+    def __radd__(self, other):
+        return self.operate(other, operator.add, reflected=True)
+
+    def __sub__(self, other):
+        return self.operate(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self.operate(other, operator.sub, reflected=True)
+
+    def __mul__(self, other):
+        return self.operate(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self.operate(other, operator.mul, reflected=True)
+
+    def __truediv__(self, other):
+        return self.operate(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self.operate(other, operator.truediv, reflected=True)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Array) and self.tolist() == other.tolist()
+
+    __hash__ = None
+
+    def __str__(self) -> str:
+        return str(_apply(_number, self.tolist(), self.rank))
+
+    __repr__ = __str__
+
+    def map(self, name: str) -> "Array":
+        """
+        Aplica uma das funções de `FUNCTIONS` a todos os elementos.
+        """
+        try:
+            if numpy is not None:
+                with numpy.errstate(all="raise"):
+                    return type(self)(NUMPY_FUNCTIONS[name](self.data))
+            return type(self)(_apply(FUNCTIONS[name], self.data, self.rank))
+        except (ValueError, FloatingPointError, OverflowError):
+            raise err.RunTimeError(f"valor fora do domínio de {name}") from None
+
+    def apply(self, function) -> "Array":
+        """
+        Aplica uma função do Python a cada elemento, um de cada vez.
+        """
+        return self.create(_apply(function, self.tolist(), self.rank), self.rank)
+
+    def sum(self):
+        """
+        Retorna a soma de todos os elementos.
+        """
+        if numpy is not None:
+            return _number(self.data.sum())
+        values = self.data if self.rank == 1 else (x for row in self.data for x in row)
+        return _number(math.fsum(values))
+
+
+class Vector(Array):
+    """
+    Vetor de números reais. O acesso indexado retorna um número.
+    """
+
+    __slots__ = ()
+    rank = 1
+
+    def __getitem__(self, index: int):
+        return _number(self.data[index])
+
+    def __setitem__(self, index: int, value):
+        self.data[index] = float(value)
+
+
+class Matrix(Array):
+    """
+    Matriz de números reais. O acesso indexado retorna a linha, um vetor
+    que compartilha os dados da matriz.
+    """
+
+    __slots__ = ()
+    rank = 2
+
+    def __getitem__(self, index: int) -> Vector:
+        return Vector(self.data[index])
+
+    def __setitem__(self, index: int, row: Vector):
+        if len(row) != len(self.data[index]):
+            raise err.RunTimeError(
+                f"linha com {len(row)} elementos em matriz de "
+                f"{len(self.data[index])} colunas"
+            )
+        self.data[index][:] = row.data
+
+
+def vector(values: list) -> Vector:
+    """
+    Cria um vetor a partir de uma lista de números.
+    """
+    return Array.create(values, 1)
+
+
+def matrix(rows: list[list]) -> Matrix:
+    """
+    Cria uma matriz a partir de uma lista de linhas de mesmo tamanho.
+    """
+    return Array.create(rows, 2)
+
+
+def dot(left: Array, right: Array):
+    """
+    Produto entre vetores e matrizes: escalar entre dois vetores, vetor
+    entre matriz e vetor (ou vetor e matriz) e matricial entre matrizes.
+    """
+    if numpy is not None:
+        try:
+            result = numpy.dot(left.data, right.data)
+        except ValueError as error:
+            raise err.RunTimeError(f"dimensões incompatíveis: {error}") from None
+        return _wrap(result, numpy.ndim(result))
+    if left.rank == right.rank == 1:
+        return _number(_dot(left.data, right.data))
+    if left.rank == 2 and right.rank == 1:
+        return Vector([_dot(row, right.data) for row in left.data])
+    inner = len(left.data) if left.rank == 1 else len(left.data[0]) if left.data else 0
+    if inner != len(right.data):
+        raise err.RunTimeError(
+            f"dimensões incompatíveis: {inner} colunas e {len(right.data)} linhas"
+        )
+    columns = list(zip(*right.data))
+    if left.rank == 1:
+        return Vector([_dot(left.data, column) for column in columns])
+    return Matrix([[_dot(row, column) for column in columns] for row in left.data])
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+from minipar.executor import GIL_WARNING, gil_enabled
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAR_INPUT = """
+func ler() -> void {
+  nome: string = input()
+  print("lido: " + nome)
+}
+par {
+  ler()
+}
+"""
+
+
+def test_par_auto_reads_input(tmp_path):
+    """Testa a leitura da entrada padrão em um ramo par no modo automático."""
+    program = tmp_path / "entrada.minipar"
+    program.write_text(PAR_INPUT)
+    result = subprocess.run(
+        [sys.executable, "-m", "minipar", "-par", "auto", str(program)],
+        cwd=ROOT_DIR,
+        input="minipar\n",
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "lido: minipar" in result.stdout
+    assert (GIL_WARNING in result.stderr) == gil_enabled()
+
+
+def test_workers_must_be_positive_with_threads(tmp_path):
+    """Testa a validação de -workers para cada implementação de servidor."""
+    program = tmp_path / "vazio.minipar"
+    program.write_text("x: number = 1\n")
+    for server, workers, returncode in [
+        ("threads", "0", 2),
+        ("events", "-1", 2),
+        ("events", "0", 0),
+    ]:
+        result = subprocess.run(
+            [sys.executable, "-m", "minipar", "-server", server,
+             "-workers", workers, str(program)],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        assert result.returncode == returncode, result.stderr
@@ -0,0 +1,336 @@
+import errno
+import socket
+import threading
+import time
+
+import pytest
+
+from minipar import channel
+from minipar.channel import (
+    BUSY_REPLY,
+    ClientChannel,
+    ConnectionPool,
+    EventLoopServer,
+    MessageReader,
+    ThreadPoolServer,
+    frame,
+    listen,
+)
+from minipar.error import RunTimeError
+
+
+def start_server(handler, server_class=ThreadPoolServer, **options):
+    """Inicia um servidor em uma porta livre, retornando-o com a porta."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(16)
+    server = server_class(listener, handler, "BANNER", **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, listener.getsockname()[1]
+
+
+def connect(port: int, framing: str = "length") -> ClientChannel:
+    """Conecta um cliente ao servidor, verificando a descrição do canal."""
+    client, description = ClientChannel.connect("localhost", port, framing)
+    assert description == "BANNER"
+    return client
+
+
+def request(client: ClientChannel, data: str) -> str:
+    """Envia uma mensagem e aguarda a resposta do servidor."""
+    return client.request(data)
+
+
+def test_server_handles_concurrent_clients():
+    """Testa o atendimento simultâneo de vários clientes conectados."""
+    server, port = start_server(str.upper, workers=2)
+    first = connect(port)
+    second = connect(port)
+    assert request(second, "b") == "B"
+    assert request(first, "a") == "A"
+    first.close()
+    third = connect(port)
+    assert request(third, "c") == "C"
+    server.shutdown()
+
+
+def test_server_reports_handler_errors():
+    """Testa se erros da função tratadora são enviados ao cliente."""
+    def handler(_):
+        raise ValueError("falhou")
+
+    server, port = start_server(handler)
+    client = connect(port)
+    assert request(client, "x") == "falhou"
+    server.shutdown()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_event_loop_server_multiplexes_clients(workers):
+    """Testa o laço de eventos com a função tratadora no laço e em threads."""
+    server, port = start_server(str.upper, EventLoopServer, workers=workers)
+    clients = [connect(port) for _ in range(5)]
+    for index, client in reversed(list(enumerate(clients))):
+        assert request(client, f"c{index}") == f"C{index}"
+    clients[0].close()
+    assert request(clients[1], "ok") == "OK"
+    server.shutdown()
+
+
+@pytest.mark.parametrize("server_class", [ThreadPoolServer, EventLoopServer])
+def test_large_messages_arrive_whole(server_class):
+    """Testa mensagens maiores que uma leitura do socket."""
+    server, port = start_server(lambda data: data[::-1], server_class)
+    client = connect(port)
+    message = "abc" * 1_000_000
+    assert request(client, message) == message[::-1]
+    server.shutdown()
+
+
+@pytest.mark.parametrize("server_class", [ThreadPoolServer, EventLoopServer])
+def test_back_to_back_messages_are_not_merged(server_class):
+    """Testa mensagens enviadas de uma só vez, sem aguardar as respostas."""
+    server, port = start_server(str.upper, server_class)
+    client = connect(port)
+    client.sock.sendall(b"".join(frame(data) for data in (b"a", b"", b"c")))
+    assert [client.receive() for _ in range(3)] == ["A", "", "C"]
+    server.shutdown()
+
+
+def test_line_framing():
+    """Testa a delimitação por linhas usada por clientes de texto."""
+    server, port = start_server(str.upper, framing="line")
+    client = socket.create_connection(("localhost", port))
+    reader = MessageReader("line")
+    assert reader.read(client) == "BANNER"
+    client.sendall(b"a\nb\n")
+    assert reader.read(client) == "A"
+    assert reader.read(client) == "B"
+    server.shutdown()
+
+
+@pytest.mark.parametrize(
+    "server_class, workers",
+    [(ThreadPoolServer, 2), (EventLoopServer, 0), (EventLoopServer, 2)],
+)
+def test_pipelined_requests_keep_order(server_class, workers):
+    """Testa lotes maiores que a janela do pipeline e tickets assíncronos."""
+    server, port = start_server(str.upper, server_class, workers=workers)
+    client = connect(port)
+    messages = [f"m{i}" for i in range(1000)]
+    assert client.request_many(messages) == [m.upper() for m in messages]
+    first = client.submit("a")
+    second = client.submit("b")
+    assert request(client, "c") == "C"
+    assert client.reply(second) == "B"
+    assert client.reply(first) == "A"
+    server.shutdown()
+
+
+def test_reply_of_unknown_ticket():
+    """Testa tickets que não foram enviados ou cuja resposta já foi lida."""
+    server, port = start_server(str.upper)
+    client = connect(port)
+    ticket = client.submit("a")
+    assert client.reply(ticket) == "A"
+    with pytest.raises(RunTimeError):
+        client.reply(ticket)
+    with pytest.raises(RunTimeError):
+        client.reply(ticket + 1)
+    server.shutdown()
+
+
+def test_idle_clients_do_not_exhaust_workers():
+    """Testa se mais clientes conectados que threads continuam sendo atendidos."""
+    server, port = start_server(str.upper, workers=1)
+    clients = [connect(port) for _ in range(3)]
+    for index, client in reversed(list(enumerate(clients))):
+        assert request(client, f"c{index}") == f"C{index}"
+    server.shutdown()
+
+
+class FailingListener:
+    """Socket de escuta cuja primeira chamada a accept falha com EMFILE."""
+
+    def __init__(self, listener: socket.socket):
+        self.listener = listener
+        self.calls = 0
+
+    def accept(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise OSError(errno.EMFILE, "Too many open files")
+        return self.listener.accept()
+
+    def __getattr__(self, name):
+        return getattr(self.listener, name)
+
+
+def test_event_loop_backs_off_when_accept_fails(monkeypatch, capsys):
+    """Testa a pausa do laço de eventos após uma falha ao aceitar conexões."""
+    monkeypatch.setattr(channel, "ACCEPT_BACKOFF", 0.2)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(16)
+    failing = FailingListener(listener)
+    server = EventLoopServer(failing, str.upper, "BANNER")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = connect(listener.getsockname()[1])
+    assert request(client, "a") == "A"
+    assert failing.calls <= 3
+    assert "falha ao aceitar conexão" in capsys.readouterr().err
+    server.shutdown()
+
+
+def test_pool_reuses_and_evicts_connections():
+    """Testa a reutilização, verificação e expiração de conexões ociosas."""
+    server, port = start_server(str.upper)
+    pool = ConnectionPool(max_idle=1)
+    first = pool.acquire("localhost", port)
+    second = pool.acquire("localhost", port)
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire("localhost", port) is first
+    assert pool.stats() == {
+        "hits": 1, "misses": 2, "evictions": 1, "reconnects": 0, "idle": 0
+    }
+    assert first.description == "BANNER"
+    assert request(first, "a") == "A"
+    pool.release(first)
+    pool.idle_timeout = 0
+    assert pool.acquire("localhost", port) is not first
+    assert pool.stats()["evictions"] == 2
+    server.shutdown()
+
+
+def test_pool_discards_closed_connections_and_reconnects():
+    """Testa conexões encerradas pelo servidor, ociosas ou durante o uso."""
+    server, port = start_server(str.upper)
+    pool = ConnectionPool()
+    client = pool.acquire("localhost", port)
+
+    def drop_server_side():
+        with server.lock:
+            connections = list(server.connections)
+        for conn in connections:
+            conn.shutdown(socket.SHUT_RDWR)
+        while server.connections:
+            time.sleep(0.01)
+
+    drop_server_side()
+    assert request(client, "a") == "A"
+    assert pool.stats()["reconnects"] == 1
+
+    pool.release(client)
+    drop_server_side()
+    assert pool.acquire("localhost", port) is not client
+    assert pool.stats()["evictions"] == 1
+    server.shutdown()
+
+
+@pytest.mark.parametrize("server_class", [ThreadPoolServer, EventLoopServer])
+@pytest.mark.parametrize("transport", ["unix", "inproc"])
+def test_local_transports(tmp_path, server_class, transport):
+    """Testa os transportes por socket de domínio Unix e em memória."""
+    address = (
+        f"unix:{tmp_path / 'canal.sock'}" if transport == "unix" else "inproc:canal"
+    )
+    listener = listen(address, 0)
+    server = server_class(listener, str.upper, "BANNER")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    clients = [ClientChannel.connect(address, 0)[0] for _ in range(3)]
+    for index, client in enumerate(clients):
+        assert client.description == "BANNER"
+        assert request(client, f"c{index}") == f"C{index}"
+    assert client.request_many(["a", "b"]) == ["A", "B"]
+    server.shutdown()
+    if transport == "inproc":
+        while "canal" in channel._inproc_listeners:
+            time.sleep(0.01)
+        with pytest.raises(ConnectionRefusedError):
+            ClientChannel.connect(address, 0)
+
+
+@pytest.mark.parametrize(
+    "server_class, workers",
+    [(ThreadPoolServer, 2), (EventLoopServer, 0), (EventLoopServer, 2)],
+)
+def test_server_metrics(server_class, workers):
+    """Testa os contadores, medidores e latências registrados pelo servidor."""
+    server, port = start_server(str.upper, server_class, workers=workers)
+    client = connect(port)
+    assert client.request_many(["ab", "cd", "ef"]) == ["AB", "CD", "EF"]
+    values = server.metrics.snapshot()
+    assert values["requests"] == 3
+    assert values["connections"] == values["active_connections"] == 1
+    assert values["bytes_in"] == values["bytes_out"] - len("BANNER") - 4 == 18
+    assert values["queue_depth"] == 0
+    assert values["latency_us"]["count"] == 3
+    client.close()
+    while server.metrics.snapshot()["active_connections"]:
+        time.sleep(0.01)
+    server.shutdown()
+
+
+@pytest.mark.parametrize(
+    "server_class, workers",
+    [(ThreadPoolServer, 2), (EventLoopServer, 0), (EventLoopServer, 2)],
+)
+def test_bounded_pending_messages(server_class, workers):
+    """Testa lotes maiores que o limite de mensagens por conexão."""
+    server, port = start_server(
+        str.upper, server_class, workers=workers, max_pending=3, max_inflight=4
+    )
+    clients = [connect(port) for _ in range(3)]
+    messages = [f"m{i}" for i in range(100)]
+    for client in clients:
+        assert client.request_many(messages) == [m.upper() for m in messages]
+    values = server.metrics.snapshot()
+    assert values["inflight"] == values["queue_depth"] == values["busy"] == 0
+    server.shutdown()
+
+
+@pytest.mark.parametrize(
+    "server_class, workers", [(ThreadPoolServer, 2), (EventLoopServer, 2)]
+)
+@pytest.mark.parametrize("overload", ["pause", "busy"])
+def test_overloaded_server(server_class, workers, overload):
+    """Testa a espera por vagas e a resposta de servidor ocupado."""
+    release = threading.Event()
+
+    def handler(data):
+        if data == "lento":
+            release.wait(5)
+        return data
+
+    server, port = start_server(
+        handler, server_class, workers=workers, max_inflight=1, overload=overload
+    )
+    slow, other = connect(port), connect(port)
+    ticket = slow.submit("lento")
+    while server.metrics.snapshot()["inflight"] < 1:
+        time.sleep(0.01)
+    waiting = other.submit("rápido")
+    if overload == "busy":
+        assert other.reply(waiting) == BUSY_REPLY
+        release.set()
+    else:
+        while server.metrics.snapshot()["paused"] < 1:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        release.set()
+        assert other.reply(waiting) == "rápido"
+    assert slow.reply(ticket) == "lento"
+    for _ in range(100):
+        values = server.metrics.snapshot()
+        if not values["paused"]:
+            break
+        time.sleep(0.01)
+    assert values["busy"] == (overload == "busy")
+    assert values["inflight"] == values["paused"] == 0
+    if overload == "pause":
+        assert values["handler_us"]["max"] >= 100000
+    if overload == "pause" and server_class is ThreadPoolServer:
+        # A mensagem lida aguarda uma vaga na fila do servidor
+        assert values["queue_wait_us"]["max"] >= 100000
+    server.shutdown()
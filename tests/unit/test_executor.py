@@ -0,0 +1,532 @@
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from minipar.channel import POOL, ThreadPoolServer
+from minipar.error import RunTimeError
+from minipar.executor import GIL_WARNING, Executor, gil_enabled
+from minipar.lexer import Lexer
+from minipar.parser import Parser
+from minipar.semantic import SemanticAnalyzer
+
+
+EXAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "examples"
+)
+
+
+def run(code: str, **options) -> Executor:
+    """Analisa e executa um programa, retornando o executor utilizado."""
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    executor = Executor(**options)
+    executor.run(tree)
+    return executor
+
+
+def value(executor: Executor, name: str):
+    """Retorna o valor de uma variável global do executor."""
+    return executor.var_table.table[name]
+
+
+PAR_SHARED = """
+func preencher(v: shared, base: number) -> void {
+  i: number = 0
+  while (i < len(v)) {
+    v[i] = base + i
+    i = i + 1
+  }
+}
+dados: shared = shared(4)
+par {
+  preencher(shared_slice(dados, 0, 2), 10)
+  preencher(shared_slice(dados, 2, 4), 20)
+}
+"""
+
+
+def test_par_threads_write_shared_array():
+    """Testa a escrita em faixas disjuntas de um vetor por ramos em threads."""
+    executor = run(PAR_SHARED)
+    assert list(value(executor, "dados")) == [10.0, 11.0, 20.0, 21.0]
+
+
+def test_par_processes_write_shared_array():
+    """Testa a escrita em um vetor compartilhado por ramos em processos."""
+    executor = run(PAR_SHARED, par_mode="process")
+    assert list(value(executor, "dados")) == [10.0, 11.0, 20.0, 21.0]
+
+
+PAR_COUNTER = """
+total: number = 0
+contador: atomic = atomic(0)
+trava: mutex = mutex()
+func somar(n: number) -> void {
+  i: number = 0
+  while (i < n) {
+    atomic_fetch_add(contador, 1)
+    mutex_lock(trava)
+    total = total + 1
+    mutex_unlock(trava)
+    i = i + 1
+  }
+}
+par shared {
+  somar(200)
+  somar(300)
+}
+final: number = atomic_load(contador)
+"""
+
+
+def test_par_shared_counters():
+    """Testa contadores atômicos e protegidos por mutex em um par shared."""
+    executor = run(PAR_COUNTER)
+    assert value(executor, "final") == 500
+    assert value(executor, "total") == 500
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_gil_warning(monkeypatch, capsys, enabled):
+    """Testa o aviso do modo automático com e sem GIL, exibido uma vez."""
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: enabled, raising=False)
+    assert gil_enabled() is enabled
+    program = "func f() -> void {\n}\n" + "par {\n  f()\n}\n" * 2
+    run(program, warn_par=True)
+    expected = GIL_WARNING + "\n" if enabled else ""
+    assert capsys.readouterr().err == expected
+    run(program)
+    assert capsys.readouterr().err == ""
+
+
+def test_process_branch_without_connection():
+    """Testa o erro ao usar um canal que não existe no ramo de execução."""
+    with pytest.raises(RunTimeError):
+        Executor().send("usuario", "1 + 1")
+
+
+def test_return_inside_loop_restores_frame():
+    """Testa se o quadro da thread é restaurado após retorno dentro de laço."""
+    executor = run("""
+func primeiro(n: number) -> number {
+  i: number = 0
+  while (i < n) {
+    return i + 1
+  }
+  return n
+}
+x: number = primeiro(3)
+""")
+    assert executor.scope is executor.var_table
+    assert value(executor, "x") == 1
+
+
+def test_channel_pipelined_requests(capsys):
+    """Testa send_many, send_async e receive em um canal cliente."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    server = ThreadPoolServer(listener, str.upper, "calc")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    executor = run(f"""
+func receive(x: string) -> string {{
+  return x
+}}
+c_channel cliente {{"localhost", {listener.getsockname()[1]}}}
+lote: string = cliente.send_many("a\nb\nc")
+ticket: number = cliente.send_async("d")
+unico: string = cliente.send("e")
+resposta: string = cliente.receive(ticket)
+local: string = receive("f")
+cliente.close()
+""")
+    server.shutdown()
+    assert capsys.readouterr().out == "calc\n"
+    assert value(executor, "lote") == "A\nB\nC"
+    assert value(executor, "unico") == "E"
+    assert value(executor, "resposta") == "D"
+    assert value(executor, "local") == "f"
+
+
+def test_par_branches_inherit_options(monkeypatch):
+    """Testa se os ramos em threads herdam as opções do executor."""
+    branches = []
+    execute = Executor.execute
+
+    def record(self, node):
+        if self is not executor:
+            branches.append(self.options())
+        return execute(self, node)
+
+    executor = Executor(workers=2, server_mode="events", framing="line")
+    monkeypatch.setattr(Executor, "execute", record)
+    tree = Parser(Lexer("func f() -> void {\n}\npar {\n  f()\n}")).start()
+    SemanticAnalyzer().visit(tree)
+    executor.run(tree)
+    assert branches and all(opts == executor.options() for opts in branches)
+
+
+def test_channel_connections_are_reused_between_runs(capsys):
+    """Testa a reutilização da conexão de um c_channel por execuções seguintes."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(1)
+    server = ThreadPoolServer(listener, str.upper, "calc")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    program = f"""
+c_channel cliente {{"localhost", {listener.getsockname()[1]}}}
+x: string = cliente.send("a")
+"""
+    hits = POOL.stats()["hits"]
+    for _ in range(3):
+        assert value(run(program), "x") == "A"
+    assert POOL.stats()["hits"] == hits + 2
+    assert capsys.readouterr().out == "calc\n" * 3
+    server.shutdown()
+
+
+def test_calculator_over_inproc_transport(capsys):
+    """Testa o exemplo da calculadora pelo transporte em memória."""
+    with open(os.path.join(EXAMPLES_DIR, "server_calc.minipar")) as f:
+        code = f.read().replace('"localhost", 8585', '"inproc:calc", 0')
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    server = Executor()
+    threading.Thread(target=server.run, args=(tree,), daemon=True).start()
+    while "server" not in server.server_table:
+        time.sleep(0.01)
+
+    executor = run("""
+c_channel cliente {"inproc:calc", 0}
+resultado: string = cliente.send("1 + 2")
+""")
+    server.server_table["server"].shutdown()
+    assert value(executor, "resultado") == "3"
+    assert "CALCULADORA BÁSICA" in capsys.readouterr().out
+
+
+def test_bound_function_call():
+    """Testa a chamada direta de uma função vinculada por bind."""
+    executor = run("""
+func saudar(nome: string, prefixo: string = "olá ") -> string {
+  return prefixo + nome
+}
+""")
+    saudar = executor.bind(executor.function_table["saudar"])
+    assert saudar("ana") == "olá ana"
+    assert saudar("ana", "oi ") == "oi ana"
+    assert executor.scope is executor.var_table
+
+
+def test_quiet_server_and_channel_stats(capsys):
+    """Testa o servidor sem exibir mensagens e a função channel_stats."""
+    tree = Parser(Lexer("""
+func eco(msg: string) -> string {
+  return msg
+}
+s_channel quieto {eco, "eco", "inproc:quieto", 0}
+""")).start()
+    SemanticAnalyzer().visit(tree)
+    server = Executor(log_messages=False)
+    threading.Thread(target=server.run, args=(tree,), daemon=True).start()
+    while "quieto" not in server.server_table:
+        time.sleep(0.01)
+
+    executor = run("""
+c_channel cliente {"inproc:quieto", 0}
+resposta: string = cliente.send("oi")
+stats: string = channel_stats()
+""")
+    server.server_table["quieto"].shutdown()
+    assert value(executor, "resposta") == "oi"
+    assert 'minipar_channel_requests_total{server="quieto"} 1' in value(
+        executor, "stats"
+    )
+    assert "received" not in capsys.readouterr().out
+
+
+INFINITE_LOOP = """
+i: number = 0
+while (true) {
+  i = i + 1
+}
+"""
+
+
+def test_step_budget():
+    """Testa o encerramento do programa ao esgotar os passos permitidos."""
+    executor = run("""
+i: number = 0
+while (i < 100) {
+  i = i + 1
+}
+""", max_steps=100)
+    assert value(executor, "i") == 100
+    with pytest.raises(RunTimeError, match="limite de 99 passos"):
+        run(INFINITE_LOOP.replace("true", "i < 100"), max_steps=99)
+
+
+def test_timeout_stops_infinite_loop():
+    """Testa o encerramento de um laço infinito pelo tempo limite."""
+    start = time.monotonic()
+    with pytest.raises(RunTimeError, match="tempo limite"):
+        run(INFINITE_LOOP, timeout=0.2)
+    assert time.monotonic() - start < 5
+
+
+def test_par_branches_share_budget():
+    """Testa a aplicação do tempo limite aos ramos de um bloco par."""
+    errors = []
+    hook = threading.excepthook
+    threading.excepthook = lambda args: errors.append(args.exc_value)
+    try:
+        run("""
+func girar() -> void {
+  while (true) {
+  }
+}
+par {
+  girar()
+}
+""", timeout=0.2)
+    finally:
+        threading.excepthook = hook
+    assert isinstance(errors[0], RunTimeError)
+
+
+def test_request_budget():
+    """Testa os limites de execução de cada mensagem de um canal servidor."""
+    tree = Parser(Lexer("""
+func contar(msg: string) -> string {
+  i: number = 0
+  while (i < to_number(msg)) {
+    i = i + 1
+  }
+  return to_string(i)
+}
+s_channel limitado {contar, "contar", "inproc:limitado", 0}
+""")).start()
+    SemanticAnalyzer().visit(tree)
+    server = Executor(log_messages=False, request_max_steps=50, timeout=0.5)
+    threading.Thread(target=server.run, args=(tree,), daemon=True).start()
+    while "limitado" not in server.server_table:
+        time.sleep(0.01)
+
+    executor = run("""
+c_channel cliente {"inproc:limitado", 0}
+curta: string = cliente.send("10")
+longa: string = cliente.send("1000")
+outra: string = cliente.send("40")
+""")
+    time.sleep(0.6)
+    final = run("""
+c_channel cliente {"inproc:limitado", 0}
+depois: string = cliente.send("5")
+""")
+    server.server_table["limitado"].shutdown()
+    assert value(executor, "curta") == "10"
+    assert "limite de 50 passos" in value(executor, "longa")
+    assert value(executor, "outra") == "40"
+    # O tempo limite do programa não se aplica às mensagens
+    assert value(final, "depois") == "5"
+
+
+def test_lists():
+    """Testa listas literais, acesso indexado, atribuição e append."""
+    executor = run("""
+func ordenar(v: list[number]) -> void {
+  i: number = 1
+  while (i < len(v)) {
+    j: number = i
+    while (j > 0 && v[j - 1] > v[j]) {
+      t: number = v[j]
+      v[j] = v[j - 1]
+      v[j - 1] = t
+      j = j - 1
+    }
+    i = i + 1
+  }
+}
+v: list[number] = [5, 3, 8]
+append(v, 1)
+ordenar(v)
+m: list[list[number]] = [[0, 0], [0, 0]]
+m[1][0] = v[(len(v) - 2) / 2]
+""")
+    assert value(executor, "v") == [1, 3, 5, 8]
+    assert value(executor, "m") == [[0, 0], [3, 0]]
+    with pytest.raises(RunTimeError, match="índice 2 fora dos limites"):
+        run("v: list[number] = [1, 2]\nx: number = v[2]")
+
+
+def test_vectorized_forward_pass():
+    """Testa uma camada de rede neural calculada com vetores e matrizes."""
+    executor = run("""
+func degrau(x: number) -> number {
+  if (x > 0) {
+    return 1
+  }
+  return 0
+}
+X: matrix = matrix([[0, 0], [0, 1], [1, 0], [1, 1]])
+W: matrix = matrix([[1, 1], [1, 1]])
+b: vector = vector([0, -1])
+H: matrix = vec_map(vec_dot(X, W) + b, "degrau")
+saida: vector = vec_dot(H, vector([1, -2]))
+total: number = vec_sum(H)
+""")
+    assert value(executor, "H").tolist() == [[0, 0], [1, 0], [1, 0], [1, 1]]
+    assert value(executor, "saida").tolist() == [0, 1, 1, -1]
+    assert value(executor, "total") == 4
+
+
+def test_maps():
+    """Testa mapas literais, acesso por chave e as funções de mapas."""
+    executor = run("""
+precos: map[string, number] = {"Laptop": 3500, "Jeans": 120}
+precos["Tablet"] = 900
+map_set(precos, "Jeans", 99)
+soma: number = precos["Jeans"] + map_get(precos, "Fones", 1)
+tem: bool = map_has(precos, "Tablet")
+chaves: list[string] = map_keys(precos)
+""")
+    assert value(executor, "soma") == 100
+    assert value(executor, "tem") is True
+    assert value(executor, "chaves") == ["Laptop", "Jeans", "Tablet"]
+    with pytest.raises(RunTimeError, match="chave Fones não existe"):
+        run('m: map[string, number] = {}\nx: number = m["Fones"]')
+
+
+def test_strbuf_and_string_builtins():
+    """Testa o acumulador de texto e as funções padrão de strings."""
+    executor = run("""
+b: strbuf = strbuf()
+i: number = 0
+while (i < 3) {
+  strbuf_append(b, to_string(i))
+  i = i + 1
+}
+texto: string = strbuf_string(b)
+tamanho: number = len(b)
+partes: list[string] = str_split(" 12 + 30 ", "")
+soma: number = parse_number(partes[0]) + parse_number(str_strip(" 30 "))
+pos: number = str_find("a=b", "=")
+chave: string = str_substr("a=b", 0, pos)
+unido: string = str_join(str_split("a,b,c", ","), ";")
+trocado: string = str_replace("1+1", "+", " mais ")
+""")
+    assert value(executor, "texto") == "012"
+    assert value(executor, "tamanho") == 3
+    assert value(executor, "partes") == ["12", "+", "30"]
+    assert value(executor, "soma") == 42
+    assert value(executor, "chave") == "a"
+    assert value(executor, "unido") == "a;b;c"
+    assert value(executor, "trocado") == "1 mais 1"
+    with pytest.raises(RunTimeError, match="não é um número"):
+        run('x: number = parse_number("12a")')
+
+
+def test_math_builtins():
+    """Testa as funções matemáticas padrão."""
+    executor = run("""
+sigmoide: number = 1 / (1 + exp(-0))
+raiz: number = sqrt(16) + floor(2.7) + ceil(0.2) + abs(-1)
+potencia: number = pow(2, 10)
+logaritmo: number = log(exp(2))
+""")
+    assert value(executor, "sigmoide") == 0.5
+    assert value(executor, "raiz") == 8
+    assert value(executor, "potencia") == 1024
+    assert isinstance(value(executor, "potencia"), int)
+    assert value(executor, "logaritmo") == pytest.approx(2)
+    with pytest.raises(RunTimeError, match="fora do domínio"):
+        run("x: number = log(0)")
+
+
+def test_for_loop():
+    """Testa o laço de contagem com incremento, break, continue e return."""
+    executor = run("""
+func achar(v: list[number], x: number) -> number {
+  for i in 0..len(v) {
+    if (v[i] == x) {
+      return i
+    }
+  }
+  return -1
+}
+soma: number = 0
+for i in 10..0 step -2 {
+  if (i == 4) {
+    continue
+  }
+  if (i == 2) {
+    break
+  }
+  soma = soma + i
+}
+posicao: number = achar([5, 6, 7], 7)
+step: number = 0
+for in in 0..3 step 1 {
+  step = step + in
+}
+""")
+    assert value(executor, "soma") == 10 + 8 + 6
+    assert value(executor, "posicao") == 2
+    # in e step continuam disponíveis como nomes de variáveis
+    assert value(executor, "step") == 3
+    with pytest.raises(RunTimeError, match="não pode ser 0"):
+        run("for i in 0..3 step 0 {\n}")
+    with pytest.raises(RunTimeError, match="passos"):
+        run("for i in 0..10 {\n}", max_steps=5)
+
+
+def test_call_defaults_evaluated_only_when_missing():
+    """Testa a avaliação dos valores padrão apenas para parâmetros omitidos."""
+    executor = run("""
+avaliados: list[number] = []
+func padrao(n: number) -> number {
+  append(avaliados, n)
+  return n
+}
+func f(x: number, y: number = padrao(2), z: number = padrao(3)) -> number {
+  return x * 100 + y * 10 + z
+}
+y: number = 9
+todos: number = f(1, 4, 5)
+um: number = f(1, 4)
+nenhum: number = f(1)
+escopo: number = f(y, y)
+""")
+    assert value(executor, "avaliados") == [3, 2, 3, 3]
+    assert value(executor, "todos") == 145
+    assert value(executor, "um") == 143
+    assert value(executor, "nenhum") == 123
+    # Os argumentos são avaliados no escopo de quem chama
+    assert value(executor, "escopo") == 993
+
+
+def test_inline_caches():
+    """Testa os caches em linha: acertos em laços e invalidação por declarações."""
+    executor = run("""
+x: number = 1
+soma: number = 0
+i: number = 0
+while (i < 50) {
+  soma = soma + x
+  if (i == 0) {
+    soma = soma + 100
+  }
+  x: number = 10
+  i = i + 1
+}
+""")
+    # Após a declaração no laço, x passa a ser a variável do escopo do laço
+    assert value(executor, "soma") == 1 + 100 + 49 * 10
+    assert value(executor, "x") == 1
+    stats = executor.cache_stats()
+    assert stats["variáveis"].hits > stats["variáveis"].misses
+    assert stats["constantes"].hit_rate() > 0.5
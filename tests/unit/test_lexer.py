@@ -9,4 +9,16 @@ def test_lexer_scan():
     assert tokens[0][0] == Token(tag="TYPE", value="number")
     assert tokens[1][0] == Token(tag="ID", value="x")
     assert tokens[2][0] == Token(tag="=", value="=")
-    assert tokens[3][0] == Token(tag="NUMBER", value="42")
\ No newline at end of file
+    assert tokens[3][0] == Token(tag="NUMBER", value="42")
+
+def test_lexer_range():
+    """Testa a separação dos limites de um intervalo a..b."""
+    tokens = [token for token, _ in Lexer(data="for i in 0..10").scan()]
+    assert tokens == [
+        Token(tag="FOR", value="for"),
+        Token(tag="ID", value="i"),
+        Token(tag="ID", value="in"),
+        Token(tag="NUMBER", value="0"),
+        Token(tag="RANGE", value=".."),
+        Token(tag="NUMBER", value="10"),
+    ]
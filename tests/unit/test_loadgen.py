@@ -0,0 +1,50 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from minipar.channel import ThreadPoolServer
+from minipar.loadgen import LoadGenerator, main
+
+
+@pytest.fixture
+def server():
+    """Inicia um servidor local que responde as mensagens em maiúsculas."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("localhost", 0))
+    listener.listen(16)
+    server = ThreadPoolServer(listener, str.upper, "BANNER", workers=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield listener.getsockname()[1]
+    server.shutdown()
+
+
+def test_payload_templates():
+    """Testa a geração das mensagens a partir dos modelos em rodízio."""
+    generator = LoadGenerator("localhost", 0, ["a{n}", "b"])
+    assert [generator.payload(n) for n in range(3)] == ["a0", "b", "a2"]
+
+
+def test_closed_loop(server):
+    """Testa o modo fechado com várias conexões."""
+    result = LoadGenerator(
+        "localhost", server, connections=3, duration=0.3, warmup=0.1
+    ).run()
+    assert result["mode"] == "closed"
+    assert result["requests"] > 0
+    assert result["errors"] == 0
+    assert 0 < result["latency_ms"]["p50"] <= result["latency_ms"]["max"]
+
+
+def test_open_loop_keeps_rate(server, capsys):
+    """Testa se o modo aberto envia as requisições à taxa configurada."""
+    main([
+        "localhost", str(server), "--mode", "open", "--rate", "200",
+        "--connections", "2", "--duration", "0.5", "--warmup", "0.1",
+    ])
+    result = json.loads(capsys.readouterr().out)
+    assert result["mode"] == "open"
+    assert result["requests"] == 100
+    assert result["throughput"] == 200
+    assert result["errors"] == 0
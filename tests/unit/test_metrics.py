@@ -0,0 +1,39 @@
+from minipar.metrics import Histogram, Registry
+
+
+def test_histogram_buckets_keep_relative_precision():
+    """Testa se cada valor é agrupado com erro relativo limitado."""
+    for value in [0, 1, 31, 32, 33, 1000, 123456, 10**9]:
+        highest = Histogram.highest(Histogram.index(value))
+        assert value <= highest <= value + value // 16
+
+
+def test_histogram_percentiles():
+    """Testa os percentis, a soma e o máximo de um histograma."""
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record([value])
+    assert abs(histogram.percentile(50) - 500) <= 500 // 16
+    assert abs(histogram.percentile(99) - 990) <= 990 // 16
+    assert histogram.percentile(100) == 1000
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 1000
+    assert snapshot["sum"] == 500500
+    assert snapshot["max"] == 1000
+
+
+def test_registry_render():
+    """Testa a formatação das métricas em texto simples."""
+    registry = Registry()
+    metrics = registry.register("calc")
+    metrics.connected()
+    metrics.add("bytes_in", 10)
+    metrics.completed([2000], [500], [1500])
+    text = registry.render({"hits": 1})
+    assert 'minipar_channel_requests_total{server="calc"} 1\n' in text
+    assert 'minipar_channel_bytes_in_total{server="calc"} 10\n' in text
+    assert 'minipar_channel_active_connections{server="calc"} 1\n' in text
+    assert 'minipar_channel_latency_us{server="calc",quantile="0.5"} 2000\n' in text
+    assert "minipar_client_pool_hits 1\n" in text
+    assert 'minipar_channel_queue_wait_us{server="calc",quantile="0.5"} 500\n' in text
+    assert 'minipar_channel_handler_us_count{server="calc"} 1\n' in text
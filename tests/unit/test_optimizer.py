@@ -0,0 +1,338 @@
+import contextlib
+import io
+import os
+import random
+
+import pytest
+
+from minipar import ast
+from minipar.executor import Executor
+from minipar.lexer import Lexer
+from minipar.optimizer import optimize, walk_block
+from minipar.parser import Parser
+from minipar.semantic import SemanticAnalyzer
+
+
+def compile_program(code: str) -> ast.Module:
+    """Analisa um programa, retornando a AST verificada."""
+    tree = Parser(Lexer(code)).start()
+    SemanticAnalyzer().visit(tree)
+    return tree
+
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+
+
+def run_both(code: str, errors: bool = False) -> tuple[dict, list[str], ast.Module]:
+    """
+    Executa um programa sem e com a otimização, verificando que a saída, o
+    erro e as variáveis globais do programa terminam com os mesmos valores.
+    Erros de execução são aceitos apenas se `errors` for verdadeiro.
+    """
+    plain = execute(compile_program(code))
+    assert errors or plain[2] is None
+    tree = compile_program(code)
+    report = optimize(tree)
+    optimized = execute(tree)
+    result = {
+        name: value
+        for name, value in optimized[0].var_table.table.items()
+        if "@" not in name
+    }
+    assert result == plain[0].var_table.table
+    assert optimized[1:] == plain[1:]
+    return result, report, tree
+
+
+def execute(tree: ast.Module) -> tuple[Executor, str, str | None]:
+    """
+    Executa um programa, retornando o executor, a saída e o erro que
+    encerrou a execução, se houver.
+    """
+    executor = Executor()
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        try:
+            executor.run(tree)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return executor, output.getvalue(), error
+
+
+def calls(tree: ast.Module, name: str) -> int:
+    """Conta as chamadas restantes de uma função."""
+    return sum(
+        isinstance(node, ast.Call) and node.token.value == name
+        for node in walk_block(tree.stmts)
+    )
+
+
+def test_inline_expression_and_early_returns():
+    """Testa a expansão de funções com retorno ao final e em comandos if."""
+    result, report, tree = run_both("""
+func sigmoide(x: number) -> number {
+  return 1 / (1 + exp(-x))
+}
+func degrau(v: number) -> number {
+  if (v >= 0) {
+    return 1
+  }
+  return 0
+}
+func sinal(v: number) -> string {
+  if (v > 0) {
+    return "+"
+  } else {
+    if (v < 0) {
+      return "-"
+    }
+  }
+  return "0"
+}
+a: number = sigmoide(0)
+b: number = 0
+b = degrau(-2)
+c: number = degrau(3 - 1)
+d: string = sinal(-1) + sinal(0)
+e: string = sinal(0)
+""")
+    assert result["a"] == 0.5 and result["b"] == 0 and result["c"] == 1
+    assert result["e"] == "0"
+    assert "sigmoide: 1 chamada(s) expandida(s)" in report
+    assert "degrau: 2 chamada(s) expandida(s)" in report
+    # Chamadas dentro de expressões não são expandidas
+    assert calls(tree, "sigmoide") == 0 and calls(tree, "sinal") == 2
+
+
+def test_inline_renames_locals_and_keeps_argument_order():
+    """Testa a renomeação das variáveis locais e a avaliação dos argumentos."""
+    result, report, tree = run_both("""
+ordem: list[number] = []
+func marca(n: number) -> number {
+  append(ordem, n)
+  return n
+}
+func trocar(v: list[number], a: number, b: number = marca(0)) -> void {
+  t: number = v[a]
+  v[a] = v[b]
+  v[b] = t
+}
+total: number = 5
+func zerar(x: number) -> number {
+  total = 0
+  return x
+}
+t: number = 42
+lista: list[number] = [1, 2, 3]
+trocar(lista, marca(2), marca(1))
+trocar(lista, 1)
+anterior: number = zerar(total)
+""")
+    assert result["lista"] == [3, 1, 2]
+    assert result["t"] == 42
+    # O argumento é lido antes de o corpo alterar a variável
+    assert result["anterior"] == 5 and result["total"] == 0
+    assert result["ordem"] == [2, 1, 0]
+    assert calls(tree, "trocar") == 0
+
+
+def test_inline_rejections():
+    """Testa as funções e chamadas que não podem ser expandidas."""
+    result, report, tree = run_both("""
+n: number = 5
+func fat(n: number) -> number {
+  if (n <= 1) {
+    return 1
+  }
+  return n * fat(n - 1)
+}
+func ler() -> number {
+  return n
+}
+func sombra(n: number) -> number {
+  return ler() + n
+}
+func primeiro(v: list[number]) -> number {
+  for i in 0..len(v) {
+    return v[i]
+  }
+  return -1
+}
+a: number = fat(4)
+b: number = sombra(1)
+c: number = primeiro([7, 8])
+d: number = ler()
+""")
+    assert (result["a"], result["b"], result["c"], result["d"]) == (24, 2, 7, 5)
+    assert "fat: mantida (recursiva)" in report
+    assert "sombra: mantida (variável n visível em ler)" in report
+    assert "primeiro: mantida (retorno dentro de laço)" in report
+    assert "ler: 1 chamada(s) expandida(s)" in report
+
+
+def test_loop_invariants_and_common_subexpressions():
+    """Testa a movimentação de invariantes e a reutilização de subexpressões."""
+    result, report, tree = run_both("""
+a: number = 3
+b: number = 4
+total: number = 0
+i: number = 0
+while (i < a * b + 1) {
+  total = total + a * b + i * (a - b)
+  i = i + 1
+}
+for j in 0..3 {
+  total = total + j * (a + 1)
+}
+x: number = (a + b) * 2 + 1
+y: number = (a + b) * 2 - 1
+print(x, y, total)
+""")
+    assert (result["x"], result["y"], result["total"]) == (15, 13, 90)
+    assert (
+        "programa: 4 expressão(ões) invariante(s) movida(s) para fora de laços"
+        in report
+    )
+    assert "programa: 2 subexpressão(ões) comum(ns) reutilizada(s)" in report
+    # As expressões invariantes são avaliadas antes dos laços
+    loop = next(stmt for stmt in tree.stmts if isinstance(stmt, ast.While))
+    condition = walk_block([loop.condition])
+    assert not any(isinstance(node, ast.Arithmetic) for node in condition)
+
+
+def test_redundancy_elimination_keeps_unsafe_expressions():
+    """Testa as expressões que não podem ser movidas nem reutilizadas."""
+    result, report, tree = run_both("""
+d: number = 1
+k: number = 2
+func proximo() -> number {
+  k = k + 1
+  return 0
+}
+total: number = 0
+for i in 0..5 {
+  if (d != i) {
+    total = total + 10 / d
+    d = i + 1
+  }
+  total = total + k * 2 + proximo()
+}
+m: number = k * 3 + 1
+z: number = proximo() + k * 3 + 1
+n: number = k * 3 + 1
+func local(k: number) -> number {
+  return k * 3 + 1
+}
+p: number = local(1) + (k * 3 + 1)
+""")
+    assert round(result["total"], 3) == 63.333 and result["k"] == 8
+    assert (result["m"], result["z"], result["n"], result["p"]) == (22, 25, 25, 29)
+    # A divisão por variável e as expressões com k, alterada por proximo,
+    # permanecem no laço; apenas n e p reutilizam a mesma expressão
+    assert [line for line in report if line.startswith("programa")] == [
+        "programa: 1 subexpressão(ões) comum(ns) reutilizada(s)"
+    ]
+    loop = next(stmt for stmt in tree.stmts if isinstance(stmt, ast.For))
+    assert any(
+        isinstance(node, ast.Arithmetic) and node.token.value == "/"
+        for node in walk_block(loop.body)
+    )
+
+
+def test_redundancy_elimination_skips_shared_par():
+    """Testa que programas com blocos par shared não são otimizados."""
+    _, report, _ = run_both("""
+a: number = 1
+total: number = 0
+func somar() -> void {
+  for i in 0..3 {
+    total = total + a * 2
+  }
+}
+par shared {
+  somar()
+}
+""")
+    assert "programa: mantido (par shared ou canal servidor)" in report
+
+
+def random_expression(rng: random.Random, names: list[str], depth: int) -> str:
+    """Gera uma expressão numérica aleatória sobre as variáveis informadas."""
+    if depth == 0 or rng.random() < 0.3:
+        return rng.choice(names + ["1", "2", "3"])
+    left = random_expression(rng, names, depth - 1)
+    right = random_expression(rng, names, depth - 1)
+    operator = rng.choice(["+", "-", "*", "*", "%"])
+    if operator == "%":
+        return f"({left}) % {rng.randint(0, 3)}"
+    return f"({left} {operator} {right})"
+
+
+def random_program(seed: int) -> str:
+    """
+    Gera um programa aleatório com laços, condicionais, funções que
+    alteram variáveis globais e expressões repetidas.
+    """
+    rng = random.Random(seed)
+    names = ["a", "b", "c"]
+    pool = [random_expression(rng, names, 2) for _ in range(4)]
+    counters = iter(range(1000))
+
+    def expression() -> str:
+        if rng.random() < 0.6:
+            return rng.choice(pool)
+        return random_expression(rng, names, 2)
+
+    def statements(depth: int, indent: str) -> list[str]:
+        lines = []
+        for _ in range(rng.randint(1, 4)):
+            choice = rng.random()
+            target = rng.choice(names)
+            if choice < 0.4:
+                lines.append(f"{indent}{target} = ({expression()}) % 1000")
+            elif choice < 0.5:
+                lines.append(f"{indent}saida = saida + ({expression()}) % 7")
+            elif choice < 0.6:
+                lines.append(f"{indent}muda()")
+            elif choice < 0.7:
+                lines.append(f"{indent}print({expression()})")
+            elif depth > 0 and choice < 0.8:
+                lines.append(f"{indent}if ({expression()} > {expression()}) {{")
+                lines += statements(depth - 1, indent + "  ")
+                lines.append(f"{indent}}}")
+            elif depth > 0 and choice < 0.9:
+                lines.append(f"{indent}for i in 0..{rng.randint(0, 3)} {{")
+                lines += statements(depth - 1, indent + "  ")
+                lines.append(f"{indent}}}")
+            elif depth > 0:
+                counter = f"n{next(counters)}"
+                lines.append(f"{indent}{counter}: number = 0")
+                lines.append(f"{indent}while ({counter} < {expression()} % 3 + 1) {{")
+                lines += statements(depth - 1, indent + "  ")
+                lines.append(f"{indent}  {counter} = {counter} + 1")
+                lines.append(f"{indent}}}")
+            else:
+                lines.append(f"{indent}saida = saida + {expression()}")
+        return lines
+
+    header = [f"{name}: number = {rng.randint(-5, 5)}" for name in names]
+    header += [
+        "saida: number = 0",
+        "func muda() -> void {",
+        f"  {rng.choice(names)} = {rng.choice(names)} + 1",
+        "}",
+    ]
+    return "\n".join(header + statements(2, "") + ["print(saida, a, b, c)"])
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_redundancy_elimination_random_programs(seed):
+    """Compara a execução de programas aleatórios sem e com a otimização."""
+    run_both(random_program(seed), errors=True)
+
+
+@pytest.mark.parametrize("name", ["neuron.minipar", "xor_neuron.minipar"])
+def test_optimized_examples(name):
+    """Compara a execução dos exemplos sem e com a otimização."""
+    with open(os.path.join(EXAMPLES_DIR, name)) as f:
+        run_both(f.read())
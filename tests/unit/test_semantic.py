@@ -1,9 +1,118 @@
-from minipar.semantic import SemanticAnalyzer
+import pytest
+
 from minipar.ast import Constant
+from minipar.error import SemanticError, SyntaxError
+from minipar.lexer import Lexer
+from minipar.parser import Parser
+from minipar.semantic import SemanticAnalyzer
+
 
 def test_semantic_constant():
     """Testa a análise semântica de uma constante."""
     analyzer = SemanticAnalyzer()
     node = Constant(type="NUMBER", token=None)
     result = analyzer.visit_Constant(node)
-    assert result == "NUMBER"
\ No newline at end of file
+    assert result == "NUMBER"
+
+
+def analyze(code: str):
+    """Executa a análise sintática e semântica de um programa."""
+    SemanticAnalyzer().visit(Parser(Lexer(code)).start())
+
+
+def test_sync_builtins_check_argument_types():
+    """Testa a verificação de tipos nos argumentos das primitivas."""
+    with pytest.raises(SemanticError):
+        analyze("mutex_lock(5)")
+    analyze("m: mutex = mutex()\nmutex_lock(m)")
+
+
+def test_common_names_remain_available():
+    """Testa se nomes comuns podem ser usados em funções do usuário."""
+    analyze("func wait(n: number) -> number { return n + 1 }\nx: number = wait(3)")
+
+
+def test_list_types():
+    """Testa a verificação de tipos de listas, acessos e append."""
+    analyze("""
+v: list[number] = []
+append(v, 1)
+v[0] = v[0] + 1
+m: list[list[string]] = [["a"], ["b", "c"]]
+m[1][0] = m[0][0]
+""")
+    for code in (
+        'v: list[number] = [1, "a"]',
+        'v: list[number] = ["a"]',
+        'v: list[number] = []\nv[0] = "a"',
+        'v: list[number] = []\nappend(v, "a")',
+        "s: string = \"ab\"\ns[0] = \"c\"",
+    ):
+        with pytest.raises(SemanticError):
+            analyze(code)
+
+
+def test_vector_types():
+    """Testa os tipos das operações com vetores e matrizes."""
+    analyze("""
+m: matrix = matrix([[1, 2], [3, 4]])
+v: vector = vec_dot(m, vector([1, 1])) * 2 + 1
+x: number = vec_dot(v, v) + vec_sum(m) + m[0][1]
+m = vec_map(m + v, "sigmoid")
+""")
+    for code in (
+        'v: vector = vector(["a"])',
+        "v: vector = vector([1])\nx: number = vec_dot(v, v) + v",
+        "v: vector = vector([1])\nw: vector = v % 2",
+        "v: vector = vector([1])\nw: vector = vec_map(v, 1)",
+    ):
+        with pytest.raises(SemanticError):
+            analyze(code)
+
+
+def test_map_types():
+    """Testa a verificação de tipos de mapas e de suas funções."""
+    analyze("""
+m: map[string, list[number]] = {"a": [1], "b": []}
+vazio: map[number, bool] = {}
+m["c"] = map_get(m, "a", [])
+ok: bool = map_has(m, "c") && map_get(vazio, 1, false)
+chaves: list[string] = map_keys(m)
+x: number = m["a"][0]
+""")
+    for code in (
+        'm: map[string, number] = {"a": 1, "b": "c"}',
+        'm: map[string, number] = {1: 1}',
+        'm: map[string, number] = {}\nx: number = m[1]',
+        'm: map[string, number] = {}\nmap_set(m, "a", "b")',
+        'm: map[string, number] = {}\nx: list[number] = map_keys(m)',
+    ):
+        with pytest.raises(SemanticError):
+            analyze(code)
+    with pytest.raises(SyntaxError):
+        analyze("m: map[list[number], number] = {}")
+
+
+def test_math_builtins_check_argument_types():
+    """Testa a verificação de tipos nos argumentos das funções matemáticas."""
+    analyze("x: number = pow(sqrt(2), 2) + tanh(1)")
+    for code in ('x: number = exp("1")', "x: number = pow(2)", "x: string = sin(1)"):
+        with pytest.raises(SemanticError):
+            analyze(code)
+
+
+def test_for_loop_checks():
+    """Testa a verificação dos limites e do escopo do laço for."""
+    analyze("for i in 0..3 {\n  if (i == 1) { break }\n  x: number = i * 2\n}")
+    with pytest.raises(SemanticError):
+        analyze('for i in 0.."3" {\n}')
+    with pytest.raises(SyntaxError):
+        analyze("for i in 0..3 {\n}\nx: number = i")
+
+
+def test_call_default_arguments():
+    """Testa a omissão de argumentos com valor padrão nas chamadas."""
+    code = "func f(x: number, y: number = 1) -> number {\n  return x + y\n}\n"
+    analyze(code + "a: number = f(1)\nb: number = f(1, 2)")
+    with pytest.raises(SemanticError):
+        analyze(code + "a: number = f()")
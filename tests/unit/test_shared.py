@@ -0,0 +1,52 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from minipar.error import RunTimeError
+from minipar.shared import Atomic, Barrier, Mutex, SharedArray
+
+
+def test_shared_array_read_write():
+    """Testa a leitura e escrita de elementos de um vetor compartilhado."""
+    array = SharedArray.create(3)
+    array[1] = 2.5
+    array[2] = 4
+    assert list(array) == [0, 2.5, 4]
+    assert isinstance(array[2], int)
+    assert len(array) == 3
+
+
+def test_shared_array_slice_shares_data():
+    """Testa se fatias compartilham os dados do vetor original."""
+    array = SharedArray.create(4)
+    part = array.slice(2, 4)
+    part[0] = 7
+    assert array[2] == 7.0
+    with pytest.raises(RunTimeError):
+        part[2] = 1
+
+
+def test_shared_array_copy_and_pickle_keep_reference():
+    """Testa se cópias e serializações referenciam a mesma memória."""
+    array = SharedArray.create(2)
+    assert deepcopy(array) is array
+    restored = pickle.loads(pickle.dumps(array.slice(1, 2)))
+    restored[0] = 3
+    assert array[1] == 3.0
+
+
+def test_atomic_operations():
+    """Testa as operações atômicas de soma e troca condicional."""
+    counter = Atomic(5)
+    assert counter.fetch_add(2) == 5
+    assert counter.load() == 7
+    assert counter.compare_swap(7, 0) is True
+    assert counter.compare_swap(7, 1) is False
+    assert counter.load() == 0
+
+
+def test_sync_primitives_are_not_copied():
+    """Testa se as primitivas de sincronização são compartilhadas em cópias."""
+    for primitive in (Mutex(), Atomic(), Barrier(1)):
+        assert deepcopy(primitive) is primitive
@@ -0,0 +1,63 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from minipar.error import RunTimeError
+from minipar.vector import Matrix, Vector, dot, matrix, vector
+
+
+def test_elementwise_arithmetic_and_broadcast():
+    """Testa as operações elemento a elemento e a difusão de operandos."""
+    v = vector([1, 2, 3])
+    m = matrix([[1, 2, 3], [4, 5, 6]])
+    assert (v + v).tolist() == [2, 4, 6]
+    assert (10 - v).tolist() == [9, 8, 7]
+    assert (v / 2).tolist() == [0.5, 1, 1.5]
+    assert isinstance(m * v, Matrix)
+    assert (m * v).tolist() == [[1, 4, 9], [4, 10, 18]]
+    assert str(v * 2) == "[2, 4, 6]"
+    with pytest.raises(RunTimeError, match="dimensões incompatíveis"):
+        v + vector([1, 2])
+    with pytest.raises(RunTimeError, match="divisão por zero"):
+        v / 0
+
+
+def test_dot_sum_and_map():
+    """Testa o produto, a soma e a aplicação de funções aos elementos."""
+    v = vector([1, 2])
+    m = matrix([[1, 2], [3, 4]])
+    assert dot(v, v) == 5
+    assert dot(m, v).tolist() == [5, 11]
+    assert dot(v, m).tolist() == [7, 10]
+    assert dot(m, m).tolist() == [[7, 10], [15, 22]]
+    assert m.sum() == 10
+    assert vector([0, -1000, 1000]).map("sigmoid").tolist() == [0.5, 0, 1]
+    assert m.map("relu") == m
+    assert v.apply(lambda x: x * 3).tolist() == [3, 6]
+    with pytest.raises(RunTimeError):
+        dot(m, vector([1, 2, 3]))
+    with pytest.raises(RunTimeError):
+        vector([-1]).map("sqrt")
+
+
+def test_matrix_rows_share_data():
+    """Testa o acesso e a atribuição às linhas de uma matriz."""
+    m = matrix([[0, 0], [0, 0]])
+    m[1][0] = 5
+    m[0] = vector([1, 2])
+    assert isinstance(m[0], Vector)
+    assert m.tolist() == [[1, 2], [5, 0]]
+    assert isinstance(m[1][0], int)
+    with pytest.raises(RunTimeError):
+        m[0] = vector([1])
+    with pytest.raises(RunTimeError):
+        matrix([[1, 2], [3]])
+
+
+def test_copy_and_pickle():
+    """Testa a cópia dos vetores para ramos paralelos."""
+    m = matrix([[1, 2]])
+    assert deepcopy(m) == m
+    assert pickle.loads(pickle.dumps(m)) == m
+    assert deepcopy(m).data is not m.data